@@ -0,0 +1,164 @@
+"""
+Columnar files written by ``clean.py --columnar``.
+
+One column per field instead of repeating the keys in every record.
+Parquet (dictionary-encoded) when pyarrow is installed; otherwise GCOL, a
+small built-in layout that stores each column as a JSON array of its
+distinct strings followed by an array of little-endian integer codes into
+it. Readers can load only the columns they need.
+
+This module is the single implementation of both formats. The loader
+(src/load_data.py) imports it from its own package; module_2/clean.py, which
+writes the files, and the LLM standardizer (module_2/llm_hosting/app.py)
+import it as ``src.columnar`` once module_5 is installed (``pip install -e .``).
+"""
+
+import json
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional: columnar output falls back to the GCOL layout
+    pa = pq = None
+
+
+COLUMNAR_EXTENSIONS = (".parquet", ".gcol")
+GCOL_MAGIC = b"GCOL1\n"
+
+
+def parquet_available() -> bool:
+    """Return True if pyarrow is installed (Parquet can be read and written)."""
+    return pq is not None
+
+
+def encode_column(values: List[str]) -> tuple:
+    """
+    Dictionary-encode one column.
+
+    Returns:
+        Tuple of (distinct values in first-seen order, array of codes using
+        the smallest unsigned typecode that fits)
+    """
+    index: Dict[str, int] = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    typecode = "B" if len(index) <= 1 << 8 else "H" if len(index) <= 1 << 16 else "I"
+    return list(index), array(typecode, codes)
+
+
+def write_gcol(columns: Dict[str, List[str]], rows: int, path: str) -> None:
+    """
+    Write columns in the GCOL layout.
+
+    File: GCOL_MAGIC, a 4-byte little-endian header length, a JSON header,
+    then per column its dictionary (JSON array of strings, UTF-8) and codes
+    (array bytes, little-endian). The header gives every block's offset and
+    length from the end of the header, so a reader can seek to the columns
+    it wants.
+    """
+    header = {"rows": rows, "columns": {}}
+    blocks = []
+    offset = 0
+    for name, values in columns.items():
+        dictionary, codes = encode_column(values)
+        if sys.byteorder == "big":
+            codes.byteswap()
+        dictionary_bytes = json.dumps(dictionary, ensure_ascii=False).encode("utf-8")
+        codes_bytes = codes.tobytes()
+        header["columns"][name] = {
+            "typecode": codes.typecode,
+            "dictionary": [offset, len(dictionary_bytes)],
+            "codes": [offset + len(dictionary_bytes), len(codes_bytes)],
+        }
+        offset += len(dictionary_bytes) + len(codes_bytes)
+        blocks += [dictionary_bytes, codes_bytes]
+    header_bytes = json.dumps(header).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(GCOL_MAGIC)
+        f.write(len(header_bytes).to_bytes(4, "little"))
+        f.write(header_bytes)
+        for block in blocks:
+            f.write(block)
+
+
+def read_gcol(path: str, columns: Optional[Iterable[str]] = None,
+              skip_missing: bool = False) -> Dict[str, List[str]]:
+    """
+    Read the requested GCOL columns (all if None), seeking past the rest.
+
+    Args:
+        path: .gcol file
+        columns: Column names to read (None reads every column)
+        skip_missing: Leave out requested columns the file does not have
+            instead of raising KeyError
+
+    Returns:
+        Dictionary of column name to list of values
+
+    Raises:
+        KeyError: A requested column is not in the file (unless skip_missing)
+        ValueError: The file does not start with GCOL_MAGIC
+    """
+    with open(path, "rb") as f:
+        if f.read(len(GCOL_MAGIC)) != GCOL_MAGIC:
+            raise ValueError(f"{path} is not a GCOL file")
+        header_length = int.from_bytes(f.read(4), "little")
+        header = json.loads(f.read(header_length))
+        data_start = len(GCOL_MAGIC) + 4 + header_length
+        result = {}
+        for name in columns if columns is not None else header["columns"]:
+            if skip_missing and name not in header["columns"]:
+                continue
+            layout = header["columns"][name]
+            f.seek(data_start + layout["dictionary"][0])
+            dictionary = json.loads(f.read(layout["dictionary"][1]))
+            codes = array(layout["typecode"])
+            f.seek(data_start + layout["codes"][0])
+            codes.frombytes(f.read(layout["codes"][1]))
+            if sys.byteorder == "big":
+                codes.byteswap()
+            result[name] = [dictionary[code] for code in codes]
+        return result
+
+
+def read_columnar(path: str, columns: Optional[Iterable[str]] = None,
+                  skip_missing: bool = False) -> Dict[str, List[str]]:
+    """
+    Read columns from a Parquet or GCOL file.
+
+    Args:
+        path: .parquet or .gcol file
+        columns: Column names to read (None reads every column)
+        skip_missing: Leave out requested columns the file does not have
+
+    Returns:
+        Dictionary of column name to list of values, in file column order
+
+    Raises:
+        KeyError: A requested column is not in the file (unless skip_missing)
+        ValueError: The file is not columnar, or is Parquet without pyarrow
+    """
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise ValueError(f"reading {path} requires pyarrow")
+        if columns is not None:
+            columns = list(columns)
+            if skip_missing:
+                present = set(pq.read_schema(path).names)
+                columns = [name for name in columns if name in present]
+        return pq.read_table(path, columns=columns).to_pydict()
+    return read_gcol(path, columns, skip_missing)
+
+
+def write_parquet(columns: Dict[str, List[str]], path: str) -> None:
+    """
+    Write columns as dictionary-encoded Parquet.
+
+    Raises:
+        ValueError: pyarrow is not installed
+    """
+    if pq is None:
+        raise ValueError(f"writing {path} requires pyarrow; use a .gcol file")
+    pq.write_table(pa.table(columns), path, use_dictionary=True)
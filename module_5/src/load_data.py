@@ -7,15 +7,22 @@ Loads cleaned and LLM-extended applicant data into the PostgreSQL
 Public API (used by app.py and tests)
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 load_rows(rows, conn)
-    Insert *rows* (list of dicts) into the database using the supplied
+    Insert *rows* (dicts, or any rows with a dict-style ``get`` such as
+    clean.py's ``CanonicalRecord``) into the database using the supplied
     psycopg connection.  The connection is **not** closed by this function.
 
     Idempotency: rows are upserted on the unique constraint
     ``(comments, date_added, url)`` so that re-running the loader with
     identical data produces no duplicates.
 
+read_input(path)
+    Read rows from a JSON array file or a columnar file written by
+    ``clean.py --columnar`` (``.parquet`` or ``.gcol``).  Columnar files
+    are read column by column, and only the columns the loader uses; their
+    rows are compact tuples (see :func:`row_type`) rather than dicts.
+
 main()
-    CLI entry point: reads the JSON file and calls load_rows.
+    CLI entry point: reads the input file and calls load_rows.
 
 Parsing helpers are module-level so they can be imported and unit-tested.
 """
@@ -28,6 +35,8 @@ from datetime import datetime
 import psycopg
 from psycopg import sql
 
+from .columnar import COLUMNAR_EXTENSIONS, read_columnar
+
 
 # ===============================
 # CONFIGURATION
@@ -40,6 +49,12 @@ _DEFAULT_INPUT_JSON = os.path.join(
 
 BASE_URL = "https://www.thegradcafe.com/survey/"
 
+# Columnar input written by ``clean.py --columnar`` (see columnar.py for the
+# layouts).  Only the columns read by _build_row_params are loaded.  clean.py
+# writes the canonical schema, which has no raw ``comments`` and no
+# ``llm-generated-*`` columns, so those load as NULL from columnar files.
+LOADER_COLUMNS = ("notes", "program", "decision", "gpa", "decision_date")
+
 
 # ===============================
 # SQL STATEMENT (Step 2 — SQLi defence)
@@ -273,6 +288,79 @@ def _build_row_params(row: dict) -> dict:
     }
 
 
+# ===============================
+# INPUT READERS
+# ===============================
+
+def row_type(names):
+    """
+    Return a tuple subclass for rows holding the columns *names*, in order.
+
+    A row is a plain tuple of values (no per-row dict), readable like the
+    dicts it replaces: ``row["gpa"]``, ``row.get("gpa")``, ``"gpa" in row``
+    and ``row.keys()`` go through an index shared by all rows of the type.
+    Integer indexing and iteration still see the values.
+    """
+    index = {name: position for position, name in enumerate(names)}
+
+    class Row(tuple):
+        """One input row; values in the order of its type's column names."""
+
+        __slots__ = ()
+
+        def __getitem__(self, key):
+            if isinstance(key, str):
+                return tuple.__getitem__(self, index[key])
+            return tuple.__getitem__(self, key)
+
+        def __contains__(self, key):
+            return key in index
+
+        def get(self, key, default=None):
+            """Return the value of column *key*, or *default* if absent."""
+            position = index.get(key)
+            return default if position is None else tuple.__getitem__(self, position)
+
+        def keys(self):
+            """Return the column names."""
+            return list(index)
+
+    return Row
+
+
+def read_columnar_rows(path, columns=LOADER_COLUMNS):
+    """
+    Read *columns* from a ``.parquet`` or ``.gcol`` file as compact rows.
+
+    Returns:
+        list: One :func:`row_type` row per file row.
+
+    Raises:
+        KeyError: The file lacks one of *columns* (it was not written by
+            ``clean.py --columnar``).
+    """
+    data = read_columnar(path, columns)
+    row = row_type(list(data))
+    return [row(values) for values in zip(*data.values())]
+
+
+def read_input(path):
+    """
+    Read loader input rows from *path*.
+
+    Args:
+        path (str): JSON array file, or a ``.parquet``/``.gcol`` file.
+
+    Returns:
+        list: Rows for :func:`load_rows` (dicts from JSON, compact rows
+        from columnar files).
+    """
+    if path.endswith(COLUMNAR_EXTENSIONS):
+        return read_columnar_rows(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 # ===============================
 # CORE LOAD FUNCTION
 # ===============================
@@ -282,7 +370,8 @@ def load_rows(rows, conn):
     Insert *rows* into the ``applicants`` table using *conn*.
 
     Each element of *rows* is a dict with the same keys produced by the
-    Module 2 scraper / LLM pipeline.
+    Module 2 scraper / LLM pipeline, or any row with a dict-style ``get``
+    (a ``CanonicalRecord`` from clean.py, a :func:`row_type` row).
 
     Idempotency is enforced via ``ON CONFLICT DO NOTHING`` on the unique
     constraint ``(comments, date_added, url)``.
@@ -293,7 +382,7 @@ def load_rows(rows, conn):
     SQL text.
 
     Args:
-        rows (list[dict]): Raw applicant dicts from the scraper.
+        rows (list): Raw applicant dicts (or dict-like rows) from the scraper.
         conn: Active psycopg connection.  The caller is responsible for
               closing / committing it.
 
@@ -317,14 +406,16 @@ def load_rows(rows, conn):
 
 def main(input_json=None, database_url=None):
     """
-    CLI entry point.  Reads a JSON file and loads it into the database.
+    CLI entry point.  Reads a JSON or columnar file and loads it into the
+    database.
 
     DB credentials must be supplied via the ``DATABASE_URL`` environment
     variable (Step 3 — no hard-coded fallback).
 
     Args:
-        input_json (str|None): Path to the JSON file.  Defaults to the
-            Module 2 output file relative to this script.
+        input_json (str|None): Path to the JSON (or ``.parquet``/``.gcol``)
+            file.  Defaults to the Module 2 output file relative to this
+            script.
         database_url (str|None): libpq connection string.  Defaults to
             the ``DATABASE_URL`` environment variable.  Raises
             ``RuntimeError`` if neither is provided.
@@ -339,8 +430,7 @@ def main(input_json=None, database_url=None):
             "See .env.example for the required format."
         )
 
-    with open(input_json, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = read_input(input_json)
 
     # Use the connection as a context manager so it is always closed on exit.
     with psycopg.connect(database_url) as conn:
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Cleaning benchmark: per-call regex pipeline vs. the precompiled cleaner.
+
+Generates synthetic raw entries shaped like scrape.py output (mostly plain
+text, some with HTML entities or tags, some missing fields that must be
+recovered from raw_html) and cleans them with
+
+1. legacy -- the previous pipeline: three re.sub/html.unescape passes on
+             every field with uncompiled patterns, and uncompiled regex
+             searches in _extract_from_raw_html
+2. batch  -- clean.clean_batch() with precompiled patterns and the
+             no-"<"/"&" fast path
+3. pool   -- clean.clean_data(workers=N), batches cleaned by N processes
+             (only with --workers)
+
+and checks that every mode produces identical records. It also reports the
+field cache hit rate and how many bytes the cleaned records' strings take
+(each distinct string object counted once), since interned values are shared.
+The legacy mode finds schools with the current SchoolMatcher, since that
+output changed on purpose; --schools compares it with the old regexes.
+
+With --schools, row texts mentioning schools from the canonical list (by
+full name or abbreviation) are searched with the old three-regex cascade and
+with clean.SchoolMatcher; time per row and the share of rows where each
+returns the school as intended are reported.
+
+With --incremental, the corpus is cleaned through a fresh clean.CleanCache
+(cold), again (warm), and again after 5% of the entries changed, next to a
+run without the cache.
+
+With --stream, the corpus is instead written to a temporary JSON array at
+several sizes and cleaned by clean.clean_file_streaming(); the tracemalloc
+peak is reported per size, and should not grow with the input.
+
+Usage:
+    python benchmarks/bench_clean.py [--entries N] [--seed S] [--workers N]
+    python benchmarks/bench_clean.py --incremental [--raw-html-share F]
+    python benchmarks/bench_clean.py --schools [--entries N]
+    python benchmarks/bench_clean.py --stream [--entries N]
+"""
+
+import argparse
+import contextlib
+import html
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import clean  # noqa: E402
+
+SCHOOLS = ["Stanford University", "Massachusetts Institute of Technology (MIT)",
+           "University of California, Berkeley", "Texas A&amp;M University",
+           "Johns Hopkins University", "Carnegie Mellon University", "Georgia Tech"]
+PROGRAMS = ["Computer Science", "Electrical &amp; Computer Engineering", "Statistics",
+            "Mechanical Engineering", "Public Health"]
+DEGREES = ["PhD", "Masters", "MS", "MFA"]
+DECISIONS = ["Accepted", "Rejected", "Wait listed", "Interview"]
+MONTHS = ["January", "February", "March", "April"]
+COMMENTS = ["", "Got the email this morning!", "Funded  offer,\n  very happy",
+            "No interview before the decision.", "<b>Finally</b> heard back<br/>",
+            "Advisor reached out &mdash; thrilled"]
+
+
+def synthetic_entries(count: int, seed: int = 0, raw_html_share: float = 0.05) -> list:
+    """Return ``count`` raw entries with a realistic mix of markup."""
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(count):
+        school = rng.choice(SCHOOLS)
+        program = f"{rng.choice(PROGRAMS)}, {rng.choice(DEGREES)}"
+        decision = rng.choice(DECISIONS)
+        date_added = f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, 2026"
+        details = (f"Fall 2026  International  GPA {rng.uniform(2.8, 4.0):.2f} "
+                   f"GRE {rng.randint(150, 170)}/{rng.randint(150, 170)}")
+        entry = {
+            "institution": school,
+            "program": program,
+            "decision": decision,
+            "date_added": date_added,
+            "details": details,
+            "comments": rng.choice(COMMENTS),
+        }
+        if rng.random() < raw_html_share:
+            # Scraper missed the school: recovered from the row markup
+            del entry["institution"]
+            entry["raw_html"] = (f"<tr><td>{school}</td><td>{program}</td>"
+                                 f"<td>{decision} on {date_added}</td><td>{details}</td></tr>")
+        entries.append(entry)
+    return entries
+
+
+# -----------------------------------------------------------------------------
+# Previous implementation, reproduced for comparison
+# -----------------------------------------------------------------------------
+
+def _legacy_clean_text(text):
+    if text is None:
+        return ""
+    if not isinstance(text, str):
+        text = str(text)
+    text = re.sub(r"<[^>]*>", " ", text) if text else ""
+    text = html.unescape(text) if text else ""
+    if not text:
+        return ""
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+_LEGACY_SCHOOL_PATTERNS = [r"(?:University|College|Institute|School)\s+of\s+[\w\s]+",
+                           r"[\w\s]+(?:University|College|Institute|School)",
+                           r"(?:MIT|UCLA|USC|NYU|CMU|CalTech|Stanford|Harvard|Yale|Princeton)"]
+
+
+def _legacy_school(text_content):
+    for pattern in _LEGACY_SCHOOL_PATTERNS:
+        match = re.search(pattern, text_content, re.IGNORECASE)
+        if match:
+            return match.group(0).strip()
+    return ""
+
+
+def _current_school(text_content):
+    school = clean._school_matcher().find(text_content)
+    if not school:
+        match = clean._first_match(clean._SCHOOL_FALLBACK_RES, text_content)
+        school = match.group(0).strip() if match else ""
+    return school
+
+
+def _legacy_extract(raw_html):
+    extracted = {key: "" for key in clean.CANONICAL_SCHEMA}
+    if not raw_html:
+        return extracted
+    text_content = _legacy_clean_text(raw_html)
+    extracted["school"] = _current_school(text_content)
+    match = re.search(r"\b(Accepted|Rejected|Waitlisted|Interview|Pending|Denied|Admitted)\b",
+                      text_content, re.IGNORECASE)
+    if match:
+        extracted["decision"] = match.group(1).strip()
+    match = re.search(r"\bGPA[:\s]*([0-9]\.[0-9]{1,2})\b", text_content, re.IGNORECASE)
+    if match:
+        extracted["gpa"] = match.group(1)
+    for pattern in [r"\bGRE[:\s]*(\d{3})[/\s]+(\d{3})", r"\bV[:\s]*(\d{3})[,\s]+Q[:\s]*(\d{3})"]:
+        match = re.search(pattern, text_content, re.IGNORECASE)
+        if match:
+            extracted["gre"] = match.group(0).strip()
+            break
+    for pattern in [r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b",
+                    r"\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})\b"]:
+        match = re.search(pattern, text_content, re.IGNORECASE)
+        if match:
+            extracted["decision_date"] = match.group(1).strip()
+            break
+    return extracted
+
+
+def _legacy_map(entry):
+    cleaned = {key: "" for key in clean.CANONICAL_SCHEMA}
+    for field, sources in clean.FIELD_SOURCES:
+        for key in sources:
+            if key in entry and entry[key]:
+                cleaned[field] = _legacy_clean_text(entry[key])
+                break
+    notes_parts = []
+    for key in clean.NOTES_SOURCES:
+        if key in entry and entry[key]:
+            value = _legacy_clean_text(entry[key])
+            if value:
+                notes_parts.append(value)
+    if notes_parts:
+        cleaned["notes"] = " | ".join(notes_parts)
+        if len(cleaned["notes"]) > 1000:
+            cleaned["notes"] = cleaned["notes"][:1000] + "..."
+    if entry.get("raw_html"):
+        if not cleaned["school"] or not cleaned["program"] or not cleaned["decision"]:
+            extracted = _legacy_extract(entry["raw_html"])
+            for key in clean.CANONICAL_SCHEMA:
+                if not cleaned[key] and extracted.get(key):
+                    cleaned[key] = extracted[key]
+    return cleaned
+
+
+def _legacy_batch(entries):
+    cleaned_entries = []
+    for entry in entries:
+        cleaned = _legacy_map(entry)
+        for key in clean.CANONICAL_SCHEMA:
+            if key not in cleaned:
+                cleaned[key] = ""
+        cleaned_entries.append(cleaned)
+    return cleaned_entries
+
+
+def _time(runner, entries: list) -> tuple:
+    """Run ``runner`` over the entries; return (seconds, output)."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = runner(entries)
+    return time.perf_counter() - start, output
+
+
+def _as_dicts(records: list) -> list:
+    """Cleaned records as dictionaries, for comparison with the legacy output."""
+    return [record if isinstance(record, dict) else record.to_dict() for record in records]
+
+
+def _string_bytes(records: list) -> int:
+    """Bytes held by the records' value strings, counting shared objects once."""
+    unique = {id(value): value for record in records for value in record.values()}
+    return sum(sys.getsizeof(value) for value in unique.values())
+
+
+def _incremental(entries: list) -> None:
+    """Time clean_data() without the cache, then cold, warm and after 5% changed."""
+    changed = [dict(entry, comments="Updated after the interview") if i % 20 == 0 else entry
+               for i, entry in enumerate(entries)]
+    baseline_seconds, baseline = _time(clean.clean_data, entries)
+    print(f"[NO CACHE] entries/sec={len(entries) / baseline_seconds:10.0f}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clean_cache.sqlite")
+        for label, corpus in (("cold", entries), ("warm", entries), ("5% new", changed)):
+            cache = clean.CleanCache(path)
+            seconds, output = _time(lambda batch: clean.clean_data(batch, cache=cache), corpus)
+            cache.close()
+            expected = baseline if corpus is entries else _time(clean.clean_data, corpus)[1]
+            status = "identical" if output == expected else "MISMATCH"
+            print(f"[{label.upper():8}] entries/sec={len(corpus) / seconds:10.0f} "
+                  f"speedup={baseline_seconds / seconds:5.2f}x reused={cache.reused:7} "
+                  f"cleaned={cache.stored:7} output={status}")
+
+
+def _school_rows(count: int, seed: int) -> list:
+    """Cleaned row texts mentioning a listed school; return (text, mention, canonical) triples."""
+    rng = random.Random(seed)
+    matcher = clean._school_matcher()
+    mentions = [(name, name) for name in matcher.names]
+    mentions += list(clean.SCHOOL_ABBREVIATIONS.items())
+    rows = []
+    for _ in range(count):
+        mention, canonical = rng.choice(mentions)
+        program = f"{rng.choice(PROGRAMS)}, {rng.choice(DEGREES)}"
+        text = clean._clean_text(
+            f"<tr><td>{html.escape(mention)}</td><td>{program}</td>"
+            f"<td>{rng.choice(DECISIONS)} on {rng.choice(MONTHS)} {rng.randint(1, 28)}, 2026</td>"
+            f"<td>{rng.choice(COMMENTS)}</td></tr>")
+        rows.append((text, mention, canonical))
+    return rows
+
+
+def _school_matching(count: int, seed: int) -> None:
+    """Time and score the old school regexes against SchoolMatcher."""
+    start = time.perf_counter()
+    matcher = clean._school_matcher()
+    print(f"[SCHOOLS ] automaton over {len(matcher.names)} names + "
+          f"{len(clean.SCHOOL_ABBREVIATIONS)} abbreviations built in "
+          f"{time.perf_counter() - start:.2f}s")
+    rows = _school_rows(count, seed)
+    # Old regexes can only return the text as written; the matcher returns canonical names
+    for label, find, wanted in (("regex", _legacy_school, 1), ("automaton", matcher.find, 2)):
+        start = time.perf_counter()
+        found = [find(row[0]) for row in rows]
+        seconds = time.perf_counter() - start
+        correct = sum(result == row[wanted] for result, row in zip(found, rows))
+        print(f"[{label.upper():9}] rows/sec={len(rows) / seconds:10.0f} "
+              f"us/row={seconds / len(rows) * 1e6:6.1f} correct={correct / len(rows):6.1%}")
+
+
+def _stream_memory(sizes: list, seed: int) -> None:
+    """Stream-clean a JSON file of each size; print entries/sec and peak memory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, "raw.json")
+        output_file = os.path.join(tmp, "clean.jsonl")
+        for size in sizes:
+            with open(input_file, "w", encoding="utf-8") as f:
+                json.dump(synthetic_entries(size, seed), f)
+            tracemalloc.start()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, written = clean.clean_file_streaming(input_file, output_file)
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"[STREAM  ] entries={size:8} written={written:8} "
+                  f"entries/sec={size / seconds:10.0f} peak={peak / 2**20:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000,
+                        help="synthetic entries to generate (default 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the corpus")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="also time clean_data() with this many worker processes")
+    parser.add_argument("--stream", action="store_true",
+                        help="measure clean_file_streaming() peak memory at 1/10, 1/2 "
+                             "and all of --entries")
+    parser.add_argument("--raw-html-share", type=float, default=0.05,
+                        help="fraction of entries that need raw_html extraction (default 0.05)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="time clean_data() through a cold and a warm CleanCache")
+    parser.add_argument("--schools", action="store_true",
+                        help="compare the old school regexes with clean.SchoolMatcher")
+    args = parser.parse_args()
+
+    if args.schools:
+        _school_matching(args.entries, args.seed)
+        return
+    if args.incremental:
+        _incremental(synthetic_entries(args.entries, args.seed, args.raw_html_share))
+        return
+    if args.stream:
+        _stream_memory([args.entries // 10, args.entries // 2, args.entries], args.seed)
+        return
+
+    entries = synthetic_entries(args.entries, args.seed, args.raw_html_share)
+    print(f"[CORPUS] {len(entries)} synthetic entries "
+          f"({sum('raw_html' in e for e in entries)} need raw_html extraction)")
+
+    modes = [("legacy", _legacy_batch), ("batch", clean.clean_batch)]
+    if args.workers > 0:
+        modes.append(("pool", lambda batch: clean.clean_data(batch, workers=args.workers)))
+
+    baseline_seconds, baseline = _time(_legacy_batch, entries)
+    for label, runner in modes:
+        seconds, output = (baseline_seconds, baseline) if runner is _legacy_batch \
+            else _time(runner, entries)
+        status = "identical" if _as_dicts(output) == baseline else "MISMATCH"
+        print(f"[{label.upper():8}] entries/sec={len(entries) / seconds:10.0f} "
+              f"speedup={baseline_seconds / seconds:5.2f}x output={status} "
+              f"strings={_string_bytes(output) / 2**20:6.1f} MB")
+    info = clean._clean_field.cache_info()
+    print(f"[CACHE   ] field cache hit rate={info.hits / max(info.hits + info.misses, 1):.1%} "
+          f"distinct values={info.currsize} (in this process)")
+
+
+if __name__ == "__main__":
+    main()
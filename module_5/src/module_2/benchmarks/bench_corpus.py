@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Corpus benchmark: the full scrape loop replayed offline over many pages.
+
+Runs scrape_data() over a corpus of saved result pages (generated with
+fixture_server.save_pages, or a directory captured with
+``scrape.py --save-pages``) and reports
+
+1. throughput  -- pages/sec and entries/sec for the whole crawl loop
+                  (parse, extract, journal), replayed from disk or, with
+                  --http, through the local fixture server; parsed in the
+                  main process and, with --parse-workers N, again in a
+                  process pool (output must be identical)
+2. memory      -- the process's peak RSS and its growth during the crawl;
+                  with --trace-memory, also the peak Python heap of a
+                  second, traced crawl (tracemalloc makes it much slower)
+3. selectors   -- cost and hit rate of every ROW_SELECTORS / FIELD_SELECTORS
+                  alternative, and of the learned SelectorPlan, on a sample
+
+Usage:
+    python benchmarks/bench_corpus.py [--pages N | --pages-dir DIR] [--http]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import scrape  # noqa: E402
+from fixture_server import save_pages, start_server  # noqa: E402
+
+
+def _crawl(pages_dir: str, workdir: str, http: bool, in_flight: int,
+           parse_workers: int = 0) -> tuple:
+    """Run one quiet scrape over the corpus; return (seconds, entries)."""
+    checkpoint = os.path.join(workdir, "bench_checkpoint.jsonl")
+    server = None
+    if http:
+        server, base_url = start_server(pages_dir=pages_dir)
+        scrape.use_base_url(base_url)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            entries, _, _ = scrape.scrape_data(
+                in_flight, resume=False, checkpoint_file=checkpoint,
+                replay_dir=None if http else pages_dir, parse_workers=parse_workers)
+        return time.perf_counter() - start, entries
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # Linux: KiB
+
+
+def _selector_costs(pages: list) -> list:
+    """Time every row/field selector alternative on ``pages``."""
+    documents = [scrape.parse_page(html) for html in pages]
+    results = []
+
+    def timed(label, calls, func):
+        hits = 0
+        start = time.perf_counter()
+        for args in calls:
+            if func(*args):
+                hits += 1
+        seconds = time.perf_counter() - start
+        results.append((label, len(calls), seconds, hits))
+
+    rows = []
+    for selector in scrape.ROW_SELECTORS:
+        timed(f"row  {selector}", [(d,) for d in documents], lambda d, sel=selector: d.select(sel))
+    for document in documents:
+        rows.extend(scrape.find_entry_rows(document)[0])
+
+    row_calls = [(row,) for row in rows]
+    for field, alternatives in scrape.FIELD_SELECTORS.items():
+        for alternative in (alt.strip() for alt in alternatives.split(",")):
+            timed(f"{field:11} {alternative}", row_calls,
+                  lambda row, alt=alternative: row.select_one(alt))
+
+    plan = scrape.SelectorPlan()
+    with contextlib.redirect_stdout(io.StringIO()):
+        plan.find_rows(documents[0])
+    for field in scrape.FIELD_SELECTORS:
+        timed(f"{field:11} <plan>", row_calls, lambda row, f=field: plan.select_field(row, f))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages-dir", help="directory of saved page_NNNNN.html files")
+    parser.add_argument("--pages", type=int, default=2000,
+                        help="synthetic pages to generate when --pages-dir is not given")
+    parser.add_argument("--http", action="store_true",
+                        help="replay through the local fixture HTTP server instead of from disk")
+    parser.add_argument("--in-flight", type=int, default=scrape.MAX_IN_FLIGHT)
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="also run the crawl with this many parse worker processes")
+    parser.add_argument("--selector-sample", type=int, default=100,
+                        help="pages used for per-selector timings")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="repeat the crawl under tracemalloc to report peak heap")
+    args = parser.parse_args()
+
+    # Replay the whole corpus, however large, as fast as it can be read
+    scrape.TARGET_ENTRIES = float("inf")
+    scrape.REQUESTS_PER_SECOND = scrape.ADAPTIVE_MAX_RATE = 1e6
+    scrape.ADAPTIVE_RATE = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages_dir = args.pages_dir
+        if not pages_dir:
+            pages_dir = os.path.join(tmp, "pages")
+            save_pages(pages_dir, args.pages)
+        corpus_size = len(scrape.ReplayDirectory(pages_dir))
+        mode = "http" if args.http else "disk"
+        print(f"[CORPUS] {corpus_size} pages from {pages_dir} (replay: {mode}, "
+              f"parser: {scrape.HTML_PARSER})")
+
+        rss_before = _peak_rss()
+        seconds, entries = _crawl(pages_dir, tmp, args.http, args.in_flight)
+        rss_after = _peak_rss()
+        pages = corpus_size / seconds
+        print(f"[THROUGHPUT] {len(entries)} entries in {seconds:.2f}s: "
+              f"{pages:,.1f} pages/sec, {len(entries) / seconds:,.0f} entries/sec")
+        summary = scrape.get_metrics().summary()
+        print(f"[THROUGHPUT] parse p50={summary['histograms']['parse_seconds']['p50']}s "
+              f"bottleneck={summary['bottleneck']}")
+
+        if args.parse_workers:
+            pool_seconds, pool_entries = _crawl(pages_dir, tmp, args.http, args.in_flight,
+                                                args.parse_workers)
+            status = "identical" if pool_entries == entries else "MISMATCH"
+            print(f"[THROUGHPUT] {args.parse_workers} parse workers: {pool_seconds:.2f}s, "
+                  f"{corpus_size / pool_seconds:,.1f} pages/sec, "
+                  f"{len(pool_entries) / pool_seconds:,.0f} entries/sec "
+                  f"(speedup {seconds / pool_seconds:.2f}x, output {status})")
+            del pool_entries
+        del entries
+        print(f"[MEMORY] peak RSS={rss_after / 2**20:.1f} MiB "
+              f"(+{(rss_after - rss_before) / 2**20:.1f} MiB during the crawl)")
+
+        if args.trace_memory:
+            tracemalloc.start()
+            _crawl(pages_dir, tmp, args.http, args.in_flight)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"[MEMORY] peak Python heap={peak / 2**20:.1f} MiB")
+
+        sample = []
+        replay = scrape.ReplayDirectory(pages_dir)
+        for number in sorted(replay.pages)[:args.selector_sample]:
+            sample.append(replay.fetch_page(number))
+
+    print(f"[SELECTORS] {len(sample)} pages")
+    print(f"  {'selector':52} {'calls':>7} {'us/call':>8} {'hit%':>6}")
+    for label, calls, seconds, hits in _selector_costs(sample):
+        print(f"  {label[:52]:52} {calls:7d} {seconds / calls * 1e6:8.2f} "
+              f"{hits / calls * 100 if calls else 0:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Fetch benchmark: one-shot urllib requests vs. the keep-alive HTTPSession.
+
+Fetches the same pages from the local fixture server in four modes:
+
+1. legacy  -- a new urllib connection per page with Accept-Encoding: identity
+              (how make_request() used to work)
+2. session -- scrape.HTTPSession with pooled connections and gzip transfer
+3. cold    -- session with an empty HTTPCache (fills the cache)
+4. warm    -- the same cache again: every page is revalidated and answered
+              with 304 Not Modified from the fixture server
+
+and reports connections opened, body bytes, 304s and wall time per page.
+
+Usage:
+    python benchmarks/bench_fetch.py [--pages N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from urllib import request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import scrape  # noqa: E402
+from fixture_server import reset_stats, start_server  # noqa: E402
+
+
+def _legacy_fetch(url: str) -> str:
+    """Fetch a page the way make_request() did before HTTPSession."""
+    headers = dict(scrape.REQUEST_HEADERS, **{"Accept-Encoding": "identity"})
+    req = request.Request(url, headers=headers)
+    with request.urlopen(req, timeout=scrape.REQUEST_TIMEOUT) as response:
+        return response.read().decode("utf-8", errors="replace")
+
+
+def _run(label: str, fetch, urls: list, server) -> None:
+    """Fetch every URL with ``fetch`` and print per-page cost."""
+    reset_stats(server)
+    start = time.perf_counter()
+    for url in urls:
+        fetch(url)
+    elapsed = time.perf_counter() - start
+
+    stats = server.stats
+    print(f"[{label.upper():7}] pages={len(urls)} connections={stats['connections']} "
+          f"bytes/page={stats['body_bytes'] / len(urls):,.0f} "
+          f"304s={stats['not_modified']} "
+          f"ms/page={elapsed / len(urls) * 1000:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=200, help="pages to fetch per mode")
+    args = parser.parse_args()
+
+    server, base_url = start_server(total_pages=args.pages)
+    urls = [f"{base_url}/survey?page={n}" for n in range(1, args.pages + 1)]
+
+    session = scrape.HTTPSession()
+    cache_dir = tempfile.TemporaryDirectory()
+    cached = scrape.HTTPSession(cache=scrape.HTTPCache(cache_dir.name))
+    try:
+        _run("legacy", _legacy_fetch, urls, server)
+        _run("session", lambda url: session.get(url).decode("utf-8"), urls, server)
+        _run("cold", lambda url: cached.get(url).decode("utf-8"), urls, server)
+        _run("warm", lambda url: cached.get(url).decode("utf-8"), urls, server)
+        assert cached.cache_hits == len(urls), "warm pass should be served by 304s"
+    finally:
+        session.close()
+        cached.close()
+        cache_dir.cleanup()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Parse benchmark: two html.parser passes per page vs. one shared parse.
+
+For every saved fixture page this compares
+
+1. legacy       -- extract_entries_from_page() and get_next_page_url() each
+                   build their own BeautifulSoup(html, "html.parser") tree
+2. <parser>     -- one parse_page() per page shared by both steps, for every
+                   installed backend (lxml, html.parser)
+3. <parser>+plan -- as above, with one SelectorPlan learned on the first page
+                   and reused for the rest of the corpus
+
+and checks that every mode extracts identical entries.
+
+Usage:
+    python benchmarks/bench_parse.py [--pages-dir DIR] [--pages N]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import scrape  # noqa: E402
+from fixture_server import save_pages  # noqa: E402
+
+
+def _legacy(html: str, page: int):
+    """Parse the page twice with html.parser, as before parse_page()."""
+    entries = scrape.extract_entries_from_page(BeautifulSoup(html, "html.parser"))
+    next_url = scrape.get_next_page_url(BeautifulSoup(html, "html.parser"), page)
+    return entries, next_url
+
+
+def _shared(parser: str, learn_once: bool = False):
+    """Return a runner that parses once with ``parser`` and shares the tree."""
+    plan = scrape.SelectorPlan() if learn_once else None
+
+    def run(html: str, page: int):
+        document = scrape.parse_page(html, parser)
+        entries = scrape.extract_entries_from_page(document, plan)
+        return entries, scrape.get_next_page_url(document, page)
+    return run
+
+
+def _time(runner, pages: list) -> tuple:
+    """Run ``runner`` over every page; return (seconds, outputs)."""
+    outputs = []
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for number, html in enumerate(pages, start=1):
+            outputs.append(runner(html, number))
+    return time.perf_counter() - start, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages-dir", help="directory of saved *.html result pages")
+    parser.add_argument("--pages", type=int, default=200,
+                        help="synthetic pages to generate when --pages-dir is not given")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = sorted(glob.glob(os.path.join(args.pages_dir, "*.html"))) if args.pages_dir \
+            else save_pages(tmp, args.pages)
+        pages = []
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append(f.read())
+
+    modes = [("legacy", _legacy)]
+    for name in scrape.HTML_PARSERS:
+        if scrape._parser_available(name):
+            modes += [(name, _shared(name)), (f"{name}+plan", _shared(name, learn_once=True))]
+
+    baseline_seconds, baseline = _time(_legacy, pages)
+    entry_count = sum(len(entries) for entries, _ in baseline)
+    print(f"[CORPUS] {len(pages)} pages, {entry_count} entries")
+
+    for label, runner in modes:
+        seconds, outputs = (baseline_seconds, baseline) if runner is _legacy else _time(runner, pages)
+        status = "identical" if outputs == baseline else "MISMATCH"
+        print(f"[{label.upper():16}] pages/sec={len(pages) / seconds:8.1f} "
+              f"speedup={baseline_seconds / seconds:5.2f}x output={status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Record benchmark: peak RSS of cleaned entries held as CanonicalRecords vs. dicts.
+
+Cleans synthetic entries (bench_clean.synthetic_entries, generated one
+chunk at a time so the raw input never dominates memory) and keeps every
+cleaned entry as
+
+1. records -- clean.CanonicalRecord, as clean_data() returns them
+2. dicts   -- the same values in a dictionary per entry (record.to_dict()),
+              the previous representation
+
+Each mode runs in its own process, so ru_maxrss is that mode's peak alone.
+The values are the same interned strings in both modes; the difference is
+the per-entry container.
+
+Usage:
+    python benchmarks/bench_records.py [--entries N] [--seed S]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import clean  # noqa: E402
+from bench_clean import synthetic_entries  # noqa: E402
+
+CHUNK = 10_000
+MODES = ("records", "dicts")
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024  # Linux: KiB
+
+
+def _hold(mode: str, count: int, seed: int) -> None:
+    """Clean ``count`` entries, keep them all in ``mode`` form, print one result line."""
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    kept = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for offset in range(0, count, CHUNK):
+            records = clean.clean_batch(synthetic_entries(min(CHUNK, count - offset), seed + offset))
+            kept.extend(records if mode == "records" else [r.to_dict() for r in records])
+    seconds = time.perf_counter() - start
+    rss_after = _peak_rss()
+    print(f"{len(kept)} {sys.getsizeof(kept[0])} {rss_before} {rss_after} {seconds:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=500_000,
+                        help="cleaned entries to hold (default 500000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the corpus")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)  # Child process
+    args = parser.parse_args()
+
+    if args.mode:
+        _hold(args.mode, args.entries, args.seed)
+        return
+
+    print(f"[CORPUS] {args.entries} entries, each mode in a fresh process")
+    results = {}
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode,
+             "--entries", str(args.entries), "--seed", str(args.seed)],
+            check=True, capture_output=True, text=True).stdout
+        kept, size, rss_before, rss_after, seconds = output.split()
+        results[mode] = int(rss_after) - int(rss_before)
+        print(f"[{mode.upper():8}] entries={kept} container={size:>4} B "
+              f"peak RSS={int(rss_after) / 2**20:7.1f} MiB "
+              f"(+{results[mode] / 2**20:6.1f} MiB holding them) seconds={float(seconds):6.2f}")
+    print(f"[SAVED   ] records hold the entries in {results['records'] / results['dicts']:.0%} "
+          f"of the memory dicts need")
+
+
+if __name__ == "__main__":
+    main()
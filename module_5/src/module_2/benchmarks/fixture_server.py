@@ -0,0 +1,205 @@
+"""
+Local GradCafe stand-in for scraper benchmarks.
+
+Serves synthetic survey result pages shaped like the live site so the
+scraper can be exercised without touching thegradcafe.com.
+
+    /robots.txt           -> allow-all robots file
+    /survey               -> page 1
+    /survey?page=N        -> page N (empty results page after ``total_pages``)
+
+With ``pages_dir`` the server replays saved pages (page_00001.html, ...)
+instead of rendering synthetic ones.
+
+Responses honour ``Accept-Encoding: gzip`` and HTTP/1.1 keep-alive, and
+the server counts connections and body bytes sent so benchmarks can
+report transfer cost. Pages carry an ETag and Last-Modified header and
+conditional requests (If-None-Match / If-Modified-Since) for an unchanged
+page are answered with ``304 Not Modified``. Bump ``server.revision`` to
+simulate the site changing every page.
+"""
+
+import email.utils
+import gzip
+import hashlib
+import http.server
+import os
+import random
+import re
+import threading
+
+ROWS_PER_PAGE = 20
+LAST_MODIFIED = email.utils.formatdate(1767225600, usegmt=True)  # 2026-01-01
+
+SCHOOLS = [
+    "Johns Hopkins University", "Massachusetts Institute of Technology (MIT)",
+    "Stanford University", "University of California, Berkeley",
+    "Carnegie Mellon University", "University of Michigan, Ann Arbor",
+    "Georgia Institute of Technology", "University of Toronto",
+]
+PROGRAMS = ["Computer Science", "Statistics", "Mathematics", "Physics", "Economics"]
+DECISIONS = ["Accepted", "Rejected", "Wait listed", "Interview"]
+MONTHS = ["January", "February", "March", "April"]
+
+# Navigation, inline scripts and footer markup that every real page carries
+_BOILERPLATE = "".join(
+    f'<li class="nav-item"><a class="nav-link" href="/section/{i}">Section {i}</a></li>'
+    for i in range(60)
+)
+
+
+def render_row(page: int, index: int) -> str:
+    """Render one synthetic result row."""
+    rng = random.Random(page * 1000 + index)
+    school = rng.choice(SCHOOLS)
+    degree = rng.choice(["PhD", "Masters"])
+    return (
+        "<tr>"
+        f'<td class="institution"><div class="tw-font-medium">{school}</div></td>'
+        f'<td class="program"><span>{rng.choice(PROGRAMS)}</span> &middot; {degree}</td>'
+        f'<td class="date">{rng.choice(MONTHS)} {rng.randint(1, 28)}, 2026</td>'
+        f'<td class="decision"><div class="tw-inline-flex">{rng.choice(DECISIONS)} '
+        f"on {rng.randint(1, 28)} Feb</div></td>"
+        f'<td class="details">Fall 2026 &bull; {rng.choice(["International", "American"])} '
+        f"&bull; GPA {rng.uniform(2.5, 4.0):.2f} &bull; GRE {rng.randint(300, 340)}</td>"
+        f'<td class="comments"><p>Entry {page}-{index}: heard back by email &amp; portal.</p></td>'
+        "</tr>"
+    )
+
+
+def render_page(page: int, total_pages: int) -> str:
+    """Render a full results page (empty once past ``total_pages``)."""
+    if page > total_pages:
+        # Like the live site: no table at all, just a notice
+        listing = '<p class="tw-text-gray-500">No entries found.</p>'
+    else:
+        rows = "".join(render_row(page, i) for i in range(ROWS_PER_PAGE))
+        listing = f'<table class="results"><tbody>{rows}</tbody></table>'
+    return (
+        "<!DOCTYPE html><html><head><title>GradCafe Results</title>"
+        "<script>window.dataLayer = window.dataLayer || [];</script></head><body>"
+        f'<nav><ul class="nav">{_BOILERPLATE}</ul></nav>'
+        f"{listing}"
+        f'<div class="pagination"><a href="/survey?page={page + 1}" rel="next">Next</a></div>'
+        f"<footer>{_BOILERPLATE}</footer></body></html>"
+    )
+
+
+def save_pages(directory: str, total_pages: int) -> list:
+    """
+    Write synthetic pages to ``directory`` as page_00001.html, ...
+
+    Returns:
+        Sorted list of written file paths
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for page in range(1, total_pages + 1):
+        path = os.path.join(directory, f"page_{page:05d}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_page(page, total_pages))
+        paths.append(path)
+    return paths
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler serving synthetic survey pages."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def setup(self):
+        super().setup()
+        self.server.stats["connections"] += 1
+
+    def do_GET(self):  # noqa: N802 (http.server naming)
+        if self.path.startswith("/robots.txt"):
+            body = b"User-agent: *\nAllow: /\n"
+        else:
+            match = re.search(r"[?&]page=(\d+)", self.path)
+            page = int(match.group(1)) if match else 1
+            body = self._saved_page(page) if self.server.pages_dir else \
+                render_page(page, self.server.total_pages).encode("utf-8")
+            if self.server.revision:
+                body += f"<!-- revision {self.server.revision} -->".encode("utf-8")
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        last_modified = LAST_MODIFIED if not self.server.revision else \
+            email.utils.formatdate(1767225600 + self.server.revision, usegmt=True)
+        if self._not_modified(etag, last_modified):
+            # Count before responding so the client never outruns the stats
+            self.server.stats["requests"] += 1
+            self.server.stats["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.server.stats["requests"] += 1
+        self.server.stats["body_bytes"] += len(body)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _saved_page(self, page: int) -> bytes:
+        """Read a saved page, or render an empty results page past the end."""
+        path = os.path.join(self.server.pages_dir, f"page_{page:05d}.html")
+        if not os.path.exists(path):
+            return render_page(page, 0).encode("utf-8")
+        with open(path, "rb") as f:
+            return f.read()
+
+    def _not_modified(self, etag: str, last_modified: str) -> bool:
+        """Evaluate the request's conditional headers against the page."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or \
+                if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return email.utils.parsedate_to_datetime(last_modified) <= since
+        return False
+
+    def log_message(self, format, *args):  # noqa: A002 (http.server signature)
+        pass
+
+
+def start_server(total_pages: int = 50, handler=FixtureHandler, pages_dir: str = None):
+    """
+    Start the fixture server on a free localhost port in a daemon thread.
+
+    Args:
+        total_pages: Number of non-empty result pages to serve
+        handler: Request handler class
+        pages_dir: Directory of saved pages to serve instead of synthetic ones
+
+    Returns:
+        Tuple of (server, base_url); call server.shutdown() when done
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.total_pages = total_pages
+    server.pages_dir = pages_dir
+    server.revision = 0
+    server.stats = {"connections": 0, "requests": 0, "body_bytes": 0, "not_modified": 0}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def reset_stats(server) -> None:
+    """Zero the server's connection/request/byte/304 counters."""
+    for key in server.stats:
+        server.stats[key] = 0
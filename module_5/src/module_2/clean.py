@@ -18,10 +18,25 @@ Output Contract:
 - Missing fields are empty strings, never omitted
 """
 
+import argparse
+import functools
+import gzip
+import hashlib
 import html
+import inspect
+import itertools
 import json
+import os
 import re
-from typing import List, Dict, Optional
+import sqlite3
+import sys
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Union
+
+from src.columnar import (COLUMNAR_EXTENSIONS, parquet_available, read_columnar,
+                          write_gcol, write_parquet)
 
 
 # =============================================================================
@@ -34,6 +49,76 @@ INPUT_FILE = "raw_applicant_data.json"
 # Output: clean canonical data (consumed by llm_hosting/app.py)
 OUTPUT_FILE = "applicant_data.json"
 
+# Streaming mode (--stream) writes one cleaned record per line instead
+NDJSON_OUTPUT_FILE = "applicant_data.jsonl"
+
+# Characters read at a time when parsing a JSON array incrementally
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Newline-delimited JSON input (scrape.py --ndjson) is read lazily;
+# used when INPUT_FILE does not exist
+NDJSON_INPUT_FILE = "raw_applicant_data.jsonl"
+NDJSON_EXTENSIONS = (".jsonl", ".ndjson")
+
+# Incremental re-cleaning: every cleaned record is cached in SQLite keyed by
+# a hash of the raw entry, so a re-run only cleans new or changed entries.
+# The cache clears itself when the cleaning rules change: the schema, the
+# field mapping, the school lists, the regex patterns or the source of the
+# cleaning functions (see _rules_fingerprint).
+CLEAN_CACHE_FILE = "clean_cache.sqlite"
+CLEAN_CACHE_LOOKUP_CHUNK = 500  # Keys per SELECT ... IN (...)
+
+# Columnar output (--columnar): one column per CANONICAL_SCHEMA field instead
+# of repeating the keys in every record, as Parquet when pyarrow is installed
+# or else GCOL. Both formats are implemented in columnar.py.
+PARQUET_OUTPUT_FILE = "applicant_data.parquet"
+GCOL_OUTPUT_FILE = "applicant_data.gcol"
+
+# Page archive written by scrape.py: entries reference their row markup by
+# page_hash/row_offset/row_length instead of carrying raw_html
+PAGE_ARCHIVE_DIR = "page_archive"
+
+# Decompressed archive blobs kept in memory (entries of a page are adjacent)
+ARCHIVE_CACHE_PAGES = 8
+
+# Schools recovered from raw_html are matched against the canonical
+# university list (shared with llm_hosting/app.py) plus SCHOOL_ABBREVIATIONS,
+# and reported by their canonical name. All-caps aliases only match in
+# capitals ("MIT", not "mit"). Ambiguous abbreviations are listed only with
+# the word that disambiguates them: a bare "UW" is Washington to some
+# applicants and Wisconsin to others, so only "UW Madison"/"UW Seattle" match.
+CANON_UNIVERSITIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "llm_hosting", "canon_universities.txt")
+SCHOOL_ABBREVIATIONS = {
+    "MIT": "Massachusetts Institute of Technology",
+    "Caltech": "California Institute of Technology",
+    "CalTech": "California Institute of Technology",
+    "CMU": "Carnegie Mellon University",
+    "Stanford": "Stanford University",
+    "Harvard": "Harvard University",
+    "Yale": "Yale University",
+    "Princeton": "Princeton University",
+    "NYU": "New York University",
+    "UCLA": "University of California, Los Angeles",
+    "UC Berkeley": "University of California, Berkeley",
+    "UCSD": "University of California, San Diego",
+    "USC": "University of Southern California",
+    "UPenn": "University of Pennsylvania",
+    "JHU": "Johns Hopkins University",
+    "Georgia Tech": "Georgia Institute of Technology",
+    "UIUC": "University of Illinois Urbana-Champaign",
+    "UMich": "University of Michigan, Ann Arbor",
+    "UT Austin": "University of Texas at Austin",
+    "UW Madison": "University of Wisconsin–Madison",
+    "UW-Madison": "University of Wisconsin–Madison",
+    "UW Milwaukee": "University of Wisconsin–Milwaukee",
+    "UW-Milwaukee": "University of Wisconsin–Milwaukee",
+    "UW Seattle": "University of Washington",
+    "UofT": "University of Toronto",
+    "UBC": "University of British Columbia",
+    "McGill": "McGill University",
+}
+
 # Canonical schema - every output record will have exactly these keys
 CANONICAL_SCHEMA = [
     "school",
@@ -46,59 +131,183 @@ CANONICAL_SCHEMA = [
 ]
 
 
+# Entries cleaned per batch; progress is reported once per batch
+CLEAN_BATCH_SIZE = 5000
+
+# With CLEAN_WORKERS > 0, batches are cleaned by that many worker processes.
+# At most CLEAN_WORKERS * CLEAN_BATCHES_AHEAD batches are in flight, so
+# memory stays bounded when streaming NDJSON input.
+CLEAN_WORKERS = 0  # 0 cleans in the main process
+CLEAN_BATCHES_AHEAD = 2
+
+# Raw entry keys feeding each canonical field, in priority order (the first
+# non-empty one wins). Notes join every non-empty source instead.
+FIELD_SOURCES = (
+    ("school", ("institution", "school", "university")),
+    ("program", ("program", "major", "department", "degree")),
+    ("decision", ("decision", "status", "result")),
+    ("decision_date", ("date_added", "decision_date", "date", "notification_date")),
+    ("gpa", ("gpa", "undergrad_gpa")),
+    ("gre", ("gre", "gre_score", "gre_scores")),
+)
+NOTES_SOURCES = ("comments", "notes", "details", "raw_content")
+NOTES_MAX_LENGTH = 1000
+
+# School, program, decision, date, GPA and GRE values repeat heavily, so
+# their cleaned form is memoized in an LRU cache of FIELD_CACHE_SIZE raw
+# values and interned, so equal outputs share one string. Notes are nearly
+# unique and always cleaned directly.
+FIELD_CACHE_SIZE = 50_000
+
+# Output validation rules, each counted separately over the whole file.
+# Only the first VALIDATE_EXAMPLES issues are printed in full.
+VALIDATION_RULES = ("invalid_json", "not_dict", "missing_keys", "extra_keys",
+                    "not_string", "html_residue")
+VALIDATE_EXAMPLES = 10
+
+# NDJSON lines decoded together as one JSON array while validating
+VALIDATE_DECODE_LINES = 1000
+
+
 # =============================================================================
-# PRIVATE HELPER FUNCTIONS — TEXT CLEANING PIPELINE
+# PRECOMPILED PATTERNS
+# Compiled once at import; every cleaning call reuses them.
 # =============================================================================
 
-def _strip_html_tags(text: str) -> str:
-    """
-    Remove all HTML tags from text.
+_TAG_RE = re.compile(r"<[^>]*>")  # Tags, including self-closing and malformed
+_HTML_TAG_RE = re.compile(r"<[^>]+>")  # Tag check used by _validate_output
+_SCHEMA_KEYS = frozenset(CANONICAL_SCHEMA)
+_JSON_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+_JSON_NUMBER_CHARS_RE = re.compile(r"[0-9+\-.eE]+")  # Possible rest of a number
+
+# School names are matched word by word (see SchoolMatcher); punctuation
+# marks are words of their own, and dash/apostrophe variants compare equal.
+_SCHOOL_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SCHOOL_TOKEN_FOLD = {"\u2013": "-", "\u2014": "-", "\u2019": "'", "\u2018": "'"}
+_SCHOOL_PARENTHETICAL_RE = re.compile(r"\s*\([^)]*\)$")
+# Schools missing from the canonical list still get a best-effort guess
+_SCHOOL_FALLBACK_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"(?:University|College|Institute|School)\s+of\s+[\w\s]+",
+    r"[\w\s]+(?:University|College|Institute|School)",
+))
+_DECISION_RE = re.compile(
+    r"\b(Accepted|Rejected|Waitlisted|Interview|Pending|Denied|Admitted)\b", re.IGNORECASE
+)
+_GPA_RE = re.compile(r"\bGPA[:\s]*([0-9]\.[0-9]{1,2})\b", re.IGNORECASE)
+_GRE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"\bGRE[:\s]*(\d{3})[/\s]+(\d{3})",
+    r"\bV[:\s]*(\d{3})[,\s]+Q[:\s]*(\d{3})",
+))
+_DATE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b",
+    r"\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})\b",
+))
 
-    Args:
-        text: String potentially containing HTML tags
 
-    Returns:
-        String with all HTML tags removed
+# =============================================================================
+# CANONICAL RECORD
+# =============================================================================
+
+class CanonicalRecord:
+    """
+    One cleaned entry: a fixed-layout object with a slot per CANONICAL_SCHEMA field.
+
+    Cleaned entries are held as CanonicalRecords instead of dictionaries:
+    the object is 88 bytes against 272 for a 7-key dict, which takes about
+    40% off the memory of a large cleaned list (benchmarks/bench_records.py).
+    The read side of the dict interface (record["school"], get, in, keys,
+    values, items) is
+    kept for existing consumers such as load_data.load_rows; conversion to
+    a real dict (to_dict) only happens when records are written as JSON.
     """
-    if not text:
-        return ""
-    # Remove HTML tags (including self-closing and malformed)
-    return re.sub(r"<[^>]*>", " ", text)
 
+    __slots__ = ("school", "program", "decision", "decision_date", "gpa", "gre", "notes")
 
-def _unescape_html_entities(text: str) -> str:
-    """
-    Convert HTML entities to their character equivalents.
+    def __init__(self, school: str = "", program: str = "", decision: str = "",
+                 decision_date: str = "", gpa: str = "", gre: str = "", notes: str = ""):
+        self.school = school
+        self.program = program
+        self.decision = decision
+        self.decision_date = decision_date
+        self.gpa = gpa
+        self.gre = gre
+        self.notes = notes
 
-    Args:
-        text: String potentially containing HTML entities
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "CanonicalRecord":
+        """Build a record from a dictionary with CANONICAL_SCHEMA keys (others are ignored)."""
+        return cls(*(data.get(key, "") for key in CANONICAL_SCHEMA))
 
-    Returns:
-        String with HTML entities converted to characters
-    """
-    if not text:
-        return ""
-    # Use Python's html.unescape for comprehensive entity handling
-    return html.unescape(text)
+    def to_dict(self) -> Dict[str, str]:
+        """Return the record as a dictionary in CANONICAL_SCHEMA order."""
+        return {key: getattr(self, key) for key in CANONICAL_SCHEMA}
 
+    def keys(self) -> List[str]:
+        """Return the field names (CANONICAL_SCHEMA)."""
+        return list(CANONICAL_SCHEMA)
 
-def _collapse_whitespace(text: str) -> str:
-    """
-    Normalize all whitespace to single spaces and strip edges.
+    def values(self) -> tuple:
+        """Return the field values in CANONICAL_SCHEMA order."""
+        return (self.school, self.program, self.decision, self.decision_date,
+                self.gpa, self.gre, self.notes)
 
-    Args:
-        text: String with potentially irregular whitespace
+    def items(self) -> List[tuple]:
+        """Return (field, value) pairs in CANONICAL_SCHEMA order."""
+        return list(zip(CANONICAL_SCHEMA, self.values()))
 
-    Returns:
-        String with normalized whitespace
-    """
-    if not text:
-        return ""
-    # Replace any whitespace sequence with single space
-    text = re.sub(r"\s+", " ", text)
-    # Strip leading/trailing whitespace
-    return text.strip()
+    def get(self, key: str, default=None):
+        """Return a field's value, or ``default`` for names outside the schema."""
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: str) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(CANONICAL_SCHEMA)
 
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CanonicalRecord):
+            return self.values() == other.values()
+        return NotImplemented
+
+    __hash__ = None  # Mutable, like the dict it replaces
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.items())
+        return f"CanonicalRecord({fields})"
+
+    def __reduce__(self):
+        # Pickled as its values alone (worker batches cross process boundaries)
+        return CanonicalRecord, self.values()
+
+
+if list(CanonicalRecord.__slots__) != CANONICAL_SCHEMA:
+    raise RuntimeError("CanonicalRecord.__slots__ must match CANONICAL_SCHEMA")
+
+
+def _record_to_json(obj):
+    """json ``default`` hook: serialize CanonicalRecords as dictionaries."""
+    if isinstance(obj, CanonicalRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# =============================================================================
+# PRIVATE HELPER FUNCTIONS — TEXT CLEANING PIPELINE
+# =============================================================================
 
 def _clean_text(text: Optional[str]) -> str:
     """
@@ -108,10 +317,13 @@ def _clean_text(text: Optional[str]) -> str:
 
     Pipeline:
     1. Convert to string (handle None/non-string)
-    2. Remove HTML tags
-    3. Unescape HTML entities
+    2. Remove HTML tags (only if the text contains "<")
+    3. Unescape HTML entities (only if the text contains "&")
     4. Collapse whitespace
 
+    Most field values are plain text, so steps 2 and 3 are usually skipped
+    and cleaning costs one split/join.
+
     Args:
         text: Raw field value (may be None, string, or other type)
 
@@ -124,12 +336,135 @@ def _clean_text(text: Optional[str]) -> str:
     if not isinstance(text, str):
         text = str(text)
 
-    # Apply cleaning pipeline in order
-    text = _strip_html_tags(text)
-    text = _unescape_html_entities(text)
-    text = _collapse_whitespace(text)
+    # Apply cleaning pipeline in order, skipping steps that cannot match
+    if "<" in text:
+        text = _TAG_RE.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return " ".join(text.split())
 
-    return text
+
+def _first_match(patterns: tuple, text: str):
+    """Return the first match of the first pattern that matches, or None."""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+class SchoolMatcher:
+    """
+    Aho-Corasick automaton over school names, built once per process.
+
+    Names are split into words (_SCHOOL_TOKEN_RE) and the automaton steps
+    once per word of the text, so a single left-to-right pass finds every
+    listed name at once, however many there are. The leftmost match wins,
+    and the longest one among matches starting at the same word, so
+    "University of California, Berkeley" beats a shorter name inside it.
+    Matches always cover whole words.
+    """
+
+    def __init__(self, names: List[str], aliases: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            names: Canonical school names
+            aliases: Alternative spelling -> canonical name
+        """
+        self.names = tuple(names)
+        patterns = {name: name for name in self.names}
+        for name in self.names:
+            # "University of Newcastle (Australia)" also matches without the qualifier
+            patterns.setdefault(_SCHOOL_PARENTHETICAL_RE.sub("", name), name)
+        for alias, name in (aliases or {}).items():
+            patterns.setdefault(alias, name)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[tuple]] = [[]]
+        for pattern, name in patterns.items():
+            words = self._words(pattern)
+            if not words:
+                continue
+            node = 0
+            for word in words:
+                if word not in self._goto[node]:
+                    self._goto[node][word] = len(self._goto)
+                    self._goto.append({})
+                    outputs.append([])
+                node = self._goto[node][word]
+            # All-caps aliases must match case, checked against the last (only) word
+            exact = pattern if pattern.isupper() and len(words) == 1 else None
+            outputs[node].append((len(words), name, exact))
+        self.max_words = max((len(self._words(pattern)) for pattern in patterns), default=0)
+
+        # Failure links, breadth first; a node also reports its fallback's outputs
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                outputs[child].extend(outputs[self._fail[child]])
+        # Longest first, so the first accepted output at a word is the best there
+        self._outputs = [tuple(sorted(found, key=lambda item: -item[0])) for found in outputs]
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        """Split text into lowercased, dash/apostrophe-folded words."""
+        return [_SCHOOL_TOKEN_FOLD.get(word, word)
+                for word in _SCHOOL_TOKEN_RE.findall(text.lower())]
+
+    def find(self, text: str) -> str:
+        """
+        Return the canonical name of the first school mentioned in text.
+
+        HTML entities are decoded first, so row markup such as
+        "Texas A&amp;M University" matches its listed name.
+
+        Returns:
+            Canonical name, or an empty string if no listed school is mentioned
+        """
+        if "&" in text:
+            text = html.unescape(text)
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        fold = _SCHOOL_TOKEN_FOLD
+        best_start, best_length, best_name = -1, 0, ""
+        node = 0
+        for position, token in enumerate(_SCHOOL_TOKEN_RE.findall(text)):
+            word = token.lower()
+            word = fold.get(word, word)
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            for length, name, exact in outputs[node]:
+                if exact is not None and token != exact:
+                    continue
+                start = position - length + 1
+                if best_start < 0 or start < best_start or (
+                        start == best_start and length > best_length):
+                    best_start, best_length, best_name = start, length, name
+                break
+            # No match ending later can start before the best one
+            if best_start >= 0 and position - best_start + 1 >= self.max_words:
+                break
+        return best_name
+
+
+@functools.lru_cache(maxsize=None)
+def _school_matcher() -> SchoolMatcher:
+    """Build the school automaton from CANON_UNIVERSITIES_FILE (once per process)."""
+    try:
+        with open(CANON_UNIVERSITIES_FILE, "r", encoding="utf-8") as f:
+            names = [line.strip() for line in f if line.strip()]
+    except OSError as e:
+        print(f"[WARNING] Canonical university list unavailable ({e}); "
+              "matching SCHOOL_ABBREVIATIONS only")
+        names = []
+    return SchoolMatcher(names, SCHOOL_ABBREVIATIONS)
 
 
 def _extract_from_raw_html(raw_html: str) -> Dict[str, str]:
@@ -137,7 +472,10 @@ def _extract_from_raw_html(raw_html: str) -> Dict[str, str]:
     Extract structured fields from raw HTML content using regex patterns.
 
     This handles cases where the scraper stored raw_html but couldn't
-    extract specific fields during scraping.
+    extract specific fields during scraping. The school is the first one
+    _school_matcher() finds, under its canonical name; the generic
+    "University of ..." patterns are only tried when no listed school is
+    mentioned.
 
     Args:
         raw_html: Raw HTML string from scraped entry
@@ -145,7 +483,7 @@ def _extract_from_raw_html(raw_html: str) -> Dict[str, str]:
     Returns:
         Dictionary with extracted field values
     """
-    extracted = {key: "" for key in CANONICAL_SCHEMA}
+    extracted = dict.fromkeys(CANONICAL_SCHEMA, "")
 
     if not raw_html:
         return extracted
@@ -154,150 +492,470 @@ def _extract_from_raw_html(raw_html: str) -> Dict[str, str]:
     text_content = _clean_text(raw_html)
 
     # Try to extract school/institution
-    school_patterns = [
-        r"(?:University|College|Institute|School)\s+of\s+[\w\s]+",
-        r"[\w\s]+(?:University|College|Institute|School)",
-        r"(?:MIT|UCLA|USC|NYU|CMU|CalTech|Stanford|Harvard|Yale|Princeton)",
-    ]
-    for pattern in school_patterns:
-        match = re.search(pattern, text_content, re.IGNORECASE)
+    extracted["school"] = _school_matcher().find(text_content)
+    if not extracted["school"]:
+        match = _first_match(_SCHOOL_FALLBACK_RES, text_content)
         if match:
             extracted["school"] = match.group(0).strip()
-            break
 
     # Try to extract decision
-    decision_match = re.search(
-        r"\b(Accepted|Rejected|Waitlisted|Interview|Pending|Denied|Admitted)\b",
-        text_content, re.IGNORECASE
-    )
-    if decision_match:
-        extracted["decision"] = decision_match.group(1).strip()
+    match = _DECISION_RE.search(text_content)
+    if match:
+        extracted["decision"] = match.group(1).strip()
 
     # Try to extract GPA
-    gpa_match = re.search(r"\bGPA[:\s]*([0-9]\.[0-9]{1,2})\b", text_content, re.IGNORECASE)
-    if gpa_match:
-        extracted["gpa"] = gpa_match.group(1)
+    match = _GPA_RE.search(text_content)
+    if match:
+        extracted["gpa"] = match.group(1)
 
     # Try to extract GRE scores
-    gre_patterns = [
-        r"\bGRE[:\s]*(\d{3})[/\s]+(\d{3})",
-        r"\bV[:\s]*(\d{3})[,\s]+Q[:\s]*(\d{3})",
-    ]
-    for pattern in gre_patterns:
-        match = re.search(pattern, text_content, re.IGNORECASE)
-        if match:
-            extracted["gre"] = match.group(0).strip()
-            break
+    match = _first_match(_GRE_RES, text_content)
+    if match:
+        extracted["gre"] = match.group(0).strip()
 
     # Try to extract date
-    date_patterns = [
-        r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b",
-        r"\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})\b",
-    ]
-    for pattern in date_patterns:
-        match = re.search(pattern, text_content, re.IGNORECASE)
-        if match:
-            extracted["decision_date"] = match.group(1).strip()
-            break
+    match = _first_match(_DATE_RES, text_content)
+    if match:
+        extracted["decision_date"] = match.group(1).strip()
 
     return extracted
 
 
-def _map_entry_to_schema(entry: Dict) -> Dict[str, str]:
+class PageArchiveReader:
+    """
+    Lazy reader for the content-addressed page archive written by scrape.py.
+
+    Blobs are only opened when an entry's row markup is actually requested,
+    and the most recently used ARCHIVE_CACHE_PAGES decompressed pages are
+    kept so the rows of one page share a single decompression. A blob whose
+    content no longer hashes to its name is treated as unreadable.
+    """
+
+    def __init__(self, directory: str = PAGE_ARCHIVE_DIR,
+                 cache_pages: int = ARCHIVE_CACHE_PAGES):
+        self.directory = directory
+        self.cache_pages = cache_pages
+        self.pages_loaded = 0
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    def _page(self, page_hash: str) -> str:
+        page = self._cache.get(page_hash)
+        if page is not None:
+            self._cache.move_to_end(page_hash)
+            return page
+        path = os.path.join(self.directory, page_hash[:2], f"{page_hash}.html.gz")
+        with gzip.open(path, "rb") as f:
+            blob = f.read()
+        if hashlib.sha256(blob).hexdigest() != page_hash:
+            raise ValueError("content does not match its hash")
+        page = blob.decode("utf-8")
+        self.pages_loaded += 1
+        self._cache[page_hash] = page
+        if len(self._cache) > self.cache_pages:
+            self._cache.popitem(last=False)
+        return page
+
+    def row_html(self, entry: Dict) -> str:
+        """
+        Return an entry's row markup, inline or from the archive.
+
+        Args:
+            entry: Raw entry with raw_html or page_hash/row_offset/row_length
+
+        Returns:
+            Row HTML, or "" if the entry has none or its blob is unreadable
+        """
+        if entry.get("raw_html"):
+            return entry["raw_html"]
+        page_hash = entry.get("page_hash")
+        if not page_hash:
+            return ""
+        try:
+            page = self._page(page_hash)
+        except (OSError, EOFError, zlib.error, ValueError) as e:
+            print(f"[WARNING] Archived page {page_hash} unreadable: {e}")
+            return ""
+        start = entry.get("row_offset", 0)
+        return page[start:start + entry.get("row_length", 0)]
+
+
+@functools.lru_cache(maxsize=FIELD_CACHE_SIZE)
+def _clean_field(value: str) -> str:
+    """
+    Memoized, interned _clean_text for repetitive string field values.
+
+    sys.intern makes every record holding the same school or program
+    reference one string object. Hit and miss counts are available from
+    _clean_field.cache_info(); only str values may be passed (lists and
+    dicts are unhashable).
+    """
+    return sys.intern(_clean_text(value))
+
+
+def _map_entry_to_schema(entry: Dict,
+                         archive: Optional[PageArchiveReader] = None) -> CanonicalRecord:
     """
     Map a raw scraped entry to the canonical schema.
 
     Handles various input field names and ensures output has
-    exactly the canonical keys with cleaned values.
+    exactly the canonical fields with cleaned values.
 
     Args:
         entry: Raw entry dictionary from scraper
+        archive: Reader for entries whose raw_html was archived by page
 
     Returns:
-        Dictionary with canonical schema keys and cleaned values
-    """
-    # Initialize with empty strings for all canonical fields
-    cleaned = {key: "" for key in CANONICAL_SCHEMA}
-
-    # Map input fields to canonical fields (apply _clean_text to each)
-
-    # School/Institution
-    for key in ["institution", "school", "university"]:
-        if key in entry and entry[key]:
-            cleaned["school"] = _clean_text(entry[key])
-            break
-
-    # Program
-    for key in ["program", "major", "department", "degree"]:
-        if key in entry and entry[key]:
-            cleaned["program"] = _clean_text(entry[key])
-            break
-
-    # Decision
-    for key in ["decision", "status", "result"]:
-        if key in entry and entry[key]:
-            cleaned["decision"] = _clean_text(entry[key])
-            break
-
-    # Decision date
-    for key in ["date_added", "decision_date", "date", "notification_date"]:
-        if key in entry and entry[key]:
-            cleaned["decision_date"] = _clean_text(entry[key])
-            break
-
-    # GPA
-    for key in ["gpa", "undergrad_gpa"]:
-        if key in entry and entry[key]:
-            cleaned["gpa"] = _clean_text(entry[key])
-            break
-
-    # GRE
-    for key in ["gre", "gre_score", "gre_scores"]:
-        if key in entry and entry[key]:
-            cleaned["gre"] = _clean_text(entry[key])
-            break
+        CanonicalRecord with cleaned values
+    """
+    # Every canonical field starts as an empty string
+    cleaned = CanonicalRecord()
+
+    # Map input fields to canonical fields (first non-empty source wins)
+    clean_field = _clean_field
+    for field, sources in FIELD_SOURCES:
+        for key in sources:
+            value = entry.get(key)
+            if value:
+                setattr(cleaned, field, clean_field(value) if value.__class__ is str
+                        else _clean_text(value))
+                break
 
     # Notes/Comments - combine multiple potential sources
     notes_parts = []
-    for key in ["comments", "notes", "details", "raw_content"]:
-        if key in entry and entry[key]:
-            cleaned_value = _clean_text(entry[key])
+    for key in NOTES_SOURCES:
+        value = entry.get(key)
+        if value:
+            cleaned_value = _clean_text(value)
             if cleaned_value:
                 notes_parts.append(cleaned_value)
 
     if notes_parts:
-        cleaned["notes"] = " | ".join(notes_parts)
+        notes = " | ".join(notes_parts)
         # Truncate if too long
-        if len(cleaned["notes"]) > 1000:
-            cleaned["notes"] = cleaned["notes"][:1000] + "..."
-
-    # If we have raw_html but missing critical fields, try to extract them
-    if "raw_html" in entry and entry["raw_html"]:
-        if not cleaned["school"] or not cleaned["program"] or not cleaned["decision"]:
-            extracted = _extract_from_raw_html(entry["raw_html"])
+        if len(notes) > NOTES_MAX_LENGTH:
+            notes = notes[:NOTES_MAX_LENGTH] + "..."
+        cleaned.notes = notes
+
+    # If we have raw_html but missing critical fields, try to extract them.
+    # Archived markup is only read from disk when it is actually needed.
+    if entry.get("raw_html") or (archive is not None and entry.get("page_hash")):
+        if not cleaned.school or not cleaned.program or not cleaned.decision:
+            raw_html = archive.row_html(entry) if archive is not None else entry["raw_html"]
+            extracted = _extract_from_raw_html(raw_html)
             # Only fill in missing fields
             for key in CANONICAL_SCHEMA:
-                if not cleaned[key] and extracted.get(key):
-                    cleaned[key] = extracted[key]
+                if not getattr(cleaned, key) and extracted.get(key):
+                    setattr(cleaned, key, extracted[key])
 
     return cleaned
 
 
+# =============================================================================
+# INCREMENTAL RE-CLEAN CACHE
+# =============================================================================
+
+# Code that turns a raw entry into a CanonicalRecord; its source is part of
+# the rules fingerprint, so editing any of it invalidates the cache
+_CLEANING_CODE = (_clean_text, _first_match, SchoolMatcher, _school_matcher,
+                  _extract_from_raw_html, _clean_field, _map_entry_to_schema)
+
+
+def _rules_patterns() -> List[tuple]:
+    """Return (name, pattern, flags) for every compiled regex in this module."""
+    found = []
+    for name, value in sorted(globals().items()):
+        patterns = value if isinstance(value, tuple) else (value,)
+        if patterns and all(isinstance(pattern, re.Pattern) for pattern in patterns):
+            found.extend((name, pattern.pattern, pattern.flags) for pattern in patterns)
+    return found
+
+
+def _rules_fingerprint() -> str:
+    """
+    Hash of everything that decides a cleaned record besides the raw entry.
+
+    Covers the schema and field tables, the school lists, every compiled
+    regex in the module and the source of _CLEANING_CODE, so any change to
+    a cleaning rule yields a new fingerprint.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    tables = (CANONICAL_SCHEMA, FIELD_SOURCES, NOTES_SOURCES, NOTES_MAX_LENGTH,
+              _school_matcher().names, SCHOOL_ABBREVIATIONS, _SCHOOL_TOKEN_FOLD)
+    digest.update(repr(tables).encode("utf-8"))
+    digest.update(repr(_rules_patterns()).encode("utf-8"))
+    for code in _CLEANING_CODE:
+        digest.update(inspect.getsource(code).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def raw_entry_key(entry: Dict) -> bytes:
+    """
+    Content hash of a raw entry.
+
+    Hashes repr(entry), about twice as fast as json.dumps. The scraper
+    writes keys in a fixed order; an entry whose keys arrive in another
+    order only misses the cache, it never matches a different entry.
+    """
+    return hashlib.blake2b(repr(entry).encode("utf-8"), digest_size=16).digest()
+
+
+class CleanCache:
+    """
+    Persistent map from raw-entry content hash to cleaned record.
+
+    Records live in a SQLite table (WITHOUT ROWID, so a lookup is a single
+    B-tree probe) with one column per CANONICAL_SCHEMA field, next to the
+    _rules_fingerprint() they were cleaned under.
+    Opening the cache with a different fingerprint, or with
+    invalidate=True, drops the table and starts over.
+    Archived entries are keyed by their page_hash, which is itself a content
+    hash, so a changed row in the archive also changes the key.
+    """
+
+    def __init__(self, path: str = CLEAN_CACHE_FILE, invalidate: bool = False):
+        self.path = path
+        self.reused = 0
+        self.stored = 0
+        self._db = sqlite3.connect(path)
+        # A lost write only costs a re-clean, so skip the fsync per commit
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'rules'").fetchone()
+        fingerprint = _rules_fingerprint()
+        if invalidate or (row is not None and row[0] != fingerprint):
+            reason = "requested" if invalidate else "cleaning rules changed"
+            print(f"[INCREMENTAL] Invalidating {path} ({reason})")
+            self._db.execute("DROP TABLE IF EXISTS cleaned")
+        columns = ", ".join(f'"{field}" TEXT NOT NULL' for field in CANONICAL_SCHEMA)
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS cleaned "
+                         f"(key BLOB PRIMARY KEY, {columns}) WITHOUT ROWID")
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES ('rules', ?)", (fingerprint,))
+        self._db.commit()
+        self._insert_sql = (f"INSERT OR REPLACE INTO cleaned VALUES "
+                            f"(?{', ?' * len(CANONICAL_SCHEMA)})")
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM cleaned").fetchone()[0]
+
+    def _lookup(self, keys: List[bytes]) -> Dict[bytes, CanonicalRecord]:
+        found = {}
+        for start in range(0, len(keys), CLEAN_CACHE_LOOKUP_CHUNK):
+            chunk = keys[start:start + CLEAN_CACHE_LOOKUP_CHUNK]
+            rows = self._db.execute(
+                f"SELECT * FROM cleaned WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            for row in rows:
+                # Re-intern the values, as _clean_field would have
+                found[row[0]] = CanonicalRecord(*map(sys.intern, row[1:]))
+        return found
+
+    def split(self, batch: List, offset: int) -> tuple:
+        """
+        Separate a raw batch into cached records and entries still to clean.
+
+        Entries that are not dictionaries are reported and dropped here,
+        as clean_batch would.
+
+        Args:
+            batch: Raw entries
+            offset: Index of the first entry in the whole input (for warnings)
+
+        Returns:
+            Tuple of (plan, misses): in input order, plan holds a cached
+            record or the key of a miss to store once cleaned; misses are
+            the entries to clean
+        """
+        entries = []
+        for i, entry in enumerate(batch, offset):
+            if not isinstance(entry, dict):
+                print(f"[WARNING] Entry {i} is not a dictionary, skipping")
+                continue
+            entries.append(entry)
+        plan = [raw_entry_key(entry) for entry in entries]
+        found = self._lookup(plan)
+        misses = []
+        for i, (key, entry) in enumerate(zip(plan, entries)):
+            record = found.get(key)
+            if record is None:
+                misses.append(entry)
+            else:
+                plan[i] = record
+                self.reused += 1
+        return plan, misses
+
+    def merge(self, plan: List, cleaned: List[CanonicalRecord]) -> List[CanonicalRecord]:
+        """
+        Fill the misses of a split() plan with their cleaned records and cache them.
+
+        Args:
+            plan: Plan returned by split()
+            cleaned: clean_batch output for that split's misses, in order
+
+        Returns:
+            Cleaned records for the whole batch, in input order
+        """
+        fresh = iter(cleaned)
+        merged = []
+        rows = []
+        for item in plan:
+            if item.__class__ is bytes:
+                record = next(fresh)
+                rows.append((item, *record.values()))
+                item = record
+            merged.append(item)
+        if rows:
+            self._db.executemany(self._insert_sql, rows)
+            self._db.commit()
+            self.stored += len(rows)
+        return merged
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
 # =============================================================================
 # PUBLIC API FUNCTIONS
 # =============================================================================
 
-def load_data(filename: str = INPUT_FILE) -> List[Dict]:
+class NDJSONEntries:
+    """
+    Lazy, re-iterable view over a newline-delimited JSON file.
+
+    Entries are decoded one line at a time while iterating, so memory use
+    does not grow with the file. len() counts lines without decoding them.
+    Blank lines are ignored; lines that fail to decode are reported and
+    skipped.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._length = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"[WARNING] {self.filename}:{line_number} invalid JSON, skipping ({e})")
+
+    def __len__(self) -> int:
+        if self._length is None:
+            count = 0
+            with open(self.filename, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        count += 1
+            self._length = count
+        return self._length
+
+
+class JSONArrayEntries:
+    """
+    Lazy, re-iterable view over a file holding one JSON array.
+
+    The file is read STREAM_CHUNK_SIZE characters at a time and each array
+    element is decoded with JSONDecoder.raw_decode as soon as it is
+    complete, so only the current element and one chunk are in memory.
+    Iteration raises ValueError if the file is not a well-formed array.
+    """
+
+    def __init__(self, filename: str, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.filename = filename
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator:
+        decoder = json.JSONDecoder()
+        skip_whitespace = _JSON_WHITESPACE_RE.match
+        with open(self.filename, "r", encoding="utf-8") as f:
+            buffer = f.read(self.chunk_size)
+            eof = not buffer
+            pos = skip_whitespace(buffer, 0).end()
+            if buffer[pos:pos + 1] != "[":
+                raise ValueError(f"{self.filename} does not contain a JSON array")
+            pos += 1
+            expect_value = True  # False right after an element (a "," or "]" is due)
+            after_comma = False
+            while True:
+                pos = skip_whitespace(buffer, pos).end()
+                if pos < len(buffer):
+                    char = buffer[pos]
+                    if char == "]":
+                        if after_comma:
+                            raise ValueError(f"trailing ',' before ']' in {self.filename}")
+                        return
+                    if not expect_value:
+                        if char != ",":
+                            raise ValueError(f"expected ',' or ']' at character {pos} "
+                                             f"of the current chunk of {self.filename}")
+                        pos += 1
+                        expect_value = after_comma = True
+                        continue
+                    try:
+                        value, end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        end = None  # Element continues in the next chunk
+                    # A value ending exactly at the chunk edge may be cut short,
+                    # and so may a number whose "." or exponent is all that is
+                    # left of the chunk ("1." decodes as 1)
+                    if end is not None and not eof and (
+                            end == len(buffer)
+                            or (char in "-0123456789"
+                                and _JSON_NUMBER_CHARS_RE.fullmatch(buffer, end))):
+                        end = None
+                    if end is not None:
+                        yield value
+                        pos = end
+                        expect_value = after_comma = False
+                        continue
+                elif eof:
+                    raise ValueError(f"{self.filename}: unterminated JSON array")
+                chunk = f.read(self.chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+
+
+def iter_entries(filename: str) -> Union[JSONArrayEntries, NDJSONEntries, List[Dict]]:
+    """
+    Return the entries of a JSON array, NDJSON or columnar file.
+
+    JSON arrays and NDJSON (.jsonl/.ndjson) are read lazily; a columnar
+    file (.parquet/.gcol) is decoded whole into a list of records.
+    """
+    if filename.endswith(NDJSON_EXTENSIONS):
+        return NDJSONEntries(filename)
+    if filename.endswith(COLUMNAR_EXTENSIONS):
+        columns = read_columnar(filename)
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+    return JSONArrayEntries(filename)
+
+
+def load_data(filename: str = INPUT_FILE) -> Union[List[Dict], NDJSONEntries]:
     """
     Load raw scraped applicant data from JSON file.
 
+    NDJSON files (.jsonl/.ndjson, as written by scrape.py --ndjson) are not
+    read into memory; an NDJSONEntries view is returned instead and entries
+    are decoded as clean_data iterates over them.
+
     Args:
-        filename: Path to the JSON file containing raw scraped data
+        filename: Path to the JSON or NDJSON file containing raw scraped data
 
     Returns:
-        List of entry dictionaries (may be empty on error)
+        List of entry dictionaries or an NDJSONEntries view (empty on error)
     """
     try:
+        if filename.endswith(NDJSON_EXTENSIONS):
+            data = NDJSONEntries(filename)
+            print(f"[LOADED] {len(data)} entries from {filename} (streaming)")
+            return data
+
         with open(filename, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -320,67 +978,284 @@ def load_data(filename: str = INPUT_FILE) -> List[Dict]:
         return []
 
 
-def clean_data(entries: List[Dict]) -> List[Dict[str, str]]:
+def clean_batch(entries: List, archive: Optional[PageArchiveReader] = None,
+                offset: int = 0) -> List[CanonicalRecord]:
+    """
+    Clean a batch of raw entries in one pass.
+
+    Every record has exactly the CANONICAL_SCHEMA fields, because it is a
+    CanonicalRecord. Entries that are not dictionaries are reported and
+    skipped.
+
+    Args:
+        entries: Raw entry dictionaries
+        archive: Reader for entries whose raw_html was archived by page
+        offset: Index of the first entry in the whole input (for warnings)
+
+    Returns:
+        List of cleaned records, in input order
+    """
+    map_entry = _map_entry_to_schema
+    cleaned_entries = []
+    append = cleaned_entries.append
+    for i, entry in enumerate(entries, offset):
+        # Skip non-dict entries
+        if not isinstance(entry, dict):
+            print(f"[WARNING] Entry {i} is not a dictionary, skipping")
+            continue
+        append(map_entry(entry, archive))
+    return cleaned_entries
+
+
+_worker_archive = None  # PageArchiveReader of a clean worker process
+
+
+def _init_clean_worker(archive_dir: str) -> None:
+    """Process-pool initializer: open the page archive once per worker."""
+    global _worker_archive
+    _worker_archive = PageArchiveReader(archive_dir)
+
+
+def clean_batch_in_worker(batch: List, offset: int) -> tuple:
+    """
+    Clean one batch inside a clean worker process.
+
+    Args:
+        batch: Raw entries
+        offset: Index of the first entry in the whole input
+
+    Returns:
+        Tuple of (cleaned entries, archived pages loaded, field cache hits,
+        field cache misses), the counts covering this batch only
+    """
+    pages_before = _worker_archive.pages_loaded
+    before = _clean_field.cache_info()
+    cleaned = clean_batch(batch, _worker_archive, offset)
+    after = _clean_field.cache_info()
+    return (cleaned, _worker_archive.pages_loaded - pages_before,
+            after.hits - before.hits, after.misses - before.misses)
+
+
+def _batches(entries, size: int) -> Iterator[List]:
+    """Yield consecutive lists of up to ``size`` entries from any iterable."""
+    iterator = iter(entries)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _cleaned_batches(entries, archive_dir: str, workers: int, stats: Dict,
+                     cache: Optional[CleanCache] = None) -> Iterator[tuple]:
+    """
+    Clean entries batch by batch and yield results in input order.
+
+    With a cache, each batch is first split into entries already cleaned by
+    an earlier run and entries still to clean; only the latter are cleaned
+    (here or by a worker), then both are merged back in input order.
+
+    Args:
+        entries: Raw entries (any iterable)
+        archive_dir: Page archive holding the row markup of archived entries
+        workers: Worker processes (0 cleans in this process)
+        stats: Dictionary whose "pages_loaded", "cache_hits" and
+            "cache_misses" counts are updated as batches finish
+        cache: Incremental re-clean cache (None cleans every entry)
+
+    Yields:
+        Tuple of (raw entries in the batch, cleaned entries)
+    """
+    for key in ("pages_loaded", "cache_hits", "cache_misses"):
+        stats.setdefault(key, 0)
+    if workers <= 0:
+        archive = PageArchiveReader(archive_dir)
+        offset = 0
+        for batch in _batches(entries, CLEAN_BATCH_SIZE):
+            plan, todo = cache.split(batch, offset) if cache is not None else (None, batch)
+            before = _clean_field.cache_info()
+            cleaned = clean_batch(todo, archive, offset)
+            after = _clean_field.cache_info()
+            offset += len(batch)
+            stats["pages_loaded"] = archive.pages_loaded
+            stats["cache_hits"] += after.hits - before.hits
+            stats["cache_misses"] += after.misses - before.misses
+            yield len(batch), cleaned if plan is None else cache.merge(plan, cleaned)
+        return
+
+    print(f"[CONFIG] Cleaning in {workers} worker processes")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_clean_worker,
+                             initargs=(archive_dir,)) as pool:
+        pending = deque()  # (batch size, cache plan, future) in input order
+        offset = 0
+        for batch in _batches(entries, CLEAN_BATCH_SIZE):
+            plan, todo = cache.split(batch, offset) if cache is not None else (None, batch)
+            pending.append((len(batch), plan, pool.submit(clean_batch_in_worker, todo, offset)))
+            offset += len(batch)
+            # Keep a bounded window in flight; always hand back the oldest
+            while len(pending) >= workers * CLEAN_BATCHES_AHEAD:
+                yield _collect_worker_batch(pending.popleft(), stats, cache)
+        while pending:
+            yield _collect_worker_batch(pending.popleft(), stats, cache)
+
+
+def _collect_worker_batch(item: tuple, stats: Dict, cache: Optional[CleanCache]) -> tuple:
+    """Wait for one (size, plan, future) worker batch, merge it and fold in its counts."""
+    size, plan, future = item
+    cleaned, pages_loaded, cache_hits, cache_misses = future.result()
+    stats["pages_loaded"] += pages_loaded
+    stats["cache_hits"] += cache_hits
+    stats["cache_misses"] += cache_misses
+    return size, cleaned if plan is None else cache.merge(plan, cleaned)
+
+
+def _print_batch_stats(stats: Dict, cache: Optional[CleanCache]) -> None:
+    """Print the archive and cache counts gathered by _cleaned_batches."""
+    if cache is not None:
+        print(f"[INCREMENTAL] Reused {cache.reused} cleaned entries from {cache.path}; "
+              f"cleaned and cached {cache.stored} new or changed")
+    if stats["pages_loaded"]:
+        print(f"[ARCHIVE] Rehydrated row HTML from {stats['pages_loaded']} archived pages")
+    lookups = stats["cache_hits"] + stats["cache_misses"]
+    if lookups:
+        print(f"[CACHE] Field cache hit rate {stats['cache_hits'] / lookups:.1%} "
+              f"({stats['cache_hits']}/{lookups} lookups)")
+
+
+def clean_data(entries: Union[List[Dict], NDJSONEntries],
+               archive_dir: str = PAGE_ARCHIVE_DIR,
+               workers: int = CLEAN_WORKERS,
+               cache: Optional[CleanCache] = None) -> List[CanonicalRecord]:
     """
     Clean all entries and enforce canonical schema.
 
     Output Contract:
-    - Returns a list of dictionaries
-    - Every dictionary has exactly the same keys (CANONICAL_SCHEMA)
+    - Returns a list of CanonicalRecords (dict-like; to_dict() converts)
+    - Every record has exactly the same fields (CANONICAL_SCHEMA)
     - All values are plain text strings (no HTML, no entities)
     - Missing values are empty strings, never None or omitted
 
+    Parallel mode (workers > 0): the input is split into CLEAN_BATCH_SIZE
+    batches that a ProcessPoolExecutor cleans concurrently. Results are
+    collected in submission order, so the output is identical to the
+    serial path and progress is still reported every CLEAN_BATCH_SIZE
+    entries.
+
+    Incremental mode (cache given): entries whose content hash is already
+    in the cache reuse the stored record; only new or changed entries are
+    cleaned, and they are added to the cache.
+
     Args:
-        entries: List of raw entry dictionaries from scraper
+        entries: Raw entry dictionaries from scraper (list or NDJSONEntries)
+        archive_dir: Page archive holding the row markup of archived entries
+        workers: Worker processes for cleaning (0 cleans in this process)
+        cache: Incremental re-clean cache (None cleans every entry)
 
     Returns:
         List of cleaned entry dictionaries with canonical schema
     """
-    print(f"[CLEAN] Processing {len(entries)} entries...")
+    total = len(entries)
+    print(f"[CLEAN] Processing {total} entries...")
     print(f"[SCHEMA] Enforcing canonical fields: {CANONICAL_SCHEMA}")
 
     cleaned_entries = []
+    stats = {}
+    done = 0
 
-    for i, entry in enumerate(entries):
-        # Skip non-dict entries
-        if not isinstance(entry, dict):
-            print(f"[WARNING] Entry {i} is not a dictionary, skipping")
-            continue
-
-        # Map to canonical schema with cleaning
-        cleaned = _map_entry_to_schema(entry)
-
-        # Verify all keys are present (defensive check)
-        for key in CANONICAL_SCHEMA:
-            if key not in cleaned:
-                cleaned[key] = ""
-
-        cleaned_entries.append(cleaned)
+    # Clean in batches of CLEAN_BATCH_SIZE (NDJSONEntries is only iterable)
+    for size, cleaned in _cleaned_batches(entries, archive_dir, workers, stats, cache):
+        cleaned_entries.extend(cleaned)
+        done += size
 
         # Progress indicator
-        if (i + 1) % 5000 == 0:
-            print(f"[PROGRESS] Cleaned {i + 1}/{len(entries)} entries")
+        if done % CLEAN_BATCH_SIZE == 0:
+            print(f"[PROGRESS] Cleaned {done}/{total} entries")
 
     print(f"[COMPLETE] Cleaned {len(cleaned_entries)} entries")
+    _print_batch_stats(stats, cache)
     return cleaned_entries
 
 
-def save_data(entries: List[Dict], filename: str = OUTPUT_FILE) -> bool:
+def clean_file_streaming(input_file: str, output_file: str = NDJSON_OUTPUT_FILE,
+                         archive_dir: str = PAGE_ARCHIVE_DIR,
+                         workers: int = CLEAN_WORKERS,
+                         cache: Optional[CleanCache] = None) -> tuple:
+    """
+    Clean a raw file to NDJSON without holding either file in memory.
+
+    The input (a JSON array, or NDJSON for .jsonl/.ndjson) is parsed one
+    entry at a time, cleaned in CLEAN_BATCH_SIZE batches and written one
+    record per line, so peak memory is bounded by a batch (a few in-flight
+    batches with workers > 0) whatever the input size. Output goes to a
+    temporary file that replaces output_file only once complete.
+
+    Args:
+        input_file: Raw scraped data (JSON array or NDJSON)
+        output_file: NDJSON file to write the cleaned records to
+        archive_dir: Page archive holding the row markup of archived entries
+        workers: Worker processes for cleaning (0 cleans in this process)
+        cache: Incremental re-clean cache (None cleans every entry)
+
+    Returns:
+        Tuple of (entries read, records written); records written is -1 if
+        the input could not be parsed or the output written
+    """
+    print(f"[CLEAN] Streaming {input_file} -> {output_file}")
+    print(f"[SCHEMA] Enforcing canonical fields: {CANONICAL_SCHEMA}")
+
+    entries = iter_entries(input_file)
+    stats = {}
+    done = 0
+    written = 0
+    tmp_path = f"{output_file}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for size, cleaned in _cleaned_batches(entries, archive_dir, workers, stats,
+                                                  cache):
+                out.write("".join(json.dumps(record.to_dict(), ensure_ascii=False) + "\n"
+                                  for record in cleaned))
+                written += len(cleaned)
+                done += size
+
+                # Progress indicator (the total is unknown until the end)
+                if done % CLEAN_BATCH_SIZE == 0:
+                    print(f"[PROGRESS] Cleaned {done} entries")
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Failed to stream {input_file}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return done, -1
+    os.replace(tmp_path, output_file)
+
+    print(f"[COMPLETE] Cleaned {written} of {done} entries")
+    _print_batch_stats(stats, cache)
+    print(f"[SAVED] {written} entries written to {output_file}")
+    return done, written
+
+
+def save_data(entries: List[CanonicalRecord], filename: str = OUTPUT_FILE,
+              columnar: bool = False) -> bool:
     """
     Save cleaned entries to a JSON file.
 
-    Output is a JSON array with consistent formatting.
+    Output is a JSON array with consistent formatting; records become JSON
+    objects one at a time as they are written. With columnar=True
+    the entries are written by save_columnar instead (filename should then
+    end in .parquet or .gcol).
 
     Args:
-        entries: List of entry dictionaries to save
+        entries: Cleaned records (or dictionaries) to save
         filename: Output filename
+        columnar: Write a columnar file instead of a JSON array
 
     Returns:
         True if save successful, False otherwise
     """
+    if columnar:
+        return save_columnar(entries, filename)
     try:
         with open(filename, "w", encoding="utf-8") as f:
-            json.dump(entries, f, indent=2, ensure_ascii=False)
+            json.dump(entries, f, indent=2, ensure_ascii=False, default=_record_to_json)
 
         print(f"[SAVED] {len(entries)} entries written to {filename}")
         return True
@@ -390,17 +1265,239 @@ def save_data(entries: List[Dict], filename: str = OUTPUT_FILE) -> bool:
         return False
 
 
-def _validate_output(filename: str) -> bool:
+# =============================================================================
+# COLUMNAR OUTPUT
+# =============================================================================
+
+def columnar_output_file() -> str:
+    """Return the default columnar file: Parquet if pyarrow is installed, else GCOL."""
+    return PARQUET_OUTPUT_FILE if parquet_available() else GCOL_OUTPUT_FILE
+
+
+def save_columnar(entries: List[CanonicalRecord], filename: Optional[str] = None) -> bool:
+    """
+    Save cleaned entries column by column.
+
+    Args:
+        entries: Cleaned records (or dictionaries with CANONICAL_SCHEMA keys)
+        filename: .parquet or .gcol file (default: columnar_output_file())
+
+    Returns:
+        True if save successful, False otherwise
+    """
+    filename = filename or columnar_output_file()
+    columns = {name: [entry[name] for entry in entries] for name in CANONICAL_SCHEMA}
+    tmp_path = f"{filename}.tmp"
+    try:
+        if filename.endswith(".parquet"):
+            if not parquet_available():
+                print(f"[ERROR] Writing {filename} requires pyarrow; use a .gcol file")
+                return False
+            write_parquet(columns, tmp_path)
+        else:
+            write_gcol(columns, len(entries), tmp_path)
+        os.replace(tmp_path, filename)
+    except OSError as e:
+        print(f"[ERROR] Failed to save data: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    print(f"[SAVED] {len(entries)} entries written to {filename} (columnar)")
+    return True
+
+
+# =============================================================================
+# OUTPUT VALIDATION
+# One streaming pass over the output; NDJSON can be split across processes.
+# =============================================================================
+
+class ValidationReport:
+    """
+    Issue counts per validation rule, plus the first few issue messages.
+
+    Reports from separate shards are combined with merge(), in file order,
+    so example line numbers stay global.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.lines = 0  # NDJSON lines consumed, including blank/invalid ones
+        self.counts = dict.fromkeys(VALIDATION_RULES, 0)
+        self.examples: List[str] = []
+
+    def add(self, rule: str, where: str, detail: str) -> None:
+        """Count one issue and keep its message if fewer than VALIDATE_EXAMPLES are kept."""
+        self.counts[rule] += 1
+        if len(self.examples) < VALIDATE_EXAMPLES:
+            self.examples.append(f"{where}: {detail}")
+
+    def merge(self, other: "ValidationReport") -> None:
+        """Fold in the report of the shard that follows this one."""
+        self.records += other.records
+        for rule, count in other.counts.items():
+            self.counts[rule] += count
+        room = VALIDATE_EXAMPLES - len(self.examples)
+        if room > 0:
+            self.examples.extend(_shift_line_numbers(example, self.lines)
+                                 for example in other.examples[:room])
+        self.lines += other.lines
+
+    @property
+    def issues(self) -> int:
+        """Total number of issues over all rules."""
+        return sum(self.counts.values())
+
+
+def _shift_line_numbers(example: str, lines_before: int) -> str:
+    """Rebase a shard-local "line N" example onto the whole file."""
+    if not example.startswith("line "):
+        return example
+    number, rest = example[5:].split(":", 1)
+    return f"line {int(number) + lines_before}:{rest}"
+
+
+def _check_record(entry, where: str, report: ValidationReport) -> None:
+    """Apply every record-level rule to one decoded output record."""
+    report.records += 1
+    if entry.__class__ is not dict:
+        report.add("not_dict", where, f"record is a {type(entry).__name__}, not an object")
+        return
+    keys = entry.keys()
+    if keys != _SCHEMA_KEYS:
+        missing = _SCHEMA_KEYS - keys
+        extra = keys - _SCHEMA_KEYS
+        if missing:
+            report.add("missing_keys", where, f"missing keys {sorted(missing)}")
+        if extra:
+            report.add("extra_keys", where, f"extra keys {sorted(extra)}")
+    for key, value in entry.items():
+        if value.__class__ is not str:
+            report.add("not_string", where, f"field '{key}' is a {type(value).__name__}")
+        elif "<" in value and _HTML_TAG_RE.search(value):
+            report.add("html_residue", where, f"field '{key}' contains HTML tags")
+
+
+def _ndjson_shards(filename: str, shards: int) -> List[tuple]:
+    """Split a file into ``shards`` contiguous (start, end) byte ranges."""
+    size = os.path.getsize(filename)
+    step = max(size // max(shards, 1), 1)
+    bounds = list(range(0, size, step))[:shards] + [size]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def validate_ndjson_shard(filename: str, start: int = 0,
+                          end: Optional[int] = None) -> ValidationReport:
+    """
+    Validate the NDJSON lines that begin inside bytes [start, end).
+
+    A line straddling ``start`` belongs to the previous shard, so adjacent
+    ranges together cover every line exactly once. Lines are decoded
+    VALIDATE_DECODE_LINES at a time as one JSON array; only a batch that
+    fails to decode is re-read line by line to count its invalid lines.
+
+    Args:
+        filename: NDJSON file to validate
+        start: First byte of the range
+        end: End of the range (None for end of file)
+
+    Returns:
+        ValidationReport whose example line numbers are relative to start
+    """
+    report = ValidationReport()
+    with open(filename, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            position = start - 1 + len(f.readline())  # Skip to the first line start
+        else:
+            position = 0
+        batch = []  # (line number, line) pairs
+        for line in f:
+            if end is not None and position >= end:
+                break
+            position += len(line)
+            report.lines += 1
+            if line.strip():
+                batch.append((report.lines, line))
+            if len(batch) >= VALIDATE_DECODE_LINES:
+                _check_ndjson_batch(batch, report)
+                batch = []
+        _check_ndjson_batch(batch, report)
+    return report
+
+
+def _check_ndjson_batch(batch: List[tuple], report: ValidationReport) -> None:
+    """Decode a batch of (line number, line) pairs and check every record."""
+    if not batch:
+        return
+    try:
+        records = json.loads(b"[" + b",".join(line for _, line in batch) + b"]")
+    except ValueError:
+        records = None
+    if records is not None and len(records) == len(batch):
+        for (number, _), entry in zip(batch, records):
+            _check_record(entry, f"line {number}", report)
+        return
+    # Slow path: some line is not one JSON value on its own
+    for number, line in batch:
+        try:
+            entry = json.loads(line)
+        except ValueError as e:
+            report.add("invalid_json", f"line {number}", f"invalid JSON ({e})")
+            continue
+        _check_record(entry, f"line {number}", report)
+
+
+def validate_file(filename: str, workers: int = CLEAN_WORKERS) -> ValidationReport:
+    """
+    Validate a cleaned output file in one streaming pass.
+
+    NDJSON (.jsonl/.ndjson) is split into ``workers`` byte-range shards
+    checked by a process pool; a JSON array is decoded incrementally by
+    JSONArrayEntries in this process. Neither is loaded whole. Columnar
+    files are decoded into records first.
+
+    Args:
+        filename: Output file to validate
+        workers: Worker processes for NDJSON shards (0 validates in this process)
+
+    Returns:
+        ValidationReport with issue counts per rule
+
+    Raises:
+        OSError: The file cannot be read
+        ValueError: A JSON array file is not a well-formed array
+    """
+    if not filename.endswith(NDJSON_EXTENSIONS):
+        report = ValidationReport()
+        for i, entry in enumerate(iter_entries(filename)):
+            _check_record(entry, f"entry {i}", report)
+        return report
+
+    if workers <= 0:
+        return validate_ndjson_shard(filename)
+    shards = _ndjson_shards(filename, workers)
+    report = ValidationReport()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(validate_ndjson_shard, filename, start, end)
+                   for start, end in shards]
+        for future in futures:
+            report.merge(future.result())
+    return report
+
+
+def _validate_output(filename: str, workers: int = CLEAN_WORKERS) -> bool:
     """
     Validate that output file meets the canonical format requirements.
 
-    Checks:
-    1. Output is a JSON array
+    Checks (each counted separately, over the whole file):
+    1. Output is a JSON array (or NDJSON for .jsonl/.ndjson)
     2. All records share identical keys (exactly CANONICAL_SCHEMA)
-    3. No HTML tags remain in any value
+    3. Every value is a string with no HTML tags left in it
 
     Args:
         filename: Path to the output file to verify
+        workers: Worker processes for NDJSON shards (0 validates in this process)
 
     Returns:
         True if validation passes, False otherwise
@@ -408,108 +1505,123 @@ def _validate_output(filename: str) -> bool:
     print(f"\n[VALIDATE] Checking output file: {filename}")
 
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
+        report = validate_file(filename, workers)
+    except (OSError, ValueError, KeyError) as e:
         print(f"[VALIDATE] FAIL: Cannot read output file: {e}")
         return False
 
-    # Check 1: Output is a JSON array
-    if not isinstance(data, list):
-        print(f"[VALIDATE] FAIL: Output is not a JSON array (got {type(data).__name__})")
-        return False
-
-    if len(data) == 0:
-        print(f"[VALIDATE] WARNING: Output is empty")
+    if report.records == 0 and report.issues == 0:
+        print("[VALIDATE] WARNING: Output is empty")
         return True
 
-    # Check 2: All records have identical keys matching CANONICAL_SCHEMA
-    expected_keys = set(CANONICAL_SCHEMA)
-    issues = 0
-
-    for i, entry in enumerate(data):
-        if not isinstance(entry, dict):
-            print(f"[VALIDATE] FAIL: Entry {i} is not a dictionary")
-            issues += 1
-            continue
-
-        entry_keys = set(entry.keys())
-        missing_keys = expected_keys - entry_keys
-        extra_keys = entry_keys - expected_keys
-
-        if missing_keys:
-            print(f"[VALIDATE] FAIL: Entry {i} missing keys: {missing_keys}")
-            issues += 1
-
-        if extra_keys:
-            print(f"[VALIDATE] FAIL: Entry {i} has extra keys: {extra_keys}")
-            issues += 1
-
-        # Check 3: No HTML tags in any value
-        html_pattern = re.compile(r"<[^>]+>")
-        for key, value in entry.items():
-            if not isinstance(value, str):
-                print(f"[VALIDATE] FAIL: Entry {i}, field '{key}' is not a string")
-                issues += 1
-            elif html_pattern.search(value):
-                print(f"[VALIDATE] FAIL: Entry {i}, field '{key}' contains HTML tags")
-                issues += 1
-
-        # Stop after 10 issues to avoid spam
-        if issues >= 10:
-            print(f"[VALIDATE] Stopping after 10 issues...")
-            break
-
-    if issues > 0:
-        print(f"[VALIDATE] FAIL: Found {issues} validation issues")
+    if report.issues > 0:
+        for example in report.examples:
+            print(f"[VALIDATE] FAIL: {example}")
+        for rule, count in report.counts.items():
+            if count:
+                print(f"[VALIDATE]   {rule}: {count}")
+        print(f"[VALIDATE] FAIL: Found {report.issues} validation issues "
+              f"in {report.records} records")
         return False
 
-    print(f"[VALIDATE] PASS: Output is canonical JSON with {len(data)} valid entries")
+    print(f"[VALIDATE] PASS: Output is canonical JSON with {report.records} valid entries")
     return True
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the cleaning module."""
+    parser = argparse.ArgumentParser(description="GradCafe data cleaning")
+    parser.add_argument("--workers", type=int, default=CLEAN_WORKERS,
+                        help=f"worker processes for cleaning (default {CLEAN_WORKERS}: "
+                             f"clean in the main process; try {os.cpu_count()})")
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument("--stream", action="store_true",
+                               help=f"clean entry by entry in constant memory and write "
+                                    f"NDJSON to {NDJSON_OUTPUT_FILE}")
+    output_format.add_argument("--columnar", action="store_true",
+                               help=f"write {PARQUET_OUTPUT_FILE} (needs pyarrow) or "
+                                    f"{GCOL_OUTPUT_FILE} instead of {OUTPUT_FILE}")
+    parser.add_argument("--no-clean-cache", action="store_true",
+                        help=f"clean every entry without reading or updating {CLEAN_CACHE_FILE}")
+    parser.add_argument("--invalidate-cache", action="store_true",
+                        help=f"empty {CLEAN_CACHE_FILE} first (it also empties itself "
+                             f"when the cleaning rules change)")
+    args = parser.parse_args(argv)
+    if args.stream:
+        output_file = NDJSON_OUTPUT_FILE
+    elif args.columnar:
+        output_file = columnar_output_file()
+    else:
+        output_file = OUTPUT_FILE
+
     print("=" * 60)
     print("GradCafe Data Cleaning Module")
     print("Module 2 - Johns Hopkins EN.605.256.82.SP26")
     print("=" * 60)
-    print(f"[CONFIG] Input:  {INPUT_FILE} (raw scraped data)")
-    print(f"[CONFIG] Output: {OUTPUT_FILE} (clean canonical data)")
+    input_file = INPUT_FILE
+    if not os.path.exists(input_file) and os.path.exists(NDJSON_INPUT_FILE):
+        input_file = NDJSON_INPUT_FILE
+    print(f"[CONFIG] Input:  {input_file} (raw scraped data)")
+    print(f"[CONFIG] Output: {output_file} (clean canonical data)")
     print("=" * 60)
 
-    # Load raw scraped data
-    raw_data = load_data()
+    # Only entries that are new or changed since the last run are cleaned
+    cache = None if args.no_clean_cache else CleanCache(invalidate=args.invalidate_cache)
+    try:
+        _clean_and_save(args, input_file, output_file, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _clean_and_save(args: argparse.Namespace, input_file: str, output_file: str,
+                    cache: Optional[CleanCache]) -> None:
+    """Run the cleaning stages of main() and print the summary."""
+    if args.stream:
+        # Parse, clean and write one batch at a time
+        input_count, output_count = clean_file_streaming(input_file, output_file,
+                                                         workers=args.workers, cache=cache)
+        if output_count < 0:
+            print("[ABORT] Failed to stream cleaned data")
+            return
+        if output_count == 0:
+            print("[ABORT] No entries survived cleaning")
+            return
+        success = True
+    else:
+        # Load raw scraped data
+        raw_data = load_data(input_file)
 
-    if not raw_data:
-        print("[ABORT] No data to clean")
-        return
+        if not raw_data:
+            print("[ABORT] No data to clean")
+            return
 
-    # Clean the data with strict schema enforcement
-    cleaned_data = clean_data(raw_data)
+        # Clean the data with strict schema enforcement
+        cleaned_data = clean_data(raw_data, workers=args.workers, cache=cache)
 
-    if not cleaned_data:
-        print("[ABORT] No entries survived cleaning")
-        return
+        if not cleaned_data:
+            print("[ABORT] No entries survived cleaning")
+            return
 
-    # Save cleaned data
-    success = save_data(cleaned_data)
+        # Save cleaned data
+        success = save_data(cleaned_data, output_file, columnar=args.columnar)
 
-    if not success:
-        print("[ABORT] Failed to save cleaned data")
-        return
+        if not success:
+            print("[ABORT] Failed to save cleaned data")
+            return
+        input_count, output_count = len(raw_data), len(cleaned_data)
 
     # Validate output
-    valid = _validate_output(OUTPUT_FILE)
+    valid = _validate_output(output_file, workers=args.workers)
 
     # Print summary
     print("\n" + "=" * 60)
     print("CLEANING SUMMARY")
     print("=" * 60)
-    print(f"Input file:     {INPUT_FILE}")
-    print(f"Input entries:  {len(raw_data)}")
-    print(f"Output file:    {OUTPUT_FILE}")
-    print(f"Output entries: {len(cleaned_data)}")
+    print(f"Input file:     {input_file}")
+    print(f"Input entries:  {input_count}")
+    print(f"Output file:    {output_file}")
+    print(f"Output entries: {output_count}")
     print(f"Schema fields:  {CANONICAL_SCHEMA}")
     print(f"Validation:     {'PASSED' if valid else 'FAILED'}")
     print("=" * 60)
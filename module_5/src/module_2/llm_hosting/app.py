@@ -14,6 +14,9 @@ from flask import Flask, jsonify, request
 from huggingface_hub import hf_hub_download
 from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
 
+# Columnar input from clean.py --columnar (src/columnar.py, module_5 package)
+from src.columnar import COLUMNAR_EXTENSIONS, read_columnar
+
 app = Flask(__name__)
 
 # ---------------- Model config ----------------
@@ -36,6 +39,10 @@ CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
 
+# Columns read from columnar input: "program" for the LLM, plus the columns
+# the loader (src/load_data.py LOADER_COLUMNS) reads from this step's output
+COLUMNAR_INPUT_COLUMNS = ("program", "notes", "decision", "gpa", "decision_date")
+
 # ---------------- Canonical lists + abbrev maps ----------------
 def _read_lines(path: str) -> List[str]:
     """Read non-empty, stripped lines from a file (UTF-8)."""
@@ -283,15 +290,24 @@ def standardize() -> Any:
     return jsonify({"rows": out})
 
 
+def _read_rows(in_path: str) -> List[Dict[str, Any]]:
+    """Read input rows from JSON or a columnar (.parquet/.gcol) file."""
+    if not in_path.endswith(COLUMNAR_EXTENSIONS):
+        with open(in_path, "r", encoding="utf-8") as f:
+            return _normalize_input(json.load(f))
+    columns = read_columnar(in_path, COLUMNAR_INPUT_COLUMNS)
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
 def _cli_process_file(
     in_path: str,
     out_path: str | None,
     append: bool,
     to_stdout: bool,
 ) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
+    """Process a JSON or columnar file and write JSONL incrementally."""
+    rows = _read_rows(in_path)
 
     sink = sys.stdout if to_stdout else None
     if not to_stdout:
@@ -324,7 +340,8 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--file",
-        help="Path to JSON input (list of rows or {'rows': [...]})",
+        help="Path to JSON input (list of rows or {'rows': [...]}), "
+        "or a .parquet/.gcol file from clean.py --columnar",
         default=None,
     )
     parser.add_argument(
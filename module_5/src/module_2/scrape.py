@@ -8,13 +8,28 @@ respecting robots.txt and implementing proper rate limiting and retry logic.
 Module 2 Assignment - Johns Hopkins EN.605.256.82.SP26
 """
 
+import argparse
+import bisect
+import contextlib
+import email.utils
+import gzip
+import hashlib
+import http.client
 import json
+import math
+import os
 import re
+import sys
+import threading
 import time
-import random
-from urllib import request, parse, error, robotparser
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime
+from urllib import parse, error, robotparser
+import soupsieve as sv
 from bs4 import BeautifulSoup
-from typing import Optional
+from typing import Optional, Union
 
 
 # =============================================================================
@@ -26,6 +41,10 @@ RESULTS_URL = f"{BASE_URL}/survey"
 ROBOTS_URL = f"{BASE_URL}/robots.txt"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 OUTPUT_FILE = "raw_applicant_data.json"
+NDJSON_OUTPUT_FILE = "raw_applicant_data.jsonl"  # Streaming output (--ndjson)
+NDJSON_EXTENSIONS = (".jsonl", ".ndjson")
+CHECKPOINT_FILE = "scrape_checkpoint.jsonl"  # Journal of completed pages
+PAGE_ARCHIVE_DIR = "page_archive"  # Compressed row markup, one blob per page
 
 # Rate limiting configuration
 MIN_DELAY = 1.0  # Minimum seconds between requests
@@ -33,6 +52,145 @@ MAX_DELAY = 3.0  # Maximum seconds between requests
 MAX_RETRIES = 5  # Maximum retry attempts for failed requests
 RETRY_BACKOFF = 2  # Exponential backoff multiplier
 
+# Concurrency configuration
+# Pages are fetched by a small thread pool; a token bucket shared by all
+# workers enforces the per-host request rate. The default rate matches the
+# old average random delay of (MIN_DELAY + MAX_DELAY) / 2 seconds per page.
+MAX_IN_FLIGHT = 4  # Maximum pages being fetched at the same time
+# Parsing is CPU-bound and holds the GIL, so with PARSE_WORKERS > 0 fetched
+# pages are parsed by that many worker processes instead of the main thread.
+PARSE_WORKERS = 0  # 0 parses in the main process
+REQUESTS_PER_SECOND = 2.0 / (MIN_DELAY + MAX_DELAY)  # Sustained per-host rate
+RATE_LIMIT_BURST = 1  # Tokens a host bucket may accumulate while idle
+# When RATE_SHARE crawlers (e.g. worker replicas scraping page ranges) hit the
+# same host at once, each one gets 1/RATE_SHARE of every rate above, so the
+# aggregate stays within the budget of a single crawler.
+RATE_SHARE = 1
+
+# Adaptive rate control (AIMD)
+# Starting from REQUESTS_PER_SECOND, each fast 2xx response raises a host's
+# rate by ADAPTIVE_INCREASE; HTTP 429/5xx or a response slower than
+# LATENCY_SLOWDOWN_FACTOR times the running average multiplies it by
+# ADAPTIVE_DECREASE (at most once per ADAPTIVE_COOLDOWN seconds). A
+# Retry-After header pauses the host, and robots.txt Crawl-delay caps the rate.
+ADAPTIVE_RATE = True  # False keeps the fixed REQUESTS_PER_SECOND
+ADAPTIVE_MIN_RATE = 0.1  # Requests/second floor
+ADAPTIVE_MAX_RATE = 4.0  # Requests/second ceiling
+ADAPTIVE_INCREASE = 0.05  # Requests/second added per fast success
+ADAPTIVE_DECREASE = 0.5  # Rate multiplier on congestion
+ADAPTIVE_COOLDOWN = 2.0  # Seconds between multiplicative decreases
+LATENCY_EWMA_ALPHA = 0.2  # Weight of the newest latency sample
+LATENCY_SLOWDOWN_FACTOR = 2.0  # Sample/average ratio treated as congestion
+LATENCY_FLOOR = 0.25  # Seconds; faster responses never count as slow
+MAX_RETRY_AFTER = 600  # Seconds; longer Retry-After values are clamped
+
+# Metrics configuration
+# Counters and histograms are collected for every crawl; sinks added with
+# get_metrics().add_sink() receive a snapshot every METRICS_EMIT_SECONDS and
+# a final run summary, which is also written to METRICS_SUMMARY_FILE.
+METRICS_EMIT_SECONDS = 5.0
+METRICS_SUMMARY_FILE = "scrape_run_summary.json"
+METRICS_PROM_FILE = "scrape_metrics.prom"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ENTRIES_BUCKETS = (0, 1, 5, 10, 15, 20, 25, 30, 50, 100)
+
+# Replay configuration
+# Saved pages are named page_00001.html, page_00002.html, ... (--save-pages
+# writes them, --replay reads them back without touching the network).
+REPLAY_PAGE_PATTERN = "page_{:05d}.html"
+
+# HTML parser backends. Python's html.parser is always used unless
+# SCRAPE_HTML_PARSER (or --parser) names another one that is installed;
+# lxml is faster but may build a different tree from malformed markup.
+HTML_PARSERS = ("html.parser", "lxml")
+DEFAULT_HTML_PARSER = "html.parser"
+
+# Selectors for entry rows, tried in order until one matches.
+# The site structure may vary, so we try multiple approaches
+ROW_SELECTORS = [
+    "table.results tbody tr",
+    "table tbody tr",
+    ".result-row",
+    ".survey-result",
+    "[class*='result']",
+    ".card",
+    "article",
+]
+ROW_FALLBACK_CLASS = re.compile(r"(result|entry|row|item)", re.I)
+
+# Per-field selectors within a row (output key -> CSS alternatives)
+FIELD_SELECTORS = {
+    "institution": ".institution, .school, [class*='school'], [class*='institution']",
+    "program": ".program, .major, [class*='program'], [class*='major']",
+    "decision": ".decision, .status, [class*='decision'], [class*='status']",
+    "date_added": ".date, [class*='date'], time",
+    "details": ".details, .extra, [class*='detail']",
+    "comments": ".comments, .notes, [class*='comment'], [class*='note']",
+}
+
+# Link from a row to the post's own result page; its URL identifies the post
+POST_LINK_SELECTOR = "a[href*='/result/']"
+
+# Date formats seen in the survey "date added" column, most common first
+ENTRY_DATE_FORMATS = ("%B %d, %Y", "%b %d, %Y", "%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d")
+
+# Checkpoint configuration
+# Every processed page is appended to the journal immediately, but fsync is
+# only issued every CHECKPOINT_FSYNC_PAGES pages or CHECKPOINT_FSYNC_SECONDS,
+# whichever comes first, so durability does not dominate crawl time.
+CHECKPOINT_FSYNC_PAGES = 25
+CHECKPOINT_FSYNC_SECONDS = 10.0
+
+# Page archive configuration
+# Instead of repeating each row's markup as raw_html, a page's rows are
+# written once as a gzip blob named by the SHA-256 of its content. Entries
+# keep page_hash/row_offset/row_length, which the cleaner uses to slice the
+# row back out only when it needs it.
+PAGE_ARCHIVE_COMPRESSLEVEL = 6
+ARCHIVE_ROW_SEPARATOR = "\n"
+
+# Entry deduplication
+# New posts shift pagination during a crawl, so an entry already seen can
+# reappear on the next page. Each entry is fingerprinted from its result_url
+# (the post's own page), or from its normalized text fields when the row
+# links to none; the last DEDUP_RECENT_ENTRIES fingerprints are kept exactly and
+# every fingerprint goes into a Bloom filter sized for DEDUP_BLOOM_CAPACITY
+# entries at DEDUP_BLOOM_ERROR_RATE false positives (about 3.6 MB here).
+DEDUP_RECENT_ENTRIES = 5000
+DEDUP_BLOOM_CAPACITY = 1_000_000
+DEDUP_BLOOM_ERROR_RATE = 1e-6
+DEDUP_STATE_MAGIC = b"GCBLOOM1\n"
+
+# Pagination sanity checks
+# Each page is fingerprinted from its entries, and its structure is the row
+# selector that matched (optional fields such as GPA or GRE do not count).
+# A page identical to an earlier one (the site serving the same page for
+# every ?page=N) contributes no entries. A page structured unlike the first
+# page (a layout change, or a soft-block page caught by a fallback selector)
+# is journaled and counted as drifted but keeps its entries. The crawl stops
+# after PAGE_REPEAT_LIMIT repeated or PAGE_DRIFT_LIMIT drifted pages in a row.
+PAGE_REPEAT_LIMIT = 3
+PAGE_DRIFT_LIMIT = 3
+
+# HTTP transport configuration
+REQUEST_TIMEOUT = 30  # Seconds before a single request attempt is abandoned
+MAX_REDIRECTS = 5  # Redirect hops followed before giving up
+REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+# HTTP cache configuration
+# Page bodies are kept on disk with their ETag/Last-Modified validators and
+# revalidated with conditional GETs; a 304 is served from the cache. The
+# least recently used entries are evicted beyond HTTP_CACHE_MAX_BYTES.
+HTTP_CACHE_DIR = "http_cache"
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 # =============================================================================
 # SCRAPE TARGET - SINGLE SOURCE OF TRUTH
 # =============================================================================
@@ -44,6 +202,775 @@ RETRY_BACKOFF = 2  # Exponential backoff multiplier
 TARGET_ENTRIES = 45000
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each call to acquire() consumes one token, blocking until one is free.
+    """
+
+    def __init__(self, rate: float, capacity: float = RATE_LIMIT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) / self.rate
+            time.sleep(wait_time)
+
+    def on_success(self, latency: float) -> None:
+        """Feedback hook for a 2xx response (fixed-rate buckets ignore it)."""
+
+    def on_throttle(self, status: Optional[int] = None,
+                    retry_after: Optional[float] = None) -> None:
+        """Feedback hook for a 429/5xx or failed request (ignored here)."""
+
+    def set_crawl_delay(self, delay: float) -> None:
+        """Never exceed one request per ``delay`` seconds."""
+        if delay > 0:
+            with self._lock:
+                self.rate = min(self.rate, 1.0 / delay)
+
+    def rescale(self, factor: float) -> None:
+        """Multiply the rate by ``factor`` (this crawler's budget share changed)."""
+        with self._lock:
+            self.rate *= factor
+
+
+class AdaptiveRateController(TokenBucket):
+    """
+    Token bucket whose rate adapts to the server (AIMD).
+
+    The rate grows additively while responses are 2xx and fast, and shrinks
+    multiplicatively on HTTP 429/5xx, connection failures or a latency
+    spike. Retry-After pauses every request to the host until it expires,
+    and a robots.txt Crawl-delay lowers the ceiling.
+    """
+
+    def __init__(self, rate: float, capacity: float = RATE_LIMIT_BURST,
+                 min_rate: Optional[float] = None, max_rate: Optional[float] = None):
+        min_rate = ADAPTIVE_MIN_RATE if min_rate is None else min_rate
+        max_rate = ADAPTIVE_MAX_RATE if max_rate is None else max_rate
+        super().__init__(min(max(rate, min_rate), max_rate), capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.latency_avg = None  # EWMA of response latency in seconds
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+
+    def acquire(self) -> None:
+        """Wait out any Retry-After pause, then take a token."""
+        while True:
+            with self._lock:
+                wait_time = self._paused_until - time.monotonic()
+            if wait_time <= 0:
+                break
+            time.sleep(wait_time)
+        super().acquire()
+
+    def _set_rate(self, rate: float) -> None:
+        """Change the refill rate; caller holds the lock."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+
+    def _decrease(self, reason: str) -> None:
+        """Multiplicative decrease, at most once per ADAPTIVE_COOLDOWN; caller holds the lock."""
+        now = time.monotonic()
+        if now - self._last_decrease < ADAPTIVE_COOLDOWN:
+            return
+        self._last_decrease = now
+        old_rate = self.rate
+        self._set_rate(self.rate * ADAPTIVE_DECREASE)
+        print(f"[RATE] {reason}: {old_rate:.2f} -> {self.rate:.2f} req/s")
+
+    def on_success(self, latency: float) -> None:
+        """Additive increase on a fast 2xx; decrease on a latency spike."""
+        with self._lock:
+            average = self.latency_avg
+            if average is None:
+                self.latency_avg = latency
+            else:
+                self.latency_avg = (LATENCY_EWMA_ALPHA * latency
+                                    + (1 - LATENCY_EWMA_ALPHA) * average)
+            if average is not None and latency > LATENCY_FLOOR \
+                    and latency > LATENCY_SLOWDOWN_FACTOR * average:
+                self._decrease(f"latency {latency:.2f}s vs. {average:.2f}s average")
+            else:
+                self._set_rate(self.rate + ADAPTIVE_INCREASE)
+
+    def on_throttle(self, status: Optional[int] = None,
+                    retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease, plus a host-wide pause for Retry-After."""
+        with self._lock:
+            self._decrease(f"HTTP {status}" if status else "request failed")
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                print(f"[RATE] Retry-After: pausing host for {retry_after:.0f}s")
+
+    def set_crawl_delay(self, delay: float) -> None:
+        """
+        Cap the rate at one request per ``delay`` seconds (robots.txt).
+
+        The floor is lowered first so the cap always wins: a Crawl-delay
+        slower than ADAPTIVE_MIN_RATE must not be rounded up to it.
+        """
+        if delay > 0:
+            limit = 1.0 / delay
+            with self._lock:
+                self.min_rate = min(self.min_rate, limit)
+                self.max_rate = min(self.max_rate, limit)
+                self._set_rate(min(self.rate, limit))
+
+    def rescale(self, factor: float) -> None:
+        """Multiply the rate, floor and ceiling by ``factor`` (share changed)."""
+        with self._lock:
+            self.min_rate *= factor
+            self.max_rate *= factor
+            self._set_rate(self.rate * factor)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta seconds or HTTP date).
+
+    Args:
+        value: Header value, or None when absent
+
+    Returns:
+        Seconds to wait (clamped to MAX_RETRY_AFTER), or None if unusable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            return None
+        seconds = (retry_at - datetime.now(retry_at.tzinfo)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+
+def get_host_limiter(url: str) -> TokenBucket:
+    """
+    Return the shared rate limiter for the host serving the given URL.
+
+    Args:
+        url: Any URL on the host to be rate limited
+
+    Returns:
+        AdaptiveRateController (or a fixed-rate TokenBucket when
+        ADAPTIVE_RATE is off) shared by every request to that host
+    """
+    host = parse.urlsplit(url).netloc
+    with _host_limiters_lock:
+        if host not in _host_limiters:
+            if ADAPTIVE_RATE:
+                _host_limiters[host] = AdaptiveRateController(
+                    REQUESTS_PER_SECOND / RATE_SHARE,
+                    min_rate=ADAPTIVE_MIN_RATE / RATE_SHARE,
+                    max_rate=ADAPTIVE_MAX_RATE / RATE_SHARE)
+            else:
+                _host_limiters[host] = TokenBucket(REQUESTS_PER_SECOND / RATE_SHARE)
+        return _host_limiters[host]
+
+
+def share_rate_budget(crawlers: int) -> None:
+    """
+    Split every host's rate budget between concurrently running crawlers.
+
+    Each crawler (process) keeps its own limiters, so when several crawl the
+    same host at once each must take only its share for the aggregate to stay
+    polite. It may be called again mid-crawl as other crawlers start or
+    finish: existing limiters are rescaled in place, so they keep their
+    adaptive state and any robots.txt Crawl-delay.
+
+    Args:
+        crawlers: Number of crawlers sharing the budget (1 = the whole budget)
+    """
+    global RATE_SHARE
+
+    crawlers = max(1, int(crawlers))
+    with _host_limiters_lock:
+        if crawlers == RATE_SHARE:
+            return
+        factor = RATE_SHARE / crawlers
+        RATE_SHARE = crawlers
+        for limiter in _host_limiters.values():
+            limiter.rescale(factor)
+    print(f"[RATE] Rate budget shared by {crawlers} crawler(s)")
+
+
+class HTTPCache:
+    """
+    Size-bounded on-disk cache of response bodies for conditional GETs.
+
+    Each URL is stored as <directory>/<sha256(url)>.cache: a gzip file whose
+    first line is a JSON header (url, etag, last_modified) followed by the
+    decoded body. Validators are indexed in memory at startup so a request
+    only reads a body back from disk after the server answers 304. Files
+    are replaced atomically, and the LRU order is kept in file mtimes so it
+    survives restarts.
+    """
+
+    def __init__(self, directory: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._index = {}  # sha256(url) -> (size, etag, last_modified), LRU order
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def _load_index(self) -> None:
+        """Read every entry's header, oldest access first."""
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".cache"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with gzip.open(path, "rb") as f:
+                    header = json.loads(f.readline())
+                stat = os.stat(path)
+            except (OSError, EOFError, ValueError):
+                os.remove(path)  # Torn or corrupt entry
+                continue
+            found.append((stat.st_mtime, name[:-len(".cache")], stat.st_size, header))
+        for _, key, size, header in sorted(found):
+            self._index[key] = (size, header.get("etag"), header.get("last_modified"))
+            self.total_bytes += size
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def conditional_headers(self, url: str) -> dict:
+        """Return If-None-Match/If-Modified-Since headers for a cached URL."""
+        with self._lock:
+            cached = self._index.get(self._key(url))
+        if cached is None:
+            return {}
+        _, etag, last_modified = cached
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def load(self, url: str) -> Optional[bytes]:
+        """
+        Return the cached body for a URL and mark it recently used.
+
+        Returns:
+            Body bytes, or None if the entry is missing or unreadable
+        """
+        key = self._key(url)
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                f.readline()
+                body = f.read()
+            os.utime(path)
+        except (OSError, EOFError):
+            self._forget(key)
+            return None
+        with self._lock:
+            if key in self._index:
+                self._index[key] = self._index.pop(key)
+        return body
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+              body: bytes) -> None:
+        """Cache a response body with its validators, evicting LRU entries."""
+        if not etag and not last_modified:
+            return  # Nothing to revalidate with
+        key = self._key(url)
+        path = self._path(key)
+        header = {"url": url, "etag": etag, "last_modified": last_modified}
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, "wb", compresslevel=1) as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(body)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        evicted = []
+        with self._lock:
+            old = self._index.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[0]
+            self._index[key] = (size, etag, last_modified)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key = next(iter(self._index))
+                self.total_bytes -= self._index.pop(old_key)[0]
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            old = self._index.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[0]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class HTTPSession:
+    """
+    Minimal keep-alive HTTP client with a per-host connection pool.
+
+    Connections are checked out for a single request and returned to the
+    pool afterwards, so concurrent fetch workers and retries reuse open
+    TCP/TLS connections instead of reconnecting for every page. Responses
+    compressed with gzip or deflate are decoded transparently.
+
+    Failures are reported with the same exception types urllib uses
+    (error.HTTPError for 4xx/5xx statuses, error.URLError for connection
+    problems), so callers keep their existing error handling.
+
+    With an HTTPCache attached, requests for cached URLs are sent as
+    conditional GETs and a 304 response is answered from the cache.
+    """
+
+    def __init__(self, headers: Optional[dict] = None, timeout: float = REQUEST_TIMEOUT,
+                 max_idle_per_host: int = MAX_IN_FLIGHT, cache: Optional[HTTPCache] = None):
+        self.headers = dict(REQUEST_HEADERS if headers is None else headers)
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.cache = cache
+        self._idle = {}  # (scheme, netloc) -> list of idle connections
+        self._lock = threading.Lock()
+        self.bytes_received = 0  # Compressed body bytes read off the wire
+        self.cache_hits = 0  # 304 responses served from the cache
+
+    def _checkout(self, scheme: str, netloc: str):
+        """Return an idle pooled connection for the host, or open a new one."""
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout), False
+        return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+
+    def _checkin(self, scheme: str, netloc: str, conn) -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for idle in pools.values():
+            for conn in idle:
+                conn.close()
+
+    @staticmethod
+    def _decode_body(body: bytes, encoding: str) -> bytes:
+        """Undo the response Content-Encoding (gzip, deflate or identity)."""
+        encoding = encoding.strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                # Some servers send raw deflate data without the zlib header
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        return body
+
+    def _send(self, url: str, extra_headers: Optional[dict] = None):
+        """
+        Perform one GET on a pooled connection.
+
+        A request that fails on a reused connection is retried once on a
+        fresh connection, since the server may have closed it while idle.
+
+        Args:
+            url: Absolute http(s) URL to fetch
+            extra_headers: Headers added to the session defaults
+
+        Returns:
+            Tuple of (status, reason, headers, raw_body)
+        """
+        parts = parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = dict(self.headers, **extra_headers) if extra_headers else self.headers
+
+        while True:
+            conn, reused = self._checkout(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if reused:
+                    continue
+                raise error.URLError(e) from e
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(parts.scheme, parts.netloc, conn)
+            return response.status, response.reason, response.headers, body
+
+    def get(self, url: str) -> bytes:
+        """
+        Fetch a URL, following redirects and decoding compressed bodies.
+
+        Args:
+            url: Absolute http(s) URL to fetch
+
+        Returns:
+            Decoded response body as bytes
+
+        Raises:
+            error.HTTPError: for 4xx/5xx responses, or a 304 that persists
+                after an unconditional refetch
+            error.URLError: for connection failures or redirect loops
+        """
+        conditional = self.cache is not None
+        refetched = False
+        for _ in range(MAX_REDIRECTS + 1):
+            validators = self.cache.conditional_headers(url) if conditional else None
+            status, reason, headers, body = self._send(url, validators)
+            with self._lock:
+                self.bytes_received += len(body)
+
+            if status == 304:
+                cached = self.cache.load(url) if validators else None
+                if cached is not None:
+                    with self._lock:
+                        self.cache_hits += 1
+                    return cached
+                # Unexpected 304: no validators were sent, or the cached body
+                # was evicted. Its empty body is not the page, so refetch once
+                # without conditional headers and give up if it happens again.
+                if refetched:
+                    raise error.HTTPError(url, status, "unexpected 304 Not Modified",
+                                          headers, None)
+                conditional, refetched = False, True
+                continue
+            if status in (301, 302, 303, 307, 308) and headers.get("Location"):
+                url = parse.urljoin(url, headers["Location"])
+                continue
+            if status >= 400:
+                raise error.HTTPError(url, status, reason, headers, None)
+            body = self._decode_body(body, headers.get("Content-Encoding", ""))
+            if self.cache is not None and status == 200:
+                self.cache.store(url, headers.get("ETag"), headers.get("Last-Modified"), body)
+            return body
+
+        raise error.URLError(f"Too many redirects for {url}")
+
+
+_session = HTTPSession()
+
+
+def get_session() -> HTTPSession:
+    """Return the shared keep-alive session used by make_request()."""
+    return _session
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics: bucket counts are per ``le``)."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class ScrapeMetrics:
+    """
+    Thread-safe counters, gauges and histograms for one crawl.
+
+    Metric names are declared up front with their help text (exported with
+    a ``scrape_`` prefix in Prometheus format). Snapshots are pushed to the
+    attached sinks at most every METRICS_EMIT_SECONDS by maybe_emit(), and
+    summary() reports totals, latency percentiles and which stage bounded
+    the crawl.
+    """
+
+    COUNTERS = {
+        "pages_fetched": "Pages downloaded successfully",
+        "pages_failed": "Pages that failed after all retries",
+        "pages_empty": "Pages that yielded no entries",
+        "retries": "Request retries after HTTP 429/5xx or connection errors",
+        "entries": "Entries extracted",
+        "bytes_received": "Response body bytes received on the wire",
+        "cache_hits": "Pages served from the HTTP cache after a 304",
+        "entries_duplicate": "Entries dropped as duplicates by the fingerprint filter",
+        "pages_repeated": "Pages whose entries repeat an earlier page",
+        "pages_drifted": "Pages whose structure differs from the first page",
+    }
+    GAUGES = {
+        "pages_per_second": "Pages processed per second since the last snapshot",
+        "rate_limit_rps": "Current per-host request rate allowed by the limiter",
+    }
+    HISTOGRAMS = {
+        "fetch_seconds": ("HTTP fetch latency including retries", LATENCY_BUCKETS),
+        "limiter_wait_seconds": ("Time a fetch waited for the rate limiter", LATENCY_BUCKETS),
+        "fetch_wait_seconds": ("Time the crawl loop waited for the next page", LATENCY_BUCKETS),
+        "parse_seconds": ("HTML parse and entry extraction time per page", LATENCY_BUCKETS),
+        "entries_per_page": ("Entries extracted per page", ENTRIES_BUCKETS),
+    }
+
+    def __init__(self):
+        self.sinks = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every metric and restart the run clock."""
+        with self._lock:
+            self.counters = {name: 0 for name in self.COUNTERS}
+            self.gauges = {name: 0.0 for name in self.GAUGES}
+            self.histograms = {name: Histogram(buckets)
+                               for name, (_, buckets) in self.HISTOGRAMS.items()}
+            self.started = time.time()
+            self._last_emit = time.monotonic()
+            self._pages_at_last_emit = 0
+
+    def add_sink(self, sink) -> None:
+        """Attach a sink with write(event, snapshot) and close() methods."""
+        self.sinks.append(sink)
+
+    def inc(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def set_counter(self, name: str, value: float) -> None:
+        """Set a counter mirrored from another cumulative source."""
+        with self._lock:
+            self.counters[name] = value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self.histograms[name].observe(value)
+
+    def _pages_processed(self) -> int:
+        return self.counters["pages_fetched"] + self.counters["pages_failed"]
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable copy of every metric."""
+        with self._lock:
+            return {
+                "elapsed_seconds": round(time.time() - self.started, 3),
+                "counters": dict(self.counters),
+                "gauges": {name: round(value, 4) for name, value in self.gauges.items()},
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+            }
+
+    def maybe_emit(self, force: bool = False) -> None:
+        """Update pages/sec and push a snapshot if the emit interval passed."""
+        now = time.monotonic()
+        with self._lock:
+            interval = now - self._last_emit
+            if not force and interval < METRICS_EMIT_SECONDS:
+                return
+            pages = self._pages_processed()
+            if interval > 0:
+                self.gauges["pages_per_second"] = (pages - self._pages_at_last_emit) / interval
+            self._last_emit = now
+            self._pages_at_last_emit = pages
+        if self.sinks:
+            snapshot = self.snapshot()
+            for sink in self.sinks:
+                sink.write("progress", snapshot)
+
+    def summary(self) -> dict:
+        """
+        Build the machine-readable run summary.
+
+        The bottleneck is the stage the crawl loop spent most time in:
+        waiting for pages ("network", or "rate_limit" when most of that
+        wait was the limiter's) or parsing them ("parse").
+        """
+        snapshot = self.snapshot()
+        elapsed = snapshot["elapsed_seconds"]
+        histograms = snapshot["histograms"]
+        fetch_wait = histograms["fetch_wait_seconds"]["sum"]
+        parse_time = histograms["parse_seconds"]["sum"]
+        limiter_wait = histograms["limiter_wait_seconds"]["sum"]
+        fetch_time = histograms["fetch_seconds"]["sum"]
+        if parse_time >= fetch_wait:
+            bottleneck = "parse"
+        elif limiter_wait > fetch_time:
+            bottleneck = "rate_limit"
+        else:
+            bottleneck = "network"
+        counters = snapshot["counters"]
+        duplicates = counters["entries_duplicate"]
+        return dict(snapshot, **{
+            "started_at": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "pages_per_second": round(counters["pages_fetched"] / elapsed, 4) if elapsed else 0.0,
+            "entries_per_second": round(counters["entries"] / elapsed, 4) if elapsed else 0.0,
+            "dedup_rate": round(duplicates / (counters["entries"] + duplicates), 4)
+            if duplicates else 0.0,
+            "time_share": {
+                "fetch_wait": round(fetch_wait / elapsed, 4) if elapsed else 0.0,
+                "parse": round(parse_time / elapsed, 4) if elapsed else 0.0,
+            },
+            "bottleneck": bottleneck,
+        })
+
+    def publish_summary(self, filename: Optional[str] = METRICS_SUMMARY_FILE) -> dict:
+        """Send the run summary to every sink and write it to ``filename``."""
+        self.maybe_emit(force=True)
+        summary = self.summary()
+        for sink in self.sinks:
+            sink.write("summary", summary)
+            sink.close()
+        if filename:
+            try:
+                with open(filename, "w", encoding="utf-8") as f:
+                    json.dump(summary, f, indent=2)
+            except OSError as e:
+                print(f"[METRICS] Could not write {filename}: {e}")
+        return summary
+
+
+class JSONLinesMetricsSink:
+    """Metrics sink writing one JSON object per snapshot (stdout by default)."""
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+
+    def write(self, event: str, snapshot: dict) -> None:
+        record = dict(snapshot, event=event, ts=datetime.now().isoformat(timespec="seconds"))
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class PrometheusTextfileSink:
+    """
+    Metrics sink rewriting a Prometheus text-format file on every snapshot.
+
+    The file is replaced atomically, so it can be scraped at any time (for
+    example by node_exporter's textfile collector).
+    """
+
+    def __init__(self, filename: str = METRICS_PROM_FILE, prefix: str = "scrape_"):
+        self.filename = filename
+        self.prefix = prefix
+
+    def render(self, snapshot: dict) -> str:
+        lines = []
+        for name, value in snapshot["counters"].items():
+            metric = f"{self.prefix}{name}_total"
+            lines += [f"# HELP {metric} {ScrapeMetrics.COUNTERS[name]}",
+                      f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in snapshot["gauges"].items():
+            metric = f"{self.prefix}{name}"
+            lines += [f"# HELP {metric} {ScrapeMetrics.GAUGES[name]}",
+                      f"# TYPE {metric} gauge", f"{metric} {value}"]
+        for name, hist in snapshot["histograms"].items():
+            metric = f"{self.prefix}{name}"
+            lines += [f"# HELP {metric} {ScrapeMetrics.HISTOGRAMS[name][0]}",
+                      f"# TYPE {metric} histogram"]
+            cumulative = 0
+            for bound, count in hist["buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines += [f"{metric}_sum {hist['sum']}", f"{metric}_count {hist['count']}"]
+        return "\n".join(lines) + "\n"
+
+    def write(self, event: str, snapshot: dict) -> None:
+        tmp_path = f"{self.filename}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render(snapshot))
+        os.replace(tmp_path, self.filename)
+
+    def close(self) -> None:
+        pass
+
+
+_metrics = ScrapeMetrics()
+
+
+def get_metrics() -> ScrapeMetrics:
+    """Return the shared metrics registry updated by the scraper."""
+    return _metrics
+
+
 def check_robots_txt(url: str) -> bool:
     """
     Check if scraping the given URL is allowed by robots.txt.
@@ -62,6 +989,16 @@ def check_robots_txt(url: str) -> bool:
         can_fetch = rp.can_fetch(USER_AGENT, url)
         print(f"[ROBOTS.TXT] Checking {url}")
         print(f"[ROBOTS.TXT] Can fetch: {can_fetch}")
+
+        # Crawl-delay / Request-rate cap the host's request rate
+        delay = rp.crawl_delay(USER_AGENT)
+        request_rate = rp.request_rate(USER_AGENT)
+        if request_rate and request_rate.requests:
+            delay = max(float(delay or 0), request_rate.seconds / request_rate.requests)
+        if delay:
+            get_host_limiter(url).set_crawl_delay(float(delay) * RATE_SHARE)
+            print(f"[ROBOTS.TXT] Crawl-delay: {float(delay):g}s between requests"
+                  + (f" (shared by {RATE_SHARE} crawlers)" if RATE_SHARE > 1 else ""))
         return can_fetch
     except Exception as e:
         print(f"[ROBOTS.TXT] Error reading robots.txt: {e}")
@@ -75,6 +1012,17 @@ def make_request(url: str, retry_count: int = 0) -> Optional[str]:
     """
     Make an HTTP request with proper headers and retry logic.
 
+    Requests go through the shared keep-alive session, so retries reuse
+    the pooled connection and responses may arrive gzip/deflate-compressed.
+    When the session has an HTTPCache, unchanged pages are revalidated with
+    a conditional GET and served from disk.
+
+    Every outcome is reported to the host's rate controller: fast 2xx
+    responses speed the crawl up, 429/5xx and failures slow it down. A
+    Retry-After header sets the wait before the retry; otherwise the wait
+    is exponential backoff. Retries take a token from the host limiter
+    like any other request.
+
     Args:
         url: The URL to fetch
         retry_count: Current retry attempt number
@@ -82,26 +1030,23 @@ def make_request(url: str, retry_count: int = 0) -> Optional[str]:
     Returns:
         Response content as string, or None if all retries failed
     """
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "identity",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-    }
-
-    req = request.Request(url, headers=headers)
-
+    limiter = get_host_limiter(url)
+    started = time.monotonic()
     try:
-        with request.urlopen(req, timeout=30) as response:
-            return response.read().decode("utf-8", errors="replace")
+        body = get_session().get(url).decode("utf-8", errors="replace")
+        limiter.on_success(time.monotonic() - started)
+        return body
     except error.HTTPError as e:
         if e.code in (429, 500, 502, 503, 504):
+            retry_after = parse_retry_after(e.headers.get("Retry-After") if e.headers else None)
+            limiter.on_throttle(e.code, retry_after)
             if retry_count < MAX_RETRIES:
-                wait_time = (RETRY_BACKOFF ** retry_count) * MIN_DELAY
+                backoff = (RETRY_BACKOFF ** retry_count) * MIN_DELAY
+                wait_time = retry_after if retry_after is not None else backoff
                 print(f"[RETRY] HTTP {e.code} error. Waiting {wait_time:.1f}s before retry {retry_count + 1}/{MAX_RETRIES}")
+                get_metrics().inc("retries")
                 time.sleep(wait_time)
+                limiter.acquire()
                 return make_request(url, retry_count + 1)
             else:
                 print(f"[ERROR] Max retries exceeded for {url}")
@@ -110,10 +1055,13 @@ def make_request(url: str, retry_count: int = 0) -> Optional[str]:
             print(f"[ERROR] HTTP error {e.code}: {e.reason}")
             return None
     except error.URLError as e:
+        limiter.on_throttle()
         if retry_count < MAX_RETRIES:
             wait_time = (RETRY_BACKOFF ** retry_count) * MIN_DELAY
             print(f"[RETRY] URL error: {e.reason}. Waiting {wait_time:.1f}s before retry {retry_count + 1}/{MAX_RETRIES}")
+            get_metrics().inc("retries")
             time.sleep(wait_time)
+            limiter.acquire()
             return make_request(url, retry_count + 1)
         else:
             print(f"[ERROR] Max retries exceeded for {url}")
@@ -123,48 +1071,276 @@ def make_request(url: str, retry_count: int = 0) -> Optional[str]:
         return None
 
 
-def parse_entry(row) -> Optional[dict]:
+def _parser_available(name: str) -> bool:
+    """Return True if BeautifulSoup can build trees with the named parser."""
+    try:
+        BeautifulSoup("", name)
+        return True
+    except Exception:
+        return False
+
+
+def select_html_parser(preferred: Optional[str] = None) -> str:
     """
-    Parse a single admission entry row from the HTML.
+    Choose the HTML parser backend for BeautifulSoup.
+
+    Only an explicitly requested parser replaces DEFAULT_HTML_PARSER, so
+    installing lxml does not change how pages are parsed.
 
     Args:
-        row: BeautifulSoup element representing a table row or card
+        preferred: Parser name to use if installed (e.g. "lxml")
 
     Returns:
-        Dictionary containing parsed entry data, or None if parsing fails
+        Name of the parser backend that will be used
     """
-    try:
-        entry = {}
+    if preferred and preferred != DEFAULT_HTML_PARSER:
+        if _parser_available(preferred):
+            return preferred
+        print(f"[PARSE] Parser '{preferred}' is not installed, using {DEFAULT_HTML_PARSER}")
+    return DEFAULT_HTML_PARSER
+
+
+HTML_PARSER = select_html_parser(os.environ.get("SCRAPE_HTML_PARSER"))
+
 
-        # Extract institution/program info
-        # GradCafe structure varies, so we try multiple selectors
-        institution_elem = row.select_one(".institution, .school, [class*='school'], [class*='institution']")
-        if institution_elem:
-            entry["institution"] = institution_elem.get_text(strip=True)
+def parse_page(html_content: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse a results page once so every extraction step can share the tree.
 
-        program_elem = row.select_one(".program, .major, [class*='program'], [class*='major']")
-        if program_elem:
-            entry["program"] = program_elem.get_text(strip=True)
+    Args:
+        html_content: Raw HTML string of the page
+        parser: BeautifulSoup parser backend (defaults to HTML_PARSER)
 
-        # Extract decision status
-        decision_elem = row.select_one(".decision, .status, [class*='decision'], [class*='status']")
-        if decision_elem:
-            entry["decision"] = decision_elem.get_text(strip=True)
+    Returns:
+        Parsed BeautifulSoup document
+    """
+    return BeautifulSoup(html_content, parser or HTML_PARSER)
 
-        # Extract date
-        date_elem = row.select_one(".date, [class*='date'], time")
-        if date_elem:
-            entry["date_added"] = date_elem.get_text(strip=True)
 
-        # Extract additional details (GPA, GRE, etc.)
-        details_elem = row.select_one(".details, .extra, [class*='detail']")
-        if details_elem:
-            entry["details"] = details_elem.get_text(strip=True)
+def _as_document(page: Union[str, BeautifulSoup]) -> BeautifulSoup:
+    """Accept either raw HTML or an already parsed document."""
+    if isinstance(page, BeautifulSoup):
+        return page
+    return parse_page(page)
 
-        # Extract comments/notes
-        comments_elem = row.select_one(".comments, .notes, [class*='comment'], [class*='note']")
-        if comments_elem:
-            entry["comments"] = comments_elem.get_text(strip=True)
+
+_CLASS_SELECTOR = re.compile(r"^\.([\w-]+)$")
+_CLASS_CONTAINS_SELECTOR = re.compile(r"""^\[class\*=['"]([^'"]+)['"]\]$""")
+_TAG_SELECTOR = re.compile(r"^([a-z][a-z0-9]*)$")
+
+
+def _tag_predicate(alternative: str):
+    """
+    Translate a simple CSS selector into a plain Python tag test.
+
+    Handles ".cls", "[class*='text']" and "tag", the forms FIELD_SELECTORS
+    uses. Returns None for anything else.
+    """
+    match = _CLASS_SELECTOR.match(alternative)
+    if match:
+        name = match.group(1)
+        return lambda tag: name in (tag.get("class") or ())
+    match = _CLASS_CONTAINS_SELECTOR.match(alternative)
+    if match:
+        text = match.group(1)
+        return lambda tag: text in " ".join(tag.get("class") or ())
+    match = _TAG_SELECTOR.match(alternative)
+    if match:
+        name = match.group(1)
+        return lambda tag: tag.name == name
+    return None
+
+
+def compile_field_selector(alternatives: list):
+    """
+    Compile selector alternatives into a ``row -> element`` function.
+
+    Like ``row.select_one(", ".join(alternatives))``, the result is the
+    first descendant in document order that matches any alternative. Simple
+    alternatives become Python predicates passed to ``row.find()``, which
+    avoids soupsieve's per-node matching overhead. Anything more complex
+    falls back to a compiled soupsieve selector.
+
+    Args:
+        alternatives: CSS selector alternatives
+
+    Returns:
+        Callable taking a row element and returning the match or None
+    """
+    predicates = [_tag_predicate(alt) for alt in alternatives]
+    if None in predicates:
+        return sv.compile(", ".join(alternatives)).select_one
+
+    def matches(tag) -> bool:
+        return any(predicate(tag) for predicate in predicates)
+
+    return lambda row: row.find(matches)
+
+
+def find_entry_rows(soup: BeautifulSoup) -> tuple:
+    """
+    Find entry rows by walking the full ROW_SELECTORS cascade.
+
+    Args:
+        soup: Parsed results page
+
+    Returns:
+        Tuple of (rows, selector) where selector is None if the generic
+        div fallback was used
+    """
+    for selector in ROW_SELECTORS:
+        rows = soup.select(selector)
+        if rows:
+            return rows, selector
+
+    # If no specific rows found, try to find any structured data
+    # Look for any repeating elements that might contain data
+    return soup.find_all("div", class_=ROW_FALLBACK_CLASS), None
+
+
+class SelectorPlan:
+    """
+    Row and field selectors learned once per crawl and reused for every page.
+
+    Learning runs the full ROW_SELECTORS cascade on a page. It then keeps,
+    for each field, only the FIELD_SELECTORS alternatives that matched some
+    row on that page, compiled by compile_field_selector(). Later pages go straight to
+    the learned row selector and the narrowed field selectors. A row the
+    narrowed selector finds nothing in is searched again with only the
+    alternatives the plan left out, so a field absent from the learning page
+    (no comments or GRE block there) is still extracted from later pages.
+    Since the narrowed alternatives matched nothing, the first match among
+    the rest is the element the full select_one() chain would return. The
+    plan is re-learned whenever the learned row selector finds zero rows
+    on a page.
+
+    Compiled matchers cannot be pickled, so a plan is handed to parse
+    worker processes as its ``spec`` and rebuilt there with from_spec().
+    """
+
+    def __init__(self):
+        self.row_selector = None  # CSS text of the learned row selector
+        self._row_matcher = None  # Compiled row selector (None = div fallback)
+        self.field_matchers = None  # field -> compiled matcher or None
+        self._fallback_matchers = {}  # field -> matcher of the alternatives left out
+        self.spec = None  # Picklable (row_selector, ((field, alternatives), ...))
+        self.times_learned = 0
+
+    @property
+    def learned(self) -> bool:
+        """True once a plan has been learned from a page with rows."""
+        return self.field_matchers is not None
+
+    @classmethod
+    def from_spec(cls, spec: Optional[tuple]) -> "SelectorPlan":
+        """Rebuild a learned plan from its ``spec`` (None gives an unlearned plan)."""
+        plan = cls()
+        if spec is not None:
+            plan._compile(*spec)
+        return plan
+
+    def _compile(self, row_selector: Optional[str], field_alternatives: tuple) -> None:
+        """Compile the row selector and each field's matched alternatives."""
+        self.row_selector = row_selector
+        self._row_matcher = sv.compile(row_selector) if row_selector else None
+        self.field_matchers = {}
+        self._fallback_matchers = {}
+        for field, matched in field_alternatives:
+            alternatives = [alt.strip() for alt in FIELD_SELECTORS[field].split(",")]
+            self.field_matchers[field] = compile_field_selector(list(matched)) if matched else None
+            left_out = [alt for alt in alternatives if alt not in matched]
+            if left_out:
+                self._fallback_matchers[field] = compile_field_selector(left_out)
+        self.spec = (row_selector, field_alternatives)
+
+    def find_rows(self, soup: BeautifulSoup) -> list:
+        """
+        Return the entry rows of a page, learning the plan if needed.
+
+        Args:
+            soup: Parsed results page
+
+        Returns:
+            List of row elements (empty if the page has none)
+        """
+        if self.learned:
+            rows = self._select_rows(soup)
+            if rows:
+                return rows
+            print("[PLAN] Learned row selector matched nothing, re-learning selector plan")
+        return self.learn(soup)
+
+    def _select_rows(self, soup: BeautifulSoup) -> list:
+        if self._row_matcher is None:
+            return soup.find_all("div", class_=ROW_FALLBACK_CLASS)
+        return self._row_matcher.select(soup)
+
+    def learn(self, soup: BeautifulSoup) -> list:
+        """
+        Walk the full selector cascade on a page and record what matched.
+
+        Args:
+            soup: Parsed results page
+
+        Returns:
+            List of row elements found while learning
+        """
+        self.row_selector = None
+        self._row_matcher = None
+        self.field_matchers = None
+        self.spec = None
+
+        rows, row_selector = find_entry_rows(soup)
+        if not rows:
+            return rows
+
+        field_alternatives = []
+        for field, selector in FIELD_SELECTORS.items():
+            alternatives = [alt.strip() for alt in selector.split(",")]
+            matched = tuple(alt for alt in alternatives
+                            if any(sv.select_one(alt, row) for row in rows))
+            field_alternatives.append((field, matched))
+        self._compile(row_selector, tuple(field_alternatives))
+
+        self.times_learned += 1
+        fields = ", ".join(f for f, matcher in self.field_matchers.items() if matcher)
+        print(f"[PLAN] Learned selector plan #{self.times_learned}: "
+              f"rows={self.row_selector or 'div fallback'}; fields={fields or 'none'}")
+        return rows
+
+    def select_field(self, row, field: str):
+        """Return the first element for ``field`` in a row, or None."""
+        matcher = self.field_matchers.get(field)
+        elem = matcher(row) if matcher else None
+        if elem is None and field in self._fallback_matchers:
+            elem = self._fallback_matchers[field](row)
+        return elem
+
+
+def parse_entry(row, plan: Optional[SelectorPlan] = None) -> Optional[dict]:
+    """
+    Parse a single admission entry row from the HTML.
+
+    Args:
+        row: BeautifulSoup element representing a table row or card
+        plan: Learned selector plan; without one every FIELD_SELECTORS
+            alternative is tried
+
+    Returns:
+        Dictionary containing parsed entry data, or None if parsing fails
+    """
+    try:
+        entry = {}
+
+        # Extract institution, program, decision, date, details and comments
+        # GradCafe structure varies, so each field has several selectors
+        for field, selector in FIELD_SELECTORS.items():
+            if plan is not None and plan.learned:
+                elem = plan.select_field(row, field)
+            else:
+                elem = row.select_one(selector)
+            if elem:
+                entry[field] = elem.get_text(strip=True)
 
         # If we couldn't find specific fields, try to extract all text content
         if not entry:
@@ -173,6 +1349,12 @@ def parse_entry(row) -> Optional[dict]:
             if all_text:
                 entry["raw_content"] = all_text
 
+        # The post's own result page identifies it even when its text
+        # matches another post's (same school, program and decision)
+        post_link = row.select_one(POST_LINK_SELECTOR)
+        if post_link is not None:
+            entry["result_url"] = parse.urljoin(BASE_URL, post_link["href"])
+
         # Also store the raw HTML for later processing if needed
         entry["raw_html"] = str(row)
 
@@ -183,63 +1365,50 @@ def parse_entry(row) -> Optional[dict]:
         return None
 
 
-def extract_entries_from_page(html_content: str) -> list:
+def extract_entries_from_page(page: Union[str, BeautifulSoup],
+                              plan: Optional[SelectorPlan] = None) -> list:
     """
     Extract all admission entries from a page's HTML content.
 
     Args:
-        html_content: Raw HTML string of the page
+        page: Raw HTML string of the page, or a document from parse_page()
+        plan: Selector plan shared across a crawl; without one the full
+            selector cascade is walked for the page and every row
 
     Returns:
         List of parsed entry dictionaries
     """
     entries = []
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    # Try various selectors that GradCafe might use
-    # The site structure may vary, so we try multiple approaches
-    selectors = [
-        "table.results tbody tr",
-        "table tbody tr",
-        ".result-row",
-        ".survey-result",
-        "[class*='result']",
-        ".card",
-        "article",
-    ]
-
-    rows = []
-    for selector in selectors:
-        rows = soup.select(selector)
-        if rows:
-            print(f"[PARSE] Found {len(rows)} entries using selector: {selector}")
-            break
+    soup = _as_document(page)
 
-    # If no specific rows found, try to find any structured data
-    if not rows:
-        # Look for any repeating elements that might contain data
-        rows = soup.find_all("div", class_=re.compile(r"(result|entry|row|item)", re.I))
+    if plan is not None:
+        rows = plan.find_rows(soup)
+        selector = plan.row_selector
+    else:
+        rows, selector = find_entry_rows(soup)
+    if rows and selector:
+        print(f"[PARSE] Found {len(rows)} entries using selector: {selector}")
 
     for row in rows:
-        entry = parse_entry(row)
+        entry = parse_entry(row, plan)
         if entry:
             entries.append(entry)
 
     return entries
 
 
-def get_next_page_url(html_content: str, current_page: int) -> Optional[str]:
+def get_next_page_url(page: Union[str, BeautifulSoup], current_page: int) -> Optional[str]:
     """
     Extract the URL for the next page of results.
 
     Args:
-        html_content: Raw HTML string of the current page
+        page: Raw HTML string of the current page, or a document from parse_page()
         current_page: Current page number
 
     Returns:
         URL string for the next page, or None if no next page
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = _as_document(page)
 
     # Try to find next page link
     next_link = soup.select_one("a.next, a[rel='next'], .pagination a.next, [class*='next'] a")
@@ -270,7 +1439,812 @@ def get_next_page_url(html_content: str, current_page: int) -> Optional[str]:
     return f"{RESULTS_URL}?page={next_page}"
 
 
-def scrape_data() -> tuple:
+def get_page_url(page_number: int) -> str:
+    """
+    Build the results URL for a page number.
+
+    Args:
+        page_number: 1-based page number
+
+    Returns:
+        URL string for that page
+    """
+    if page_number == 1:
+        return RESULTS_URL
+    return f"{RESULTS_URL}?page={page_number}"
+
+
+def fetch_page(page_number: int) -> Optional[str]:
+    """
+    Fetch one results page, waiting for the host rate limiter first.
+
+    Safe to call from worker threads.
+
+    Args:
+        page_number: 1-based page number
+
+    Returns:
+        Page HTML as string, or None if the request failed
+    """
+    metrics = get_metrics()
+    page_url = get_page_url(page_number)
+    started = time.monotonic()
+    get_host_limiter(page_url).acquire()
+    fetch_started = time.monotonic()
+    metrics.observe("limiter_wait_seconds", fetch_started - started)
+    print(f"[PAGE {page_number}] Fetching: {page_url}")
+    html_content = make_request(page_url)
+    metrics.observe("fetch_seconds", time.monotonic() - fetch_started)
+    metrics.inc("pages_failed" if html_content is None else "pages_fetched")
+    return html_content
+
+
+def find_last_page(first_page: int = 1) -> int:
+    """
+    Locate the last survey page that still lists entries.
+
+    Probes first_page + 1, + 2, + 4, ... until a page is past the end, then
+    bisects the gap, so the survey length is found at run time in about
+    2 * log2(pages) requests. Past the end the site either lists nothing or
+    (if it clamps out-of-range page numbers) repeats the last page; in the
+    second case the answer is the first page showing the repeated entries.
+
+    Args:
+        first_page: Page the survey starts at
+
+    Returns:
+        Number of the last page with entries (first_page - 1 if there are none)
+
+    Raises:
+        RuntimeError: If robots.txt disallows the crawl or a probe fails
+    """
+    if not check_robots_txt(RESULTS_URL):
+        raise RuntimeError("scraping not allowed by robots.txt")
+
+    def fingerprint_of(page_number: int) -> str:
+        html_content = fetch_page(page_number)
+        if html_content is None:
+            raise RuntimeError(f"page {page_number} could not be fetched")
+        entries = extract_entries_from_page(html_content)
+        return page_fingerprint(entries) if entries else ""
+
+    before = max(1, first_page) - 1  # Highest page known to come before the end
+    last = before + 1
+    fingerprint = fingerprint_of(last)
+    if not fingerprint:
+        return before
+    step = 1
+    while True:
+        probe = fingerprint_of(last + step)
+        if not probe:
+            low, high, end = last, last + step, ""
+            break
+        if probe == fingerprint:
+            low, high, end = before, last, fingerprint
+            break
+        before, last, fingerprint = last, last + step, probe
+        step *= 2
+
+    # The smallest page in (low, high] showing `end` is the first empty page,
+    # or with clamping the last page itself
+    while high - low > 1:
+        middle = (low + high) // 2
+        if fingerprint_of(middle) == end:
+            high = middle
+        else:
+            low = middle
+    last = high if end else high - 1
+    print(f"[RANGE] Last page with entries: {last}")
+    return last
+
+
+_worker_plan = None  # Selector plan of a parse worker process
+
+
+def _init_parse_worker(parser: str) -> None:
+    """Process-pool initializer: use the parent's HTML parser backend."""
+    global HTML_PARSER
+    HTML_PARSER = parser
+
+
+def parse_page_in_worker(html_content: str, plan_spec: Optional[tuple] = None) -> tuple:
+    """
+    Parse one page and extract its entries inside a parse worker process.
+
+    Until the crawl hands it a plan, each worker learns its own SelectorPlan
+    on its first page and reuses it for every later page. Once the main
+    process has a learned plan (after a drift re-learn) its spec comes with
+    every page, and a worker whose plan differs switches to it.
+
+    Args:
+        html_content: Page HTML
+        plan_spec: SelectorPlan.spec of the crawl's plan, or None
+
+    Returns:
+        Tuple of (entries, row_selector): the parsed entry dictionaries and
+        the row selector that matched (None for the div fallback)
+    """
+    global _worker_plan
+    if plan_spec is not None and (_worker_plan is None or _worker_plan.spec != plan_spec):
+        _worker_plan = SelectorPlan.from_spec(plan_spec)
+    elif _worker_plan is None:
+        _worker_plan = SelectorPlan()
+    entries = extract_entries_from_page(parse_page(html_content), _worker_plan)
+    return entries, _worker_plan.row_selector
+
+
+def use_base_url(base_url: str) -> None:
+    """
+    Point the scraper at another host, e.g. a local fixture server.
+
+    Args:
+        base_url: Scheme and host (and optional port), without a trailing slash
+    """
+    global BASE_URL, RESULTS_URL, ROBOTS_URL
+    BASE_URL = base_url.rstrip("/")
+    RESULTS_URL = f"{BASE_URL}/survey"
+    ROBOTS_URL = f"{BASE_URL}/robots.txt"
+
+
+class ReplayDirectory:
+    """
+    Page source that replays saved result pages instead of fetching them.
+
+    Files are matched to page numbers by the number in their name
+    (page_00042.html -> page 42); if the names carry no numbers, the sorted
+    file order is used. Pages past the end of the corpus replay as empty
+    pages, so the crawl stops exactly as it does on the live site.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        names = sorted(name for name in os.listdir(directory) if name.endswith((".html", ".htm")))
+        numbers = [re.search(r"(\d+)\.html?$", name) for name in names]
+        if all(numbers) and len({int(m.group(1)) for m in numbers}) == len(names):
+            self.pages = {int(m.group(1)): name for m, name in zip(numbers, names)}
+        else:
+            self.pages = {number: name for number, name in enumerate(names, start=1)}
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def fetch_page(self, page_number: int) -> Optional[str]:
+        """Return the saved HTML for a page ("" past the end of the corpus)."""
+        name = self.pages.get(page_number)
+        if name is None:
+            return ""
+        started = time.monotonic()
+        with open(os.path.join(self.directory, name), "r", encoding="utf-8", errors="replace") as f:
+            html_content = f.read()
+        get_metrics().observe("fetch_seconds", time.monotonic() - started)
+        get_metrics().inc("pages_fetched")
+        return html_content
+
+
+def save_page(directory: str, page_number: int, html_content: str) -> None:
+    """Save a fetched page under the replay naming scheme."""
+    path = os.path.join(directory, REPLAY_PAGE_PATTERN.format(page_number))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html_content)
+
+
+def parse_entry_date(text: Optional[str]) -> Optional[date]:
+    """
+    Parse an entry's "date added" text into a date.
+
+    Args:
+        text: Date string as shown on the survey page
+
+    Returns:
+        date object, or None if the text is missing or unrecognized
+    """
+    if not text:
+        return None
+    text = text.strip()
+    for fmt in ENTRY_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_watermark(value: Optional[str]) -> Optional[date]:
+    """
+    Parse an ingestion watermark ("YYYY-MM-DD" with an optional time part).
+
+    Args:
+        value: Watermark string as stored in ingestion_watermarks.last_seen
+
+    Returns:
+        date of the watermark, or None if it is missing or unrecognized
+    """
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        return None
+
+
+def newest_entry_date(entries: list) -> Optional[str]:
+    """
+    Find the most recent "date added" among scraped entries.
+
+    Args:
+        entries: Scraped entry dictionaries
+
+    Returns:
+        ISO date string (YYYY-MM-DD) usable as the next watermark, or None
+    """
+    dates = [d for d in (parse_entry_date(e.get("date_added")) for e in entries) if d]
+    return max(dates).isoformat() if dates else None
+
+
+class PageJournal:
+    """
+    Append-only checkpoint journal of processed pages.
+
+    Each line is a JSON record ``{"page": N, "status": ..., "entries": [...]}``
+    where status is "ok", "empty", "failed", "repeat" or "drift"; "ok" and
+    "drift" records also carry the page's fingerprint and structure. When
+    entries are streamed to an NDJSON file instead, records carry ``count``
+    and ``offset`` (output size after the page) in place of the entries. A crash
+    can at worst leave a torn final line, which is discarded on the next load.
+    """
+
+    def __init__(self, filename: str = CHECKPOINT_FILE,
+                 fsync_pages: int = CHECKPOINT_FSYNC_PAGES,
+                 fsync_seconds: float = CHECKPOINT_FSYNC_SECONDS,
+                 before_sync=None):
+        self.filename = filename
+        self.fsync_pages = fsync_pages
+        self.fsync_seconds = fsync_seconds
+        self.before_sync = before_sync  # Called first, e.g. to fsync the output
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def load(self) -> list:
+        """
+        Read every intact record from an existing journal.
+
+        A torn trailing line is truncated away so new records append cleanly.
+
+        Returns:
+            List of page records in the order they were written
+        """
+        records = []
+        if not os.path.exists(self.filename):
+            return records
+
+        valid_bytes = 0
+        with open(self.filename, "rb") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    print(f"[CHECKPOINT] Discarding torn record after page "
+                          f"{records[-1]['page'] if records else 0}")
+                    break
+                valid_bytes += len(line)
+
+        if valid_bytes < os.path.getsize(self.filename):
+            with open(self.filename, "r+b") as f:
+                f.truncate(valid_bytes)
+        return records
+
+    def append(self, page: int, status: str, entries: Optional[list] = None,
+               count: Optional[int] = None, offset: Optional[int] = None,
+               fingerprint: Optional[str] = None, structure: Optional[str] = None) -> None:
+        """
+        Record a processed page; fsync when the batch threshold is reached.
+
+        Args:
+            page: Page number that was processed
+            status: "ok", "empty", "failed", "repeat" or "drift"
+            entries: Entries extracted from the page (for "ok" and "drift")
+            count: Entries streamed to the NDJSON output for this page
+            offset: NDJSON output size in bytes after this page
+            fingerprint: page_fingerprint() of the page (for "ok" and "drift")
+            structure: page_structure() of the page (for "ok" and "drift")
+        """
+        if self._file is None:
+            self._file = open(self.filename, "a", encoding="utf-8")
+        record = {"page": page, "status": status, "entries": entries or []}
+        if count is not None:
+            record["count"] = count
+        if offset is not None:
+            record["offset"] = offset
+        if fingerprint is not None:
+            record["fingerprint"] = fingerprint
+            record["structure"] = structure
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+
+        if (self._unsynced >= self.fsync_pages
+                or time.monotonic() - self._last_sync >= self.fsync_seconds):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force buffered journal records to disk."""
+        if self._file is not None and self._unsynced:
+            if self.before_sync:
+                self.before_sync()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Delete the journal once its data has been saved elsewhere."""
+        self.close()
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+
+class NDJSONWriter:
+    """
+    Streaming newline-delimited JSON output: one entry per line.
+
+    Entries are appended page by page as they are scraped, so memory use
+    stays constant however long the crawl runs. ``count`` tracks how many
+    entries the file holds.
+    """
+
+    def __init__(self, filename: str = NDJSON_OUTPUT_FILE):
+        self.filename = filename
+        self.count = 0
+        self._file = None
+
+    def open(self, offset: int = 0, count: int = 0) -> None:
+        """
+        Open the output for appending, cut back to a known-good position.
+
+        Args:
+            offset: Byte size to keep (0 starts a new file)
+            count: Number of entries contained in the kept bytes
+        """
+        with open(self.filename, "ab") as f:
+            f.truncate(offset)
+        self._file = open(self.filename, "ab")
+        self.count = count
+
+    def write_entries(self, entries: list) -> int:
+        """
+        Append entries and flush them to the OS.
+
+        Returns:
+            Output size in bytes after the write
+        """
+        for entry in entries:
+            self._file.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+        self.count += len(entries)
+        return self._file.tell()
+
+    def tell(self) -> int:
+        """Return the current output size in bytes."""
+        return self._file.tell()
+
+    def sync(self) -> None:
+        """Force written entries to disk."""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Sync and close the output file."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+class PageArchive:
+    """
+    Content-addressed store for the row markup of scraped pages.
+
+    Each page's rows are joined into one blob, gzip-compressed and written
+    to <directory>/<hash[:2]>/<hash>.html.gz. A blob that already exists is
+    not rewritten, so re-scraping an unchanged page (e.g. after a resume)
+    costs no extra space. Writes go through a temporary file and rename, so
+    a crash never leaves a truncated blob behind.
+    """
+
+    def __init__(self, directory: str = PAGE_ARCHIVE_DIR,
+                 compresslevel: int = PAGE_ARCHIVE_COMPRESSLEVEL):
+        self.directory = directory
+        self.compresslevel = compresslevel
+        self.pages_written = 0
+        self.pages_reused = 0
+        self.bytes_written = 0
+
+    def path_for(self, page_hash: str) -> str:
+        """Return the blob path for a page hash."""
+        return os.path.join(self.directory, page_hash[:2], f"{page_hash}.html.gz")
+
+    def archive_entries(self, entries: list) -> Optional[str]:
+        """
+        Move the raw_html of a page's entries into the archive.
+
+        Each entry's raw_html is replaced by page_hash, row_offset and
+        row_length, locating the row inside the decompressed blob.
+
+        Args:
+            entries: Entries extracted from one page (modified in place)
+
+        Returns:
+            The page hash, or None if no entry carried raw_html
+        """
+        rows = []
+        offset = 0
+        for entry in entries:
+            row_html = entry.pop("raw_html", None)
+            if row_html is None:
+                continue
+            entry["row_offset"] = offset
+            entry["row_length"] = len(row_html)
+            rows.append(row_html)
+            offset += len(row_html) + len(ARCHIVE_ROW_SEPARATOR)
+        if not rows:
+            return None
+
+        blob = ARCHIVE_ROW_SEPARATOR.join(rows).encode("utf-8")
+        page_hash = hashlib.sha256(blob).hexdigest()
+        for entry in entries:
+            if "row_offset" in entry:
+                entry["page_hash"] = page_hash
+
+        path = self.path_for(page_hash)
+        if os.path.exists(path):
+            self.pages_reused += 1
+            return page_hash
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = gzip.compress(blob, compresslevel=self.compresslevel)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        self.pages_written += 1
+        self.bytes_written += len(compressed)
+        return page_hash
+
+
+def entry_fingerprint(entry: dict) -> bytes:
+    """
+    Return a 16-byte fingerprint identifying the post behind an entry.
+
+    An entry with a result_url is identified by it alone, so two posts with
+    the same visible text stay distinct. Otherwise the text fields are
+    case-folded with whitespace collapsed, so the same post seen on two
+    pages (or in two runs) hashes identically. Row markup is used only for
+    entries with no text fields at all.
+    """
+    if entry.get("result_url"):
+        return hashlib.blake2b(entry["result_url"].encode("utf-8"), digest_size=16,
+                               person=b"result_url").digest()
+    values = [entry.get(field) for field in FIELD_SELECTORS]
+    values.append(entry.get("raw_content"))
+    if not any(values):
+        values.append(entry.get("raw_html"))
+    normalized = "\x1f".join(" ".join(str(value).split()).casefold() if value else ""
+                             for value in values)
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 16-byte fingerprints.
+
+    The bit array is sized for ``capacity`` items at ``error_rate`` false
+    positives and never grows; past capacity the false-positive rate rises,
+    which ``estimated_error_rate`` reports. Bit positions come from double
+    hashing the two halves of the fingerprint.
+    """
+
+    def __init__(self, capacity: int = DEDUP_BLOOM_CAPACITY,
+                 error_rate: float = DEDUP_BLOOM_ERROR_RATE):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(error_rate)
+                                             / math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, fingerprint: bytes):
+        h1 = int.from_bytes(fingerprint[:8], "little")
+        h2 = int.from_bytes(fingerprint[8:16], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fingerprint))
+
+    def add(self, fingerprint: bytes) -> None:
+        """Set the fingerprint's bits."""
+        bits = self.bits
+        for pos in self._positions(fingerprint):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    @property
+    def estimated_error_rate(self) -> float:
+        """False-positive probability at the current item count."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, filename: str) -> None:
+        """Write the filter atomically (magic, JSON header line, raw bits)."""
+        header = {"capacity": self.capacity, "error_rate": self.error_rate,
+                  "num_bits": self.num_bits, "num_hashes": self.num_hashes, "count": self.count}
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(DEDUP_STATE_MAGIC)
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(self.bits)
+        os.replace(tmp_path, filename)
+
+    @classmethod
+    def load(cls, filename: str) -> Optional["BloomFilter"]:
+        """Read a filter written by save(); None if missing or unreadable."""
+        try:
+            with open(filename, "rb") as f:
+                if f.readline() != DEDUP_STATE_MAGIC:
+                    return None
+                header = json.loads(f.readline())
+                bits = f.read()
+        except (OSError, ValueError):
+            return None
+        bloom = cls(header["capacity"], header["error_rate"])
+        if (bloom.num_bits, bloom.num_hashes) != (header["num_bits"], header["num_hashes"]) \
+                or len(bits) != len(bloom.bits):
+            return None
+        bloom.bits = bytearray(bits)
+        bloom.count = header["count"]
+        return bloom
+
+
+class EntryDeduplicator:
+    """
+    Drops entries whose fingerprint was already seen during the crawl.
+
+    A fingerprint in the exact-recent set (the last ``recent`` entries kept)
+    is a certain duplicate; that covers entries pushed onto the next page by
+    new posts. Older fingerprints are only in the Bloom filter, so a hit
+    there is a probable duplicate (``bloom_hits`` counts them). With
+    ``state_file`` the Bloom filter is loaded at start and saved by save(),
+    so entries stored by an earlier run are dropped as well.
+    """
+
+    def __init__(self, state_file: Optional[str] = None, recent: int = DEDUP_RECENT_ENTRIES,
+                 capacity: int = DEDUP_BLOOM_CAPACITY,
+                 error_rate: float = DEDUP_BLOOM_ERROR_RATE):
+        self.state_file = state_file
+        self.recent_limit = recent
+        self.recent = OrderedDict()
+        self.bloom = None
+        if state_file and os.path.exists(state_file):
+            self.bloom = BloomFilter.load(state_file)
+            if self.bloom is None:
+                print(f"[DEDUP] Ignoring unreadable filter state {state_file}")
+            elif self.bloom.count >= self.bloom.capacity:
+                print(f"[DEDUP] Filter in {state_file} is full "
+                      f"({self.bloom.count} entries) - starting a new one")
+                self.bloom = None
+            else:
+                print(f"[DEDUP] Loaded {self.bloom.count} fingerprints from {state_file}")
+        if self.bloom is None:
+            self.bloom = BloomFilter(capacity, error_rate)
+        self.seen = 0
+        self.dropped = 0
+        self.bloom_hits = 0
+
+    def _remember(self, fingerprint: bytes) -> None:
+        self.recent[fingerprint] = None
+        if len(self.recent) > self.recent_limit:
+            self.recent.popitem(last=False)
+
+    def remember(self, entries: list) -> None:
+        """Record entries as seen without filtering them (e.g. on resume)."""
+        for entry in entries:
+            fingerprint = entry_fingerprint(entry)
+            if fingerprint not in self.recent:
+                self._remember(fingerprint)
+                self.bloom.add(fingerprint)
+
+    def filter_entries(self, entries: list) -> list:
+        """
+        Return the entries not seen before, in order, and record them.
+
+        Args:
+            entries: Entries extracted from one page
+
+        Returns:
+            The new entries (duplicates within the page are dropped too)
+        """
+        fresh = []
+        for entry in entries:
+            self.seen += 1
+            fingerprint = entry_fingerprint(entry)
+            if fingerprint in self.recent:
+                self.recent.move_to_end(fingerprint)
+                self.dropped += 1
+                continue
+            if fingerprint in self.bloom:
+                self.bloom_hits += 1
+                self.dropped += 1
+                continue
+            self._remember(fingerprint)
+            self.bloom.add(fingerprint)
+            fresh.append(entry)
+        return fresh
+
+    @property
+    def rate(self) -> float:
+        """Fraction of entries seen that were dropped."""
+        return self.dropped / self.seen if self.seen else 0.0
+
+    def save(self) -> None:
+        """Persist the Bloom filter to state_file, if one was given."""
+        if self.state_file:
+            self.bloom.save(self.state_file)
+
+
+def page_fingerprint(entries: list) -> str:
+    """Return a hex fingerprint of a page's entries, in page order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in entries:
+        digest.update(entry_fingerprint(entry))
+    return digest.hexdigest()
+
+
+def page_structure(row_selector: Optional[str]) -> str:
+    """Describe a page's layout by the row selector that matched its entries."""
+    return row_selector or "div fallback"
+
+
+class PaginationMonitor:
+    """
+    Detects pages that repeat an earlier page or drift from its structure.
+
+    The first page with entries sets the expected structure. observe()
+    classifies every later page as "ok", "repeat" (same fingerprint as an
+    earlier page) or "drift" (different structure) and tells the crawl to
+    stop once PAGE_REPEAT_LIMIT repeats or PAGE_DRIFT_LIMIT drifted pages
+    occur in a row. Drifted pages keep their entries, so their fingerprints
+    are remembered like those of "ok" pages.
+    """
+
+    def __init__(self, repeat_limit: int = PAGE_REPEAT_LIMIT,
+                 drift_limit: int = PAGE_DRIFT_LIMIT):
+        self.repeat_limit = repeat_limit
+        self.drift_limit = drift_limit
+        self.fingerprints = {}  # fingerprint -> first page it was seen on
+        self.structure = None
+        self.consecutive_repeats = 0
+        self.consecutive_drifts = 0
+
+    def is_drift(self, structure: str) -> bool:
+        """True if a structure differs from the expected one."""
+        return self.structure is not None and structure != self.structure
+
+    def restore(self, record: dict) -> None:
+        """Replay one checkpoint journal record into the monitor's state."""
+        if record["status"] == "repeat":
+            self.consecutive_repeats += 1
+        elif record["status"] in ("ok", "drift"):
+            self.consecutive_repeats = 0
+            if record.get("fingerprint"):
+                self.fingerprints.setdefault(record["fingerprint"], record["page"])
+            if record["status"] == "drift":
+                self.consecutive_drifts += 1
+            else:
+                self.consecutive_drifts = 0
+                if record.get("structure") and self.structure is None:
+                    self.structure = record["structure"]
+
+    def observe(self, page_number: int, fingerprint: str, structure: str) -> str:
+        """
+        Classify a non-empty page and record it.
+
+        Args:
+            page_number: Page being processed
+            fingerprint: page_fingerprint() of its entries
+            structure: page_structure() of its entries
+
+        Returns:
+            "ok", "repeat" or "drift"
+        """
+        first_seen = self.fingerprints.get(fingerprint)
+        if first_seen is not None and first_seen != page_number:
+            self.consecutive_repeats += 1
+            print(f"[REPEAT] Page {page_number} has the same entries as page {first_seen}")
+            return "repeat"
+        self.consecutive_repeats = 0
+        self.fingerprints.setdefault(fingerprint, page_number)
+        if self.is_drift(structure):
+            self.consecutive_drifts += 1
+            print(f"[DRIFT] Page {page_number} structure '{structure}' "
+                  f"differs from '{self.structure}', keeping its entries")
+            return "drift"
+        self.consecutive_drifts = 0
+        self.structure = self.structure or structure
+        return "ok"
+
+    @property
+    def should_stop(self) -> bool:
+        """True once too many repeated or drifted pages came in a row."""
+        return (self.consecutive_repeats >= self.repeat_limit
+                or self.consecutive_drifts >= self.drift_limit)
+
+
+def count_ndjson_lines(filename: str) -> int:
+    """
+    Count entries in an NDJSON file without loading it.
+
+    Reads one line at a time without decoding it, so memory use is
+    constant regardless of file size. Blank lines are not entries and are
+    not counted (clean.py's NDJSONEntries skips them too); a final line
+    without a trailing newline is.
+
+    Args:
+        filename: Path to the NDJSON file
+
+    Returns:
+        Number of entry lines in the file
+    """
+    with open(filename, "rb") as f:
+        return sum(1 for line in f if not line.isspace())
+
+
+def iter_ndjson_entries(filename: str, end: Optional[int] = None):
+    """
+    Yield the entries of an NDJSON file one at a time.
+
+    Args:
+        filename: Path to the NDJSON file
+        end: Byte offset to stop at (None reads the whole file)
+
+    Yields:
+        Entry dictionaries, in file order
+    """
+    position = 0
+    with open(filename, "rb") as f:
+        for line in f:
+            if end is not None and position >= end:
+                break
+            position += len(line)
+            if line.strip():
+                yield json.loads(line)
+
+
+def _update_crawl_metrics(metrics: ScrapeMetrics, limiter: TokenBucket,
+                          session_baseline: tuple) -> None:
+    """Mirror session/limiter state into the metrics and emit if due."""
+    session = get_session()
+    metrics.set_counter("bytes_received", session.bytes_received - session_baseline[0])
+    metrics.set_counter("cache_hits", session.cache_hits - session_baseline[1])
+    metrics.set_gauge("rate_limit_rps", limiter.rate)
+    metrics.maybe_emit()
+
+
+def scrape_data(max_in_flight: int = MAX_IN_FLIGHT, resume: bool = True,
+                checkpoint_file: str = CHECKPOINT_FILE, since: Optional[str] = None,
+                sink: Optional[NDJSONWriter] = None,
+                archive: Optional[PageArchive] = None,
+                replay_dir: Optional[str] = None,
+                save_pages_dir: Optional[str] = None,
+                parse_workers: int = PARSE_WORKERS,
+                start_page: int = 1, end_page: Optional[int] = None,
+                dedup: Optional[EntryDeduplicator] = None) -> tuple:
     """
     Main scraping function that collects admission data from GradCafe.
 
@@ -278,10 +2252,79 @@ def scrape_data() -> tuple:
     1. STOP if a page returns zero valid entries (data exhausted)
     2. STOP if TARGET_ENTRIES is reached (always completes current page first)
     3. STOP if too many consecutive failures occur (network/server issues)
+    4. STOP after a page that reaches the ingestion watermark (incremental mode)
+    5. STOP after end_page (page-range mode)
+    6. STOP after PAGE_REPEAT_LIMIT pages in a row repeat an earlier page, or
+       PAGE_DRIFT_LIMIT pages in a row drift from the first page's structure
+
+    Repeated pages contribute no entries. A drifted page (row selector
+    unlike the first page's) is journaled as "drift" and counted in the
+    pages_drifted metric, but its entries are kept. On each drift the
+    selector plan is re-learned from that page first, in case the layout
+    really changed.
 
     No hardcoded page limits or numeric literals control the scrape.
     TARGET_ENTRIES is the single source of truth for the target count.
 
+    Every processed page is journaled to checkpoint_file. With resume=True
+    an existing journal is replayed first and the crawl continues from the
+    page after the last completed one instead of page 1.
+
+    Incremental mode (since is set): survey pages list the newest entries
+    first, so the crawl stops after the first page containing an entry
+    dated before the watermark day. Entries from before that day are
+    dropped. Entries from the watermark day itself are kept, because the
+    site only exposes day granularity; the loader's ON CONFLICT clause
+    discards the ones already stored.
+
+    Streaming mode (sink is set): each page's entries are appended to the
+    NDJSON sink instead of being kept in memory, and the returned list is
+    empty; sink.count holds the number of entries written. The journal
+    stores only per-page counts and output offsets, and a resumed crawl
+    cuts the output back to the last journaled page.
+
+    Archive mode (archive is set): each page's row markup is written once to
+    the PageArchive and entries carry page_hash/row_offset/row_length in
+    place of raw_html. The blob is written before the page is journaled.
+
+    Replay mode (replay_dir is set): pages are read from a directory of
+    saved HTML instead of the network; robots.txt and the rate limiter are
+    skipped. To replay over HTTP, point use_base_url() at a fixture server.
+
+    Parallel parsing (parse_workers > 0): each fetch thread hands its page to
+    a ProcessPoolExecutor as soon as it arrives, so parsing overlaps with
+    fetching and uses every core. Up to max_in_flight + parse_workers pages
+    are in the pipeline (still at most max_in_flight fetching), and results
+    are consumed in page order exactly as in the sequential path. A plan
+    re-learned on drift is sent with every later page, so the workers parse
+    with it too.
+
+    Page-range mode (start_page/end_page): only that slice of the survey is
+    crawled, so several crawlers (e.g. module_6 worker replicas handling
+    scrape_pages tasks) can split one scrape between them. Every entry keeps
+    its absolute source_page. Combine with share_rate_budget() so the
+    crawlers together stay within one host's rate budget.
+
+    Deduplication (dedup is set): entries whose fingerprint was already seen
+    (typically pushed onto the next page by new posts) are dropped before
+    they are journaled, archived or counted. Entries restored from the
+    journal (or, when streaming, read back from the sink up to the last
+    journaled offset) are recorded as seen first.
+
+    Args:
+        max_in_flight: Maximum number of pages fetched concurrently
+        resume: Continue from an existing checkpoint journal if present
+        checkpoint_file: Path of the page checkpoint journal
+        since: Ingestion watermark (YYYY-MM-DD...) enabling incremental mode
+        sink: NDJSONWriter to stream entries to instead of returning them
+        archive: PageArchive to move each entry's raw_html into
+        replay_dir: Directory of saved pages to replay offline
+        save_pages_dir: Directory to save every fetched page into for replay
+        parse_workers: Worker processes for HTML parsing (0 parses inline)
+        start_page: First page to crawl when not resuming from the journal
+        end_page: Last page to crawl (None crawls until a stop rule fires)
+        dedup: EntryDeduplicator dropping entries already seen
+
     Returns:
         Tuple of (entries_list, pages_scraped, target_reached_flag)
         - entries_list: List of all collected entry dictionaries
@@ -291,101 +2334,299 @@ def scrape_data() -> tuple:
     print(f"[START] Beginning scrape of GradCafe data")
     print(f"[TARGET] Collecting up to {TARGET_ENTRIES} entries")
 
-    # Check robots.txt compliance
-    if not check_robots_txt(RESULTS_URL):
+    metrics = get_metrics()
+    metrics.reset()
+    session_baseline = (get_session().bytes_received, get_session().cache_hits)
+
+    # Check robots.txt compliance (replayed pages never touch the site)
+    replay = ReplayDirectory(replay_dir) if replay_dir else None
+    if replay:
+        print(f"[REPLAY] Replaying {len(replay)} saved pages from {replay_dir}")
+    elif not check_robots_txt(RESULTS_URL):
         print("[ABORT] Scraping not allowed by robots.txt")
         return ([], 0, False)
+    if save_pages_dir:
+        os.makedirs(save_pages_dir, exist_ok=True)
 
     all_entries = []
-    current_page = 1
+    entries_collected = 0  # Equals len(all_entries) unless streaming to sink
+    current_page = max(1, start_page)
     pages_successfully_scraped = 0  # Track actual successful page scrapes
     consecutive_empty = 0
     max_consecutive_empty = 3  # Threshold for consecutive failures before stopping
     target_reached = False  # Flag to track if we hit the target vs ran out of pages
+    max_in_flight = max(1, max_in_flight)
+    watermark = parse_watermark(since)
+    if watermark:
+        print(f"[INCREMENTAL] Stopping at entries older than watermark {watermark.isoformat()}")
+    if end_page is not None:
+        print(f"[RANGE] Crawling pages {current_page}-{end_page}")
+
+    # Restore progress from the checkpoint journal
+    journal = PageJournal(checkpoint_file, before_sync=sink.sync if sink else None)
+    if not resume:
+        journal.remove()
+    sink_offset = 0
+    monitor = PaginationMonitor()
+    for record in journal.load():
+        monitor.restore(record)
+        if record["status"] in ("ok", "drift"):
+            all_entries.extend(record["entries"])
+            if dedup:
+                dedup.remember(record["entries"])
+            entries_collected += record.get("count", len(record["entries"]))
+            pages_successfully_scraped += 1
+            consecutive_empty = 0
+        elif record["status"] in ("empty", "failed"):
+            consecutive_empty += 1
+        sink_offset = record.get("offset", sink_offset)
+        current_page = record["page"] + 1
+    if sink:
+        # The journal keeps only counts for streamed pages, so the entries
+        # already written are read back to seed the deduplicator
+        if dedup and sink_offset and os.path.exists(sink.filename):
+            dedup.remember(iter_ndjson_entries(sink.filename, sink_offset))
+        sink.open(offset=sink_offset, count=entries_collected)
+    if current_page > max(1, start_page):
+        print(f"[RESUME] Restored {entries_collected} entries from {pages_successfully_scraped} "
+              f"pages in {checkpoint_file}; continuing at page {current_page}")
+
+    limiter = get_host_limiter(RESULTS_URL)
+    fetch = replay.fetch_page if replay else fetch_page
+    if replay:
+        print(f"[CONFIG] Reading up to {max_in_flight} pages at a time (no rate limit)")
+    elif isinstance(limiter, AdaptiveRateController):
+        print(f"[CONFIG] Fetching up to {max_in_flight} pages at a time "
+              f"(adaptive, starting at {limiter.rate:.2f} requests/sec per host, "
+              f"range {limiter.min_rate:.2f}-{limiter.max_rate:.2f})")
+    else:
+        print(f"[CONFIG] Fetching up to {max_in_flight} pages at a time "
+              f"({limiter.rate:.2f} requests/sec per host)")
 
     # ==========================================================================
     # MAIN SCRAPING LOOP
+    # Up to max_in_flight pages are fetched ahead by the thread pool, but pages
+    # are always processed strictly in page order. Pages that finish out of
+    # order simply wait in their future, so the stop rules below behave
+    # exactly as they would for a sequential crawl.
     # Loop continues until:
     #   - TARGET_ENTRIES is reached (checked AFTER completing each page), OR
     #   - A page returns zero entries (data source exhausted), OR
     #   - Too many consecutive failures occur
     # ==========================================================================
-    while True:
-        # ---------------------------------------------------------------------
-        # CHECK #1: Have we reached the target BEFORE starting a new page?
-        # If yes, stop. We don't start a page we don't need.
-        # ---------------------------------------------------------------------
-        if len(all_entries) >= TARGET_ENTRIES:
-            print(f"[TARGET REACHED] Collected {len(all_entries)} entries (target: {TARGET_ENTRIES})")
-            target_reached = True
-            break
-
-        # Construct page URL (no hardcoded page limits)
-        if current_page == 1:
-            page_url = RESULTS_URL
-        else:
-            page_url = f"{RESULTS_URL}?page={current_page}"
-
-        # Display progress using TARGET_ENTRIES dynamically
-        print(f"\n[PAGE {current_page}] Fetching: {page_url}")
-        print(f"[PROGRESS] {len(all_entries)}/{TARGET_ENTRIES} entries collected")
-
-        # Rate limiting with random jitter
-        delay = random.uniform(MIN_DELAY, MAX_DELAY)
-        time.sleep(delay)
-
-        # Fetch page content
-        html_content = make_request(page_url)
+    selector_plan = SelectorPlan()  # Learned on the first page, reused after
+    pending = {}  # page number -> Future[Optional[str]] (or [(html, entries)])
+    next_page_to_submit = current_page
+    window = max_in_flight + max(0, parse_workers)  # Pages read ahead
+    fetch_slots = threading.BoundedSemaphore(max_in_flight)
+    if parse_workers > 0:
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers, initializer=_init_parse_worker,
+                                         initargs=(HTML_PARSER,))
+        print(f"[CONFIG] Parsing pages in {parse_workers} worker processes")
+    else:
+        parse_pool = contextlib.nullcontext()
 
-        # ---------------------------------------------------------------------
-        # Handle fetch failures
-        # ---------------------------------------------------------------------
+    def fetch_and_parse(page_number: int) -> tuple:
+        """Fetch a page in this thread, then parse it in the process pool."""
+        with fetch_slots:
+            html_content = fetch(page_number)
         if html_content is None:
-            print(f"[ERROR] Failed to fetch page {current_page}")
-            consecutive_empty += 1
-            if consecutive_empty >= max_consecutive_empty:
-                print("[STOP] Too many consecutive failures, stopping scrape")
+            return None, None, None
+        parse_started = time.monotonic()
+        # The current plan is read at parse time, so a re-learn made while
+        # this page was being fetched reaches the worker too
+        page_entries, row_selector = parse_pool.submit(
+            parse_page_in_worker, html_content, selector_plan.spec).result()
+        metrics.observe("parse_seconds", time.monotonic() - parse_started)
+        return html_content, page_entries, row_selector
+
+    # The thread pool exits first: its workers may still wait on parse results
+    with parse_pool, ThreadPoolExecutor(max_workers=window) as pool:
+        while True:
+            # -----------------------------------------------------------------
+            # CHECK #1: Have we reached the target BEFORE starting a new page?
+            # If yes, stop. We don't start a page we don't need.
+            # -----------------------------------------------------------------
+            if entries_collected >= TARGET_ENTRIES:
+                print(f"[TARGET REACHED] Collected {entries_collected} entries (target: {TARGET_ENTRIES})")
+                target_reached = True
                 break
-            current_page += 1
-            continue
-
-        # Parse entries from page
-        page_entries = extract_entries_from_page(html_content)
-
-        # ---------------------------------------------------------------------
-        # CHECK #2: Did this page return zero entries?
-        # If yes after retries, the data source is exhausted - STOP.
-        # ---------------------------------------------------------------------
-        if not page_entries:
-            print(f"[WARNING] No entries found on page {current_page}")
-            consecutive_empty += 1
-            if consecutive_empty >= max_consecutive_empty:
-                print("[STOP] Too many consecutive empty pages - data source likely exhausted")
+            if end_page is not None and current_page > end_page:
+                print(f"[RANGE] Reached the end of page range {start_page}-{end_page}")
                 break
-            current_page += 1
-            continue
 
-        # Reset consecutive empty counter on successful extraction
-        consecutive_empty = 0
+            # Keep the fetch window full (never past the end of a page range)
+            while len(pending) < window and (end_page is None or next_page_to_submit <= end_page):
+                pending[next_page_to_submit] = pool.submit(
+                    fetch_and_parse if parse_workers > 0 else fetch, next_page_to_submit)
+                next_page_to_submit += 1
+
+            # Display progress using TARGET_ENTRIES dynamically
+            print(f"\n[PAGE {current_page}] Processing")
+            print(f"[PROGRESS] {entries_collected}/{TARGET_ENTRIES} entries collected")
+
+            # Wait for this page's content (later pages keep downloading)
+            wait_started = time.monotonic()
+            page_entries = None  # Set here only when parsed by a worker process
+            if parse_workers > 0:
+                html_content, page_entries, row_selector = pending.pop(current_page).result()
+            else:
+                html_content = pending.pop(current_page).result()
+            metrics.observe("fetch_wait_seconds", time.monotonic() - wait_started)
+            _update_crawl_metrics(metrics, limiter, session_baseline)
+
+            # -----------------------------------------------------------------
+            # Handle fetch failures
+            # -----------------------------------------------------------------
+            if html_content is None:
+                print(f"[ERROR] Failed to fetch page {current_page}")
+                journal.append(current_page, "failed", offset=sink.tell() if sink else None)
+                consecutive_empty += 1
+                if consecutive_empty >= max_consecutive_empty:
+                    print("[STOP] Too many consecutive failures, stopping scrape")
+                    break
+                current_page += 1
+                continue
+            if save_pages_dir:
+                save_page(save_pages_dir, current_page, html_content)
+
+            # Parse the page once; extraction steps share the document
+            if page_entries is None:
+                parse_started = time.monotonic()
+                document = parse_page(html_content)
+                page_entries = extract_entries_from_page(document, selector_plan)
+                row_selector = selector_plan.row_selector
+                metrics.observe("parse_seconds", time.monotonic() - parse_started)
+            metrics.observe("entries_per_page", len(page_entries))
+
+            # -----------------------------------------------------------------
+            # CHECK #2: Did this page return zero entries?
+            # If yes after retries, the data source is exhausted - STOP.
+            # -----------------------------------------------------------------
+            if not page_entries:
+                print(f"[WARNING] No entries found on page {current_page}")
+                metrics.inc("pages_empty")
+                journal.append(current_page, "empty", offset=sink.tell() if sink else None)
+                consecutive_empty += 1
+                if consecutive_empty >= max_consecutive_empty:
+                    print("[STOP] Too many consecutive empty pages - data source likely exhausted")
+                    break
+                current_page += 1
+                continue
+
+            # Reset consecutive empty counter on successful extraction
+            consecutive_empty = 0
+
+            # -----------------------------------------------------------------
+            # CHECK #3: Is this page a repeat of an earlier one, or laid out
+            # differently from the first page? Drift first triggers one
+            # re-learn of the selector plan from this page; a page that
+            # still drifts is recorded but keeps its entries.
+            # -----------------------------------------------------------------
+            structure = page_structure(row_selector)
+            if monitor.is_drift(structure):
+                print(f"[PLAN] Page {current_page} looks different, re-learning selector plan")
+                relearned_plan = SelectorPlan()
+                relearned_entries = extract_entries_from_page(parse_page(html_content),
+                                                              relearned_plan)
+                relearned_structure = page_structure(relearned_plan.row_selector)
+                if relearned_entries and not monitor.is_drift(relearned_structure):
+                    selector_plan = relearned_plan
+                    page_entries, structure = relearned_entries, relearned_structure
+            fingerprint = page_fingerprint(page_entries)
+            verdict = monitor.observe(current_page, fingerprint, structure)
+            if verdict == "repeat":
+                metrics.inc("pages_repeated")
+                journal.append(current_page, verdict, offset=sink.tell() if sink else None)
+                if monitor.should_stop:
+                    print(f"[STOP] {monitor.repeat_limit} pages in a row repeated earlier "
+                          f"pages - pagination is stale or the site is blocking us")
+                    break
+                current_page += 1
+                continue
+            if verdict == "drift":
+                metrics.inc("pages_drifted")
+
+            # -----------------------------------------------------------------
+            # CHECK #4: Incremental mode - drop entries older than the
+            # watermark; reaching one means everything after it is known.
+            # -----------------------------------------------------------------
+            reached_watermark = False
+            if watermark:
+                fresh_entries = []
+                for entry in page_entries:
+                    entry_date = parse_entry_date(entry.get("date_added"))
+                    if entry_date and entry_date < watermark:
+                        reached_watermark = True
+                    else:
+                        fresh_entries.append(entry)
+                page_entries = fresh_entries
+
+            # Drop entries already seen on an earlier page (or run)
+            duplicates = 0
+            if dedup:
+                unique_entries = dedup.filter_entries(page_entries)
+                duplicates = len(page_entries) - len(unique_entries)
+                page_entries = unique_entries
+                metrics.inc("entries_duplicate", duplicates)
+
+            # Add page number to each entry for reference
+            for entry in page_entries:
+                entry["source_page"] = current_page
+            if archive:
+                archive.archive_entries(page_entries)
+            if sink:
+                offset = sink.write_entries(page_entries)
+                journal.append(current_page, verdict, count=len(page_entries), offset=offset,
+                               fingerprint=fingerprint, structure=structure)
+            else:
+                journal.append(current_page, verdict, page_entries,
+                               fingerprint=fingerprint, structure=structure)
+
+            # -----------------------------------------------------------------
+            # ALWAYS complete the current page before checking target
+            # This ensures we don't lose partial page data
+            # -----------------------------------------------------------------
+            if not sink:
+                all_entries.extend(page_entries)
+            entries_collected += len(page_entries)
+            pages_successfully_scraped += 1  # Increment only on successful extraction
+            metrics.inc("entries", len(page_entries))
+            print(f"[SUCCESS] Extracted {len(page_entries)} entries from page {current_page}"
+                  + (f" ({duplicates} duplicates dropped)" if duplicates else ""))
+            print(f"[TOTAL] {entries_collected} entries collected so far")
+
+            if reached_watermark:
+                print(f"[WATERMARK] Page {current_page} reached entries older than "
+                      f"{watermark.isoformat()} - incremental scrape complete")
+                break
+            if verdict == "drift" and monitor.should_stop:
+                print(f"[STOP] {monitor.drift_limit} pages in a row changed structure "
+                      f"- the layout changed or the site is blocking us")
+                break
 
-        # Add page number to each entry for reference
-        for entry in page_entries:
-            entry["source_page"] = current_page
+            # Move to next page (no hardcoded page cap)
+            current_page += 1
 
-        # ---------------------------------------------------------------------
-        # ALWAYS complete the current page before checking target
-        # This ensures we don't lose partial page data
-        # ---------------------------------------------------------------------
-        all_entries.extend(page_entries)
-        pages_successfully_scraped += 1  # Increment only on successful extraction
-        print(f"[SUCCESS] Extracted {len(page_entries)} entries from page {current_page}")
-        print(f"[TOTAL] {len(all_entries)} entries collected so far")
+        # Drop read-ahead pages that have not started; running fetches finish
+        for future in pending.values():
+            future.cancel()
 
-        # Move to next page (no hardcoded page cap)
-        current_page += 1
+    journal.close()
+    if sink:
+        sink.close()
 
     # Final summary
-    print(f"\n[COMPLETE] Scraped {len(all_entries)} total entries from {pages_successfully_scraped} pages")
+    print(f"\n[COMPLETE] Scraped {entries_collected} total entries from {pages_successfully_scraped} pages")
+    if isinstance(limiter, AdaptiveRateController) and not replay:
+        print(f"[RATE] Final crawl rate {limiter.rate:.2f} requests/sec")
+    _update_crawl_metrics(metrics, limiter, session_baseline)
+    if dedup:
+        print(f"[DEDUP] Dropped {dedup.dropped} of {dedup.seen} entries as duplicates "
+              f"({dedup.rate:.1%}; {dedup.bloom_hits} via the Bloom filter)")
+    if archive:
+        print(f"[ARCHIVE] {archive.pages_written} page blobs written "
+              f"({archive.bytes_written} bytes), {archive.pages_reused} already archived")
     return (all_entries, pages_successfully_scraped, target_reached)
 
 
@@ -414,17 +2655,23 @@ def verify_data_integrity(memory_count: int, filename: str = OUTPUT_FILE) -> boo
     """
     Verify that the saved JSON file contains the expected number of entries.
 
+    NDJSON files (.jsonl/.ndjson) are verified by counting lines, without
+    deserializing the file.
+
     Args:
         memory_count: Number of entries in memory before save
-        filename: Path to the saved JSON file
+        filename: Path to the saved JSON or NDJSON file
 
     Returns:
         True if counts match, False otherwise
     """
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            disk_data = json.load(f)
-        disk_count = len(disk_data)
+        if filename.endswith(NDJSON_EXTENSIONS):
+            disk_count = count_ndjson_lines(filename)
+        else:
+            with open(filename, "r", encoding="utf-8") as f:
+                disk_data = json.load(f)
+            disk_count = len(disk_data)
 
         if disk_count != memory_count:
             print(f"[ERROR] Entry count mismatch between memory and output file.")
@@ -436,26 +2683,113 @@ def verify_data_integrity(memory_count: int, filename: str = OUTPUT_FILE) -> boo
         return False
 
 
-def main():
+def main(argv: Optional[list] = None):
     """Main entry point for the scraper."""
+    global HTML_PARSER, ADAPTIVE_RATE
+
+    parser = argparse.ArgumentParser(description="GradCafe admissions data scraper")
+    parser.add_argument("--in-flight", type=int, default=MAX_IN_FLIGHT,
+                        help=f"pages fetched concurrently (default {MAX_IN_FLIGHT})")
+    parser.add_argument("--fresh", action="store_true",
+                        help=f"ignore {CHECKPOINT_FILE} and start again from page 1")
+    parser.add_argument("--parser", choices=HTML_PARSERS,
+                        help=f"HTML parser backend (default: {HTML_PARSER}; "
+                             f"set SCRAPE_HTML_PARSER to change it)")
+    parser.add_argument("--since", metavar="YYYY-MM-DD",
+                        help="incremental mode: stop at entries older than this watermark")
+    parser.add_argument("--ndjson", action="store_true",
+                        help=f"stream entries page by page to {NDJSON_OUTPUT_FILE}")
+    parser.add_argument("--fixed-rate", action="store_true",
+                        help=f"disable adaptive rate control and crawl at "
+                             f"{REQUESTS_PER_SECOND:.2f} requests/sec")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"disable the conditional-GET page cache in {HTTP_CACHE_DIR}/ "
+                             "(on by default)")
+    parser.add_argument("--inline-html", action="store_true",
+                        help=f"keep raw_html on each entry instead of archiving "
+                             f"page markup in {PAGE_ARCHIVE_DIR}/")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help=f"worker processes for HTML parsing (default {PARSE_WORKERS}: "
+                             f"parse in the main process; try {os.cpu_count()})")
+    parser.add_argument("--replay", metavar="DIR",
+                        help="replay saved pages from DIR instead of fetching (offline)")
+    parser.add_argument("--save-pages", metavar="DIR",
+                        help="save every fetched page to DIR for later --replay")
+    parser.add_argument("--base-url", metavar="URL",
+                        help=f"crawl another host, e.g. a local fixture server (default {BASE_URL})")
+    parser.add_argument("--metrics", choices=("stdout", "prom", "both"),
+                        help=f"emit metrics as JSON lines on stdout and/or to {METRICS_PROM_FILE}")
+    parser.add_argument("--start-page", type=int, default=1,
+                        help="first page of the range to crawl (default 1)")
+    parser.add_argument("--end-page", type=int,
+                        help="last page of the range to crawl (default: until a stop rule fires)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="drop entries repeated across pages (identified by their "
+                             "result page URL, or their text when a row has none)")
+    parser.add_argument("--dedup-state", metavar="FILE",
+                        help="load/save the dedup Bloom filter in FILE, so entries saved "
+                             "by earlier runs are dropped too (implies --dedup)")
+    parser.add_argument("--rate-share", type=int, default=RATE_SHARE,
+                        help="number of crawlers splitting the per-host rate budget "
+                             f"(default {RATE_SHARE})")
+    args = parser.parse_args(argv)
+
+    if args.parser:
+        HTML_PARSER = select_html_parser(args.parser)
+    if args.base_url:
+        use_base_url(args.base_url)
+    if not args.no_cache:
+        get_session().cache = HTTPCache(HTTP_CACHE_DIR)
+    if args.fixed_rate:
+        ADAPTIVE_RATE = False
+    share_rate_budget(args.rate_share)
+    if args.metrics in ("stdout", "both"):
+        get_metrics().add_sink(JSONLinesMetricsSink())
+    if args.metrics in ("prom", "both"):
+        get_metrics().add_sink(PrometheusTextfileSink(METRICS_PROM_FILE))
+
     print("=" * 60)
     print("GradCafe Admissions Data Scraper")
     print("Module 2 - Johns Hopkins EN.605.256.82.SP26")
     print("=" * 60)
     # Startup configuration logging - uses TARGET_ENTRIES dynamically
     print(f"[CONFIG] Target entries: {TARGET_ENTRIES}")
+    print(f"[CONFIG] HTML parser: {HTML_PARSER}")
+    print(f"[CONFIG] Raw HTML: {'inline' if args.inline_html else PAGE_ARCHIVE_DIR + '/'}")
+    if get_session().cache is not None:
+        print(f"[CONFIG] HTTP cache: {HTTP_CACHE_DIR}/ ({len(get_session().cache)} pages cached)")
     print("=" * 60)
 
     # Run the scraper (uses TARGET_ENTRIES as single source of truth)
     # Returns: (entries_list, pages_scraped, target_reached_flag)
-    entries, pages_scraped, target_reached = scrape_data()
-
-    if entries:
-        # Save to JSON
-        save_data(entries)
+    sink = NDJSONWriter(NDJSON_OUTPUT_FILE) if args.ndjson else None
+    archive = None if args.inline_html else PageArchive(PAGE_ARCHIVE_DIR)
+    dedup = EntryDeduplicator(args.dedup_state) if args.dedup or args.dedup_state else None
+    entries, pages_scraped, target_reached = scrape_data(
+        args.in_flight, resume=not args.fresh, since=args.since, sink=sink, archive=archive,
+        replay_dir=args.replay, save_pages_dir=args.save_pages,
+        parse_workers=args.parse_workers, start_page=args.start_page, end_page=args.end_page,
+        dedup=dedup)
+    output_file = sink.filename if sink else OUTPUT_FILE
+    entry_count = sink.count if sink else len(entries)
+    if get_session().cache is not None:
+        print(f"[CACHE] {get_session().cache_hits} pages served from {HTTP_CACHE_DIR}/ (HTTP 304)")
+    run_summary = get_metrics().publish_summary(METRICS_SUMMARY_FILE)
+    print(f"[METRICS] {run_summary['pages_per_second']:.2f} pages/sec, "
+          f"bottleneck: {run_summary['bottleneck']} (summary in {METRICS_SUMMARY_FILE})")
+
+    if entry_count:
+        # Save to JSON (streamed entries are already on disk)
+        saved = True if sink else save_data(entries)
 
         # Verify data integrity: re-open file and compare counts
-        verify_data_integrity(len(entries), OUTPUT_FILE)
+        # The checkpoint journal is only discarded once the output is safe.
+        # The dedup state is saved only then too, or unsaved entries would be
+        # dropped as duplicates by the next run
+        if saved and verify_data_integrity(entry_count, output_file):
+            PageJournal(CHECKPOINT_FILE).remove()
+            if dedup:
+                dedup.save()
 
         # Early termination warning (only if target was NOT reached)
         if not target_reached:
@@ -465,9 +2799,9 @@ def main():
         print("\n" + "=" * 41)
         print("SCRAPING SUMMARY")
         print(f"Target entries: {TARGET_ENTRIES}")
-        print(f"Total entries collected: {len(entries)}")
+        print(f"Total entries collected: {entry_count}")
         print(f"Total pages scraped: {pages_scraped}")
-        print(f"Output file: {OUTPUT_FILE}")
+        print(f"Output file: {output_file}")
         print("=" * 41)
     else:
         print("[FINISHED] No entries were collected")
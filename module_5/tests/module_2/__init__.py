@@ -0,0 +1 @@
+# module_5/tests/module_2 package
@@ -0,0 +1,16 @@
+"""
+conftest.py — fixtures for the module_2 pipeline tests.
+
+The scraper and cleaner tests work on files under ``tmp_path`` and never
+open a database connection, so the session-wide schema setup from the
+parent ``tests/conftest.py`` is replaced here by a fixture that does
+nothing.  The tests in this directory therefore run without Postgres.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema_setup():
+    """No test schema: these tests never touch the database."""
+    yield
@@ -0,0 +1,612 @@
+"""
+test_clean.py
+
+Unit tests for the module_2 cleaner (``src/module_2/clean.py``), the
+columnar format module it writes with (``src/columnar.py``) and the
+loader's columnar input (``src/load_data.py``).
+
+Verifies:
+- Columnar (GCOL) output round-trips through the shared reader and the loader
+- Page archive round trip and damaged blobs (PageArchiveReader)
+- School matching in row markup (SchoolMatcher)
+- Streaming JSON array input (JSONArrayEntries) at any read-chunk size
+- Lazy NDJSON input (NDJSONEntries, load_data), blank lines included
+- CanonicalRecord.to_dict() against the previous dict output
+- The interned field cache (_clean_field) against uncached cleaning
+- Cleaning in a worker pool matches serial cleaning
+- Streaming clean output matches clean_data plus save_data
+- Output validation, including NDJSON split into shards
+- The incremental re-clean cache (CleanCache)
+
+All tests are marked ``unit``.
+"""
+
+import gzip
+import importlib.util
+import json
+import os
+import re
+import sys
+
+import pytest
+
+from src import columnar, load_data
+
+
+def _load_module_2(name, directory=""):
+    """Import a module_2 script by path (they are scripts, not a package)."""
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "src", "module_2", directory,
+                        f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"module2_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # Lets worker processes unpickle its functions
+    spec.loader.exec_module(module)
+    return module
+
+
+clean = _load_module_2("clean")
+scrape = _load_module_2("scrape")
+fixture_server = _load_module_2("fixture_server", "benchmarks")
+
+
+# ---------------------------------------------------------------------------
+# Columnar output
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+def test_gcol_round_trip_through_shared_reader(tmp_path):
+    """save_columnar output reads back through columnar.read_columnar."""
+    entries = [
+        clean.CanonicalRecord(school="MIT", program="Computer Science", decision="Accepted"),
+        clean.CanonicalRecord(school="CMU", program="Computer Science", decision="Rejected"),
+    ]
+    path = str(tmp_path / "out.gcol")
+    assert clean.save_columnar(entries, path)
+
+    data = columnar.read_columnar(path)
+    assert list(data) == list(clean.CANONICAL_SCHEMA)
+    assert data["school"] == ["MIT", "CMU"]
+    assert clean.read_columnar(path, ["decision"]) == {"decision": ["Accepted", "Rejected"]}
+
+
+@pytest.mark.unit
+def test_gcol_missing_columns_raise_or_are_skipped(tmp_path):
+    """Unknown columns raise KeyError unless skip_missing is set."""
+    path = str(tmp_path / "out.gcol")
+    columnar.write_gcol({"a": ["x", "y", "x"]}, 3, path)
+
+    with pytest.raises(KeyError):
+        columnar.read_columnar(path, ["a", "b"])
+    assert columnar.read_columnar(path, ["a", "b"], skip_missing=True) == {"a": ["x", "y", "x"]}
+
+
+
+@pytest.mark.unit
+def test_loader_reads_only_its_columns_from_gcol(tmp_path):
+    """load_data.read_input() decodes a GCOL file written by clean.save_columnar."""
+    entries = [
+        clean.CanonicalRecord(school="MIT", program="Computer Science",
+                              decision="Accepted", gpa="3.9", notes="MIT | Fall 2026"),
+        clean.CanonicalRecord(school="MIT", program="Computer Science",
+                              decision="Rejected", notes="naïve | “quoted”"),
+    ]
+    gcol_file = tmp_path / "applicant_data.gcol"
+    assert clean.save_columnar(entries, str(gcol_file))
+
+    rows = load_data.read_input(str(gcol_file))
+
+    assert [row["decision"] for row in rows] == ["Accepted", "Rejected"]
+    assert rows[1]["notes"] == "naïve | “quoted”"
+    # Only columns the loader uses are read
+    assert "school" not in rows[0] and "gre" not in rows[0]
+    assert rows[0].get("school") is None and "notes" in rows[0]
+    params = load_data._build_row_params(rows[0])
+    assert params["gpa"] == 3.9
+    # clean.py writes no LLM columns, so they load as NULL
+    assert params["llm_generated_program"] is None
+    assert params["llm_generated_university"] is None
+
+
+@pytest.mark.unit
+def test_loader_reads_json_and_rejects_bad_columnar_files(tmp_path):
+    """read_input() still reads JSON; bad or partial columnar files raise."""
+    rows = [{"program": "CS", "decision": "Accepted", "notes": "Fall 2026"}]
+    json_file = tmp_path / "rows.json"
+    json_file.write_text(json.dumps(rows))
+    assert load_data.read_input(str(json_file)) == rows
+    # CanonicalRecords from clean.py are loaded through the same row.get()
+    record = clean.CanonicalRecord(program="CS", decision="Accepted")
+    assert load_data._build_row_params(record)["status"] == "Accepted"
+
+    bad_file = tmp_path / "rows.gcol"
+    bad_file.write_bytes(b"not columnar")
+    with pytest.raises(ValueError):
+        load_data.read_input(str(bad_file))
+
+    # A columnar file without the loader's columns is rejected, not half-loaded
+    partial_file = tmp_path / "partial.gcol"
+    columnar.write_gcol({"program": ["CS"], "decision": ["Accepted"]}, 1, str(partial_file))
+    with pytest.raises(KeyError):
+        load_data.read_input(str(partial_file))
+
+# ---------------------------------------------------------------------------
+# Page archive input
+# ---------------------------------------------------------------------------
+
+def _archived_entries(directory):
+    """Archive two rows of one page with scrape.PageArchive; return (entries, rows, hash)."""
+    rows = ['<tr><td class="institution">MIT</td><td>Accepted</td></tr>',
+            '<tr><td class="institution">Carnegie Mellon University</td><td>Rejected</td></tr>']
+    entries = [{"raw_html": row} for row in rows]
+    page_hash = scrape.PageArchive(directory).archive_entries(entries)
+    return entries, rows, page_hash
+
+
+@pytest.mark.unit
+def test_page_archive_round_trip(tmp_path):
+    """Rows written by scrape.PageArchive read back from one decompressed page."""
+    directory = str(tmp_path / "archive")
+    entries, rows, _ = _archived_entries(directory)
+    # The same page archived again (e.g. after a resume) points at the same blob
+    repeated, _, _ = _archived_entries(directory)
+    assert repeated == entries
+
+    reader = clean.PageArchiveReader(directory)
+    assert [reader.row_html(entry) for entry in entries + repeated] == rows + rows
+    assert reader.pages_loaded == 1
+    assert reader.row_html({"raw_html": "<tr>inline</tr>", "page_hash": "ff"}) == "<tr>inline</tr>"
+    assert reader.row_html({"institution": "MIT"}) == ""
+
+    cleaned = clean.clean_data([{"decision": "Accepted", **entries[1]}], archive_dir=directory)
+    assert cleaned[0]["school"] == "Carnegie Mellon University"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("damage", ["truncated", "corrupt", "replaced"])
+def test_page_archive_reader_skips_damaged_blob(tmp_path, capsys, damage):
+    """A truncated, corrupt or swapped blob yields no markup and a warning."""
+    directory = str(tmp_path / "archive")
+    entries, _, page_hash = _archived_entries(directory)
+    path = os.path.join(directory, page_hash[:2], f"{page_hash}.html.gz")
+    with open(path, "rb") as f:
+        blob = f.read()
+    if damage == "truncated":
+        blob = blob[:len(blob) // 2]
+    elif damage == "corrupt":
+        blob = blob[:12] + bytes(byte ^ 0xFF for byte in blob[12:-8]) + blob[-8:]
+    else:
+        blob = gzip.compress(b"<tr><td>another page</td></tr>")
+    with open(path, "wb") as f:
+        f.write(blob)
+
+    reader = clean.PageArchiveReader(directory)
+    assert [reader.row_html(entry) for entry in entries] == ["", ""]
+    assert f"Archived page {page_hash} unreadable" in capsys.readouterr().out
+    assert reader.pages_loaded == 0
+
+
+# ---------------------------------------------------------------------------
+# School matching
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text, school", [
+    ("UW-Madison", "University of Wisconsin–Madison"),
+    ("UW Madison", "University of Wisconsin–Madison"),
+    ("Accepted to UW–Madison, PhD", "University of Wisconsin–Madison"),
+    ("UW Seattle", "University of Washington"),
+    ("University of Washington", "University of Washington"),
+    ("Texas A&amp;M University", "Texas A&M University"),
+    ("Texas A&M University", "Texas A&M University"),
+    ("University of Wisconsin-Madison", "University of Wisconsin–Madison"),
+])
+def test_school_matcher_resolves_canonical_names(text, school):
+    """Aliases, dash variants and HTML entities resolve to the listed name."""
+    assert clean._school_matcher().find(text) == school
+
+
+@pytest.mark.unit
+def test_school_matcher_skips_ambiguous_and_lowercase_abbreviations():
+    """A bare "UW" names no school; all-caps aliases only match in capitals."""
+    matcher = clean._school_matcher()
+    assert matcher.find("UW") == ""
+    assert matcher.find("MIT") == "Massachusetts Institute of Technology"
+    assert matcher.find("mit") == ""
+
+
+@pytest.mark.unit
+def test_school_matcher_prefers_leftmost_then_longest():
+    """The first school mentioned wins, and the longest name starting there."""
+    matcher = clean.SchoolMatcher(
+        ["University of California", "University of California, Berkeley", "Yale University"])
+    assert matcher.find("University of California, Berkeley") == \
+        "University of California, Berkeley"
+    assert matcher.find("Yale University, then University of California") == "Yale University"
+    assert matcher.find("no school here") == ""
+
+
+@pytest.mark.unit
+def test_raw_html_extraction_decodes_school_entities():
+    """Row markup with escaped names yields the canonical school."""
+    extracted = clean._extract_from_raw_html(
+        '<tr><td>Texas A&amp;M University</td><td>Accepted</td></tr>')
+    assert extracted["school"] == "Texas A&M University"
+
+
+# ---------------------------------------------------------------------------
+# Streaming JSON input
+# ---------------------------------------------------------------------------
+
+_STREAM_VALUES = [
+    {"school": "MIT", "gpa": 3.95, "notes": "a \"quoted\" [bracket]"},
+    1.5e-3, -12.25, 0, 1E+10, 7, "tail, with comma", [1, [2.5, {"x": -0.5}]],
+    True, None, -3.0e2,
+]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 7, 11, 64])
+def test_json_array_entries_survive_any_chunk_boundary(tmp_path, chunk_size):
+    """Values split anywhere between reads, numbers included, decode whole."""
+    path = tmp_path / "in.json"
+    for indent in (None, 2):
+        path.write_text(json.dumps(_STREAM_VALUES, indent=indent))
+        assert list(clean.JSONArrayEntries(str(path), chunk_size)) == _STREAM_VALUES
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text", ["[1, 2,]", "[1 2]", "[1, 2", "{\"a\": 1}", "[1.]"])
+def test_json_array_entries_reject_malformed_arrays(tmp_path, text):
+    """Malformed arrays raise ValueError instead of yielding partial data."""
+    path = tmp_path / "in.json"
+    path.write_text(text)
+    for chunk_size in (1, 3, 64):
+        with pytest.raises(ValueError):
+            list(clean.JSONArrayEntries(str(path), chunk_size))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("trailing_newline", [True, False])
+def test_ndjson_entries_skip_blank_lines(tmp_path, trailing_newline):
+    """len() and iteration agree, with or without a final newline."""
+    path = tmp_path / "in.jsonl"
+    text = '{"school": "MIT"}\n\n   \n{"school": "CMU"}\n{"school": "Yale"}'
+    path.write_text(text + ("\n" if trailing_newline else ""))
+    entries = clean.NDJSONEntries(str(path))
+    assert len(entries) == 3
+    assert [entry["school"] for entry in entries] == ["MIT", "CMU", "Yale"]
+
+
+@pytest.mark.unit
+def test_ndjson_entries_decode_lazily(tmp_path, capsys):
+    """Lines are decoded only as iteration reaches them; the view is re-iterable."""
+    path = tmp_path / "in.jsonl"
+    path.write_text('{"school": "MIT"}\nnot json\n{"school": "CMU"}\n')
+    entries = clean.NDJSONEntries(str(path))
+    assert len(entries) == 3  # Counted without decoding, the bad line included
+    assert capsys.readouterr().out == ""
+
+    iterator = iter(entries)
+    assert next(iterator) == {"school": "MIT"}
+    assert "invalid JSON" not in capsys.readouterr().out  # Line 2 not read yet
+    assert next(iterator) == {"school": "CMU"}
+    assert f"{path}:2 invalid JSON" in capsys.readouterr().out
+    assert list(entries) == [{"school": "MIT"}, {"school": "CMU"}]
+
+
+@pytest.mark.unit
+def test_load_data_streams_ndjson_input(tmp_path):
+    """load_data returns a lazy view for .jsonl files that cleans like a list."""
+    raw = [{"institution": "MIT", "program": "CS", "decision": "Accepted"},
+           {"institution": "CMU", "program": "Statistics", "decision": "Rejected"}]
+    path = tmp_path / "raw.jsonl"
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in raw))
+
+    entries = clean.load_data(str(path))
+    assert isinstance(entries, clean.NDJSONEntries) and len(entries) == 2
+    assert clean.clean_data(entries) == clean.clean_data(raw)
+    assert clean.load_data(str(tmp_path / "missing.jsonl")) == []
+
+
+# ---------------------------------------------------------------------------
+# Canonical records
+# ---------------------------------------------------------------------------
+
+def _dict_map_entry(entry, archive=None):
+    """The dict-building _map_entry_to_schema that CanonicalRecord replaced."""
+    cleaned = dict.fromkeys(clean.CANONICAL_SCHEMA, "")
+    for field, sources in clean.FIELD_SOURCES:
+        for key in sources:
+            value = entry.get(key)
+            if value:
+                cleaned[field] = clean._clean_text(value)
+                break
+    notes_parts = [clean._clean_text(entry[key]) for key in clean.NOTES_SOURCES
+                   if entry.get(key) and clean._clean_text(entry[key])]
+    if notes_parts:
+        notes = " | ".join(notes_parts)
+        if len(notes) > clean.NOTES_MAX_LENGTH:
+            notes = notes[:clean.NOTES_MAX_LENGTH] + "..."
+        cleaned["notes"] = notes
+    if entry.get("raw_html") or (archive is not None and entry.get("page_hash")):
+        if not cleaned["school"] or not cleaned["program"] or not cleaned["decision"]:
+            raw_html = archive.row_html(entry) if archive is not None else entry["raw_html"]
+            extracted = clean._extract_from_raw_html(raw_html)
+            for key in clean.CANONICAL_SCHEMA:
+                if not cleaned[key] and extracted.get(key):
+                    cleaned[key] = extracted[key]
+    return cleaned
+
+
+@pytest.mark.unit
+def test_record_to_dict_matches_previous_dict_output(tmp_path):
+    """to_dict() equals the old dict mapping, key order included, and saves the same JSON."""
+    entries, archive_dir = _fixture_corpus(tmp_path, pages=2)
+    entries += [{}, {"institution": None, "program": "", "decision": 0},
+                {"comments": "x" * (clean.NOTES_MAX_LENGTH + 10), "notes": "<i>also</i>"}]
+    archive = clean.PageArchiveReader(archive_dir)
+    expected = [_dict_map_entry(entry, archive) for entry in entries]
+    records = clean.clean_batch(entries, archive)
+
+    assert [list(record.to_dict().items()) for record in records] == \
+        [list(old.items()) for old in expected]
+    assert expected[-3] == dict.fromkeys(clean.CANONICAL_SCHEMA, "")
+    path = tmp_path / "applicant_data.json"
+    assert clean.save_data(records, str(path))
+    assert path.read_text(encoding="utf-8") == json.dumps(expected, indent=2, ensure_ascii=False)
+
+
+@pytest.mark.unit
+def test_record_from_dict_round_trips_none_and_missing_fields():
+    """None values survive as None; keys missing from the dict become ""."""
+    old = {"school": "MIT", "program": None, "decision": "Accepted", "decision_date": None,
+           "gpa": "", "gre": "", "notes": None}
+    record = clean.CanonicalRecord.from_dict(old)
+    assert list(record.to_dict().items()) == list(old.items())
+    assert json.dumps(record, default=clean._record_to_json) == json.dumps(old)
+
+    partial = clean.CanonicalRecord.from_dict({"notes": "n/a", "extra": "dropped"})
+    assert list(partial.to_dict()) == list(clean.CANONICAL_SCHEMA)
+    assert partial.to_dict() == dict(dict.fromkeys(clean.CANONICAL_SCHEMA, ""), notes="n/a")
+
+
+# ---------------------------------------------------------------------------
+# Field cache
+# ---------------------------------------------------------------------------
+
+_FIELD_VALUES = ["Stanford University", "  Computer   Science\n", "Texas A&amp;M",
+                 "<b>Accepted</b> on 5 Jan", "Caf\u00e9 &eacute;t\u00e9", "", "<br/>", "a&b <c"]
+
+
+@pytest.mark.unit
+def test_clean_field_matches_uncached_clean_text():
+    """Cached, interned values equal _clean_text output, first call and repeats."""
+    clean._clean_field.cache_clear()
+    for value in _FIELD_VALUES:
+        expected = clean._clean_text(value)
+        first = clean._clean_field(value)
+        assert first == expected == clean._clean_field.__wrapped__(value)
+        assert clean._clean_field(value) is first is sys.intern(first)
+    info = clean._clean_field.cache_info()
+    assert (info.hits, info.misses) == (len(_FIELD_VALUES), len(_FIELD_VALUES))
+
+
+@pytest.mark.unit
+def test_cleaning_with_and_without_field_cache_agree(tmp_path, monkeypatch):
+    """Records cleaned through _clean_field equal those from plain _clean_text."""
+    entries, archive_dir = _fixture_corpus(tmp_path, pages=2)
+    entries.append({"institution": ["MIT", "<b>CMU</b>"], "program": 42})  # Not cacheable
+    archive = clean.PageArchiveReader(archive_dir)
+    cached = clean.clean_batch(entries, archive)
+
+    monkeypatch.setattr(clean, "_clean_field", clean._clean_text)
+    assert clean.clean_batch(entries, archive) == cached
+    assert cached[-1]["school"] == clean._clean_text(["MIT", "<b>CMU</b>"])
+    assert cached[-1]["program"] == "42"
+
+
+@pytest.mark.unit
+def test_records_share_cached_strings_but_not_state():
+    """Interned values are shared objects; changing one record leaves the others alone."""
+    raw = {"institution": "Stanford University", "program": "Computer Science",
+           "decision": "Accepted"}
+    first, second = clean.clean_batch([dict(raw), dict(raw)])
+    assert first.school is second.school  # One interned string object
+
+    second.school = "MIT"
+    as_dict = first.to_dict()
+    as_dict["program"] = "changed"
+    assert first.school == "Stanford University" and first.program == "Computer Science"
+    assert first.to_dict() is not first.to_dict()
+    assert clean._clean_field("Stanford University") == "Stanford University"
+
+
+# ---------------------------------------------------------------------------
+# Parallel cleaning
+# ---------------------------------------------------------------------------
+
+def _fixture_corpus(tmp_path, pages=4):
+    """Scrape fixture_server pages into raw entries, row markup archived."""
+    pages_dir = tmp_path / "pages"
+    fixture_server.save_pages(str(pages_dir), pages)
+    archive_dir = str(tmp_path / "archive")
+    entries, _, _ = scrape.scrape_data(
+        2, resume=False, checkpoint_file=str(tmp_path / "checkpoint.jsonl"),
+        replay_dir=str(pages_dir), archive=scrape.PageArchive(archive_dir))
+    for entry in entries[::7]:
+        del entry["institution"]  # Recovered from the archived row markup
+    return entries, archive_dir
+
+
+@pytest.mark.unit
+def test_clean_data_worker_pool_matches_serial_cleaning(tmp_path, monkeypatch):
+    """workers=3 yields the same records, in the same order, as workers=0."""
+    entries, archive_dir = _fixture_corpus(tmp_path)
+    entries.insert(5, "not a dict")
+    monkeypatch.setattr(clean, "CLEAN_BATCH_SIZE", 7)  # Many batches, uneven last one
+
+    serial = clean.clean_data(entries, archive_dir=archive_dir, workers=0)
+    pooled = clean.clean_data(entries, archive_dir=archive_dir, workers=3)
+    assert len(serial) == len(entries) - 1
+    assert [record.to_dict() for record in pooled] == [record.to_dict() for record in serial]
+    assert all(serial[i]["school"] for i in range(0, len(serial), 7))
+
+
+# ---------------------------------------------------------------------------
+# Streaming clean
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+@pytest.mark.parametrize("input_name, workers", [("raw.json", 0), ("raw.jsonl", 0),
+                                                  ("raw.json", 2)])
+def test_clean_file_streaming_matches_clean_and_save(tmp_path, monkeypatch, input_name,
+                                                     workers):
+    """Streamed NDJSON holds exactly the records clean_data + save_data write."""
+    entries, archive_dir = _fixture_corpus(tmp_path)
+    entries.append(["not", "a", "dict"])
+    entries[3]["comments"] = "Caf\u00e9 &amp; <b>bold</b>"
+    monkeypatch.setattr(clean, "CLEAN_BATCH_SIZE", 9)
+    raw = tmp_path / input_name
+    if input_name.endswith(".jsonl"):
+        raw.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8")
+    else:
+        raw.write_text(json.dumps(entries), encoding="utf-8")
+
+    saved = tmp_path / "applicant_data.json"
+    records = clean.clean_data(clean.load_data(str(raw)), archive_dir=archive_dir)
+    assert clean.save_data(records, str(saved))
+
+    streamed = tmp_path / "applicant_data.jsonl"
+    done, written = clean.clean_file_streaming(str(raw), str(streamed), archive_dir=archive_dir,
+                                               workers=workers)
+    assert (done, written) == (len(entries), len(records))
+    lines = streamed.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == json.loads(saved.read_text(encoding="utf-8"))
+    assert lines == [json.dumps(record.to_dict(), ensure_ascii=False) for record in records]
+    assert not os.path.exists(f"{streamed}.tmp")
+
+
+# ---------------------------------------------------------------------------
+# Output validation
+# ---------------------------------------------------------------------------
+
+def _valid_record(**overrides):
+    record = dict.fromkeys(clean.CANONICAL_SCHEMA, "")
+    record.update(overrides)
+    return record
+
+
+def _write_mixed_ndjson(path):
+    """Write valid records with one of each issue spread through the file."""
+    lines = [json.dumps(_valid_record(school=f"School {i}")) for i in range(40)]
+    lines[3] = "{not json"
+    lines[11] = json.dumps(["a", "list"])
+    lines[17] = json.dumps({"school": "MIT"})
+    lines[25] = json.dumps(_valid_record(program=7))
+    lines[33] = json.dumps(_valid_record(comments="<b>bold</b>"))
+    lines[36] = ""
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("shards", [1, 2, 3, 5, 8, 64])
+def test_sharded_validation_matches_single_pass(tmp_path, monkeypatch, shards):
+    """Merged shard reports equal one pass: counts, records and line numbers."""
+    monkeypatch.setattr(clean, "VALIDATE_DECODE_LINES", 4)
+    path = tmp_path / "out.jsonl"
+    _write_mixed_ndjson(path)
+    single = clean.validate_ndjson_shard(str(path))
+
+    merged = clean.ValidationReport()
+    for start, end in clean._ndjson_shards(str(path), shards):
+        merged.merge(clean.validate_ndjson_shard(str(path), start, end))
+
+    assert (merged.records, merged.lines, merged.counts, merged.examples) == \
+        (single.records, single.lines, single.counts, single.examples)
+    assert single.records == 38
+    assert single.counts["invalid_json"] == single.counts["not_dict"] == 1
+    assert single.counts["missing_keys"] == single.counts["not_string"] == 1
+    assert single.counts["html_residue"] == 1
+    assert single.examples[0].startswith("line 4: invalid JSON")
+
+
+@pytest.mark.unit
+def test_validate_file_with_worker_pool(tmp_path):
+    """The process pool path reports the same issues as the inline one."""
+    path = tmp_path / "out.jsonl"
+    _write_mixed_ndjson(path)
+    pooled = clean.validate_file(str(path), workers=3)
+    assert pooled.counts == clean.validate_file(str(path), workers=0).counts
+    assert not clean._validate_output(str(path), workers=3)
+
+
+@pytest.mark.unit
+def test_validate_json_array_output(tmp_path):
+    """Arrays are checked record by record; malformed arrays fail validation."""
+    path = tmp_path / "out.json"
+    path.write_text(json.dumps([_valid_record(), _valid_record(decision="<i>x</i>")]))
+    report = clean.validate_file(str(path), workers=0)
+    assert (report.records, report.issues) == (2, 1)
+    assert report.examples == ["entry 1: field 'decision' contains HTML tags"]
+
+    path.write_text(json.dumps([_valid_record()]))
+    assert clean._validate_output(str(path), workers=0)
+    path.write_text('[{"school": "MIT"},')
+    assert not clean._validate_output(str(path), workers=0)
+
+
+# ---------------------------------------------------------------------------
+# Incremental re-clean cache
+# ---------------------------------------------------------------------------
+
+def _raw_entries():
+    """Entries that need raw-HTML extraction, plus one that bypasses the cache."""
+    rows = [f"<tr><td>{school}</td><td>Computer Science, PhD</td><td>Accepted</td></tr>"
+            for school in ("MIT", "Texas A&amp;M University", "Yale University")]
+    return [{"raw_html": row, "date_added": "January 5, 2026"} for row in rows] + \
+        [{"institution": "CMU", "program": "Physics", "decision": "Rejected"}]
+
+
+@pytest.mark.unit
+def test_clean_cache_reuses_records_and_matches_uncached_output(tmp_path):
+    """A second run reuses every unchanged record and cleans the same output."""
+    expected = clean.clean_data(_raw_entries())
+    path = str(tmp_path / "clean_cache.sqlite")
+
+    cache = clean.CleanCache(path)
+    assert clean.clean_data(_raw_entries(), cache=cache) == expected
+    assert (cache.stored, cache.reused, len(cache)) == (4, 0, 4)
+    cache.close()
+
+    cache = clean.CleanCache(path)
+    changed = _raw_entries()
+    changed[2]["raw_html"] = changed[2]["raw_html"].replace("Accepted", "Rejected")
+    cleaned = clean.clean_data(changed + ["not a dict"], cache=cache)
+    assert (cache.reused, cache.stored) == (3, 1)
+    assert cleaned[:2] == expected[:2] and cleaned[3] == expected[3]
+    assert cleaned[2]["decision"] == "Rejected"
+    assert len(cleaned) == 4
+    cache.close()
+
+
+@pytest.mark.unit
+def test_clean_cache_is_invalidated_by_rule_changes(tmp_path, monkeypatch):
+    """Changed cleaning rules, or invalidate=True, empty the cache; unchanged ones keep it."""
+    path = str(tmp_path / "clean_cache.sqlite")
+    cache = clean.CleanCache(path)
+    clean.clean_data(_raw_entries(), cache=cache)
+    cache.close()
+
+    cache = clean.CleanCache(path, invalidate=True)
+    assert len(cache) == 0
+    clean.clean_data(_raw_entries(), cache=cache)
+    cache.close()
+
+    cache = clean.CleanCache(path)
+    assert len(cache) == 4
+    cache.close()
+
+    monkeypatch.setattr(clean, "_GPA_RE", re.compile(r"\bGPA[:\s]*([0-9]\.[0-9]{1,3})\b"))
+    cache = clean.CleanCache(path)
+    assert len(cache) == 0
+    cache.close()
@@ -0,0 +1,1106 @@
+"""
+test_scrape.py
+
+Unit tests for the module_2 scraper (``src/module_2/scrape.py``).
+
+Verifies the crawl machinery without touching the network:
+- Per-host rate limiting, the adaptive (AIMD) controller and splitting
+  the rate budget between crawlers
+- The keep-alive HTTP session (decoding, redirects, byte counts)
+- The conditional-GET cache (304 responses, refetch after an unexpected
+  304, LRU eviction, the --no-cache flag)
+- Crawl metrics: histograms, counters after a replayed crawl, the run
+  summary and the JSON-lines/Prometheus sinks
+- The page checkpoint journal and resumed crawls
+- NDJSON output verification (count_ndjson_lines, verify_data_integrity)
+- Incremental crawls: watermark and entry date parsing, the since= stop
+- Locating the survey's last page (find_last_page)
+- The content-addressed page archive (PageArchive)
+- Entry deduplication (fingerprints, Bloom filter, resume)
+- HTML parser selection (html.parser by default) and lxml parity
+- The learned selector plan, including its per-field fallback keeping the
+  select_one() document order
+- Repeated and drifting pagination (PaginationMonitor); drifted pages keep
+  their entries
+
+All tests are marked ``unit``.
+"""
+
+import gzip
+import importlib.util
+import io
+import json
+import os
+import pickle
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from urllib import error
+
+import pytest
+
+
+def _load_module_2(*parts):
+    """Import a module_2 script by path (they are scripts, not a package)."""
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "src", "module_2", *parts)
+    name = "module2_" + os.path.splitext(parts[-1])[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+scrape = _load_module_2("scrape.py")
+fixture_server = _load_module_2("benchmarks", "fixture_server.py")
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class _FakeClock:
+    """Stands in for the time module: sleeping advances monotonic time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.unit
+def test_token_bucket_allows_burst_then_paces_requests(monkeypatch):
+    """The burst is served at once, later requests wait one refill each."""
+    clock = _FakeClock()
+    monkeypatch.setattr(scrape, "time", clock)
+    bucket = scrape.TokenBucket(2.0, capacity=3)
+
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.slept == []
+
+    bucket.acquire()
+    bucket.acquire()
+    assert sum(clock.slept) == pytest.approx(1.0)  # Two tokens at 2 per second
+
+    clock.now += 60  # Idle time refills only up to the capacity
+    for _ in range(3):
+        bucket.acquire()
+    assert sum(clock.slept) == pytest.approx(1.0)
+
+
+@pytest.mark.unit
+def test_host_limiters_are_shared_per_host_and_split_between_crawlers(monkeypatch):
+    """One limiter per host; share_rate_budget divides its rate."""
+    monkeypatch.setattr(scrape, "_host_limiters", {})
+    monkeypatch.setattr(scrape, "RATE_SHARE", 1)
+    first = scrape.get_host_limiter("https://example.org/survey/?page=1")
+    assert scrape.get_host_limiter("https://example.org/survey/?page=2") is first
+    assert scrape.get_host_limiter("https://other.example/") is not first
+
+    full_rate = first.rate
+    scrape.share_rate_budget(4)
+    assert scrape.get_host_limiter("https://example.org/survey/?page=1") is first
+    assert first.rate == pytest.approx(full_rate / 4)
+    assert scrape.get_host_limiter("https://new.example/").rate == pytest.approx(full_rate / 4)
+
+
+@pytest.mark.unit
+def test_rate_share_rescales_limiters_in_place_keeping_crawl_delay(monkeypatch):
+    """A mid-crawl change of share keeps adaptive state and the Crawl-delay cap."""
+    monkeypatch.setattr(scrape, "_host_limiters", {})
+    monkeypatch.setattr(scrape, "RATE_SHARE", 2)
+    limiter = scrape.get_host_limiter("https://example.org/")
+    limiter.set_crawl_delay(10.0 * scrape.RATE_SHARE)
+    capped = limiter.rate
+
+    scrape.share_rate_budget(4)
+    assert limiter.rate == pytest.approx(capped / 2)
+    assert limiter.max_rate == pytest.approx(capped / 2)
+    for _ in range(50):
+        limiter.on_success(0.01)
+    assert limiter.rate == pytest.approx(capped / 2)
+
+    scrape.share_rate_budget(1)
+    assert limiter.rate == pytest.approx(capped * 2)
+    assert limiter.max_rate == pytest.approx(1.0 / 10.0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("delay", [20.0, 180.0, 0.5])
+def test_adaptive_rate_respects_crawl_delay_after_successes(delay):
+    """Additive increases never push the rate past robots.txt's Crawl-delay."""
+    limiter = scrape.AdaptiveRateController(1.0, min_rate=0.1, max_rate=4.0)
+    limiter.set_crawl_delay(delay)
+    assert limiter.rate <= 1.0 / delay
+
+    for _ in range(200):
+        limiter.on_success(0.01)
+
+    assert limiter.rate <= 1.0 / delay
+    assert limiter.rate == pytest.approx(min(4.0, 1.0 / delay))
+
+
+@pytest.mark.unit
+def test_adaptive_rate_matches_fixed_bucket_under_crawl_delay():
+    """Adaptive and fixed-rate limiters agree on a slow Crawl-delay."""
+    adaptive = scrape.AdaptiveRateController(1.0, min_rate=0.1, max_rate=4.0)
+    fixed = scrape.TokenBucket(1.0)
+    for limiter in (adaptive, fixed):
+        limiter.set_crawl_delay(20.0)
+    assert adaptive.rate == pytest.approx(fixed.rate) == pytest.approx(0.05)
+
+    adaptive.on_throttle(429)
+    assert 0 < adaptive.rate <= 0.05
+
+
+
+@pytest.mark.unit
+def test_adaptive_rate_halves_once_per_cooldown_and_pauses_for_retry_after(monkeypatch):
+    """429s cut the rate once per cooldown; Retry-After holds every request."""
+    clock = _FakeClock()
+    clock.now = 100.0
+    monkeypatch.setattr(scrape, "time", clock)
+    limiter = scrape.AdaptiveRateController(2.0, min_rate=0.1, max_rate=4.0)
+
+    limiter.on_throttle(429, retry_after=30)
+    limiter.on_throttle(503)  # Same congestion event, inside the cooldown
+    assert limiter.rate == pytest.approx(2.0 * scrape.ADAPTIVE_DECREASE)
+
+    limiter.acquire()
+    assert clock.now >= 130.0
+
+    limiter.on_throttle(503)
+    assert limiter.rate == pytest.approx(2.0 * scrape.ADAPTIVE_DECREASE ** 2)
+
+
+@pytest.mark.unit
+def test_adaptive_rate_backs_off_on_latency_spike():
+    """A response far slower than the running average counts as congestion."""
+    limiter = scrape.AdaptiveRateController(1.0, min_rate=0.1, max_rate=4.0)
+    limiter.on_success(0.3)
+    limiter.on_success(0.3)
+    rate = limiter.rate
+    limiter.on_success(5.0)
+    assert limiter.rate == pytest.approx(rate * scrape.ADAPTIVE_DECREASE)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("120", 120.0), ("99999", scrape.MAX_RETRY_AFTER),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0), ("soon", None),
+])
+def test_parse_retry_after(value, expected):
+    """Delta seconds and past HTTP dates parse; garbage is ignored."""
+    assert scrape.parse_retry_after(value) == expected
+
+# ---------------------------------------------------------------------------
+# HTTP session
+# ---------------------------------------------------------------------------
+
+class _ScriptedServer:
+    """Replaces HTTPSession._send: answers from a list and records headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, url, extra_headers=None):
+        self.requests.append((url, dict(extra_headers or {})))
+        status, headers, body = self.responses.pop(0) if len(self.responses) > 1 \
+            else self.responses[0]
+        return status, "", headers, body
+
+
+@pytest.mark.unit
+def test_session_decodes_compressed_bodies_and_counts_wire_bytes(monkeypatch):
+    """gzip/deflate bodies are decoded; bytes_received counts what was sent."""
+    page = b"<html>" + b"row " * 500 + b"</html>"
+    gzipped = gzip.compress(page)
+    raw_deflate = zlib.compress(page)[2:-4]  # Without the zlib header, as some servers send
+    session = scrape.HTTPSession()
+    monkeypatch.setattr(session, "_send", _ScriptedServer(
+        (200, {"Content-Encoding": "gzip"}, gzipped),
+        (200, {"Content-Encoding": "deflate"}, raw_deflate),
+    ))
+    assert session.get("https://example.org/a") == page
+    assert session.get("https://example.org/b") == page
+    assert session.bytes_received == len(gzipped) + len(raw_deflate)
+
+
+@pytest.mark.unit
+def test_session_counts_bytes_from_concurrent_fetches(monkeypatch):
+    """Fetch threads sharing a session lose no bytes_received updates."""
+    session = scrape.HTTPSession()
+    monkeypatch.setattr(session, "_send", _ScriptedServer((200, {}, b"x" * 10)))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(session.get, [f"https://example.org/{i}" for i in range(2000)]))
+    assert session.bytes_received == 20000
+
+
+@pytest.mark.unit
+def test_session_follows_redirects_and_raises_http_errors(monkeypatch):
+    """Relative redirects resolve; 4xx/5xx become urllib HTTPError."""
+    session = scrape.HTTPSession()
+    server = _ScriptedServer((302, {"Location": "/moved"}, b""), (200, {}, b"ok"),
+                             (404, {}, b"missing"))
+    monkeypatch.setattr(session, "_send", server)
+    assert session.get("https://example.org/old") == b"ok"
+    assert server.requests[1][0] == "https://example.org/moved"
+    with pytest.raises(error.HTTPError):
+        session.get("https://example.org/gone")
+
+
+@pytest.mark.unit
+def test_cached_page_is_revalidated_and_served_on_304(tmp_path, monkeypatch):
+    """A repeat fetch sends the validators and a 304 returns the cached body."""
+    session = scrape.HTTPSession(cache=scrape.HTTPCache(str(tmp_path)))
+    server = _ScriptedServer(
+        (200, {"ETag": '"v1"', "Last-Modified": "Mon, 05 Jan 2026 00:00:00 GMT"}, b"page"),
+        (304, {}, b""))
+    monkeypatch.setattr(session, "_send", server)
+    url = "https://example.org/survey/?page=1"
+
+    assert session.get(url) == b"page"
+    assert server.requests[0][1] == {}
+    assert session.get(url) == b"page"
+    assert server.requests[1][1] == {"If-None-Match": '"v1"',
+                                     "If-Modified-Since": "Mon, 05 Jan 2026 00:00:00 GMT"}
+    assert session.cache_hits == 1
+
+    # Validators survive a restart: a new cache indexes the files on disk
+    assert scrape.HTTPCache(str(tmp_path)).conditional_headers(url)["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.unit
+def test_304_without_cached_body_refetches_in_full(tmp_path, monkeypatch):
+    """If the cached file vanished, the page is fetched again unconditionally."""
+    cache = scrape.HTTPCache(str(tmp_path))
+    url = "https://example.org/survey/?page=1"
+    cache.store(url, '"v1"', None, b"old")
+    for path in tmp_path.iterdir():
+        path.unlink()
+    session = scrape.HTTPSession(cache=cache)
+    server = _ScriptedServer((304, {}, b""), (200, {"ETag": '"v2"'}, b"new"))
+    monkeypatch.setattr(session, "_send", server)
+
+    assert session.get(url) == b"new"
+    assert server.requests[1][1] == {}
+    assert session.cache_hits == 0
+    assert cache.conditional_headers(url) == {"If-None-Match": '"v2"'}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cached", [False, True])
+def test_unexpected_304_refetches_unconditionally_then_fails(tmp_path, monkeypatch, cached):
+    """A 304 with no validators sent is refetched once; a second 304 is an error."""
+    session = scrape.HTTPSession(cache=scrape.HTTPCache(str(tmp_path)) if cached else None)
+    server = _ScriptedServer((304, {}, b""), (200, {}, b"page"))
+    monkeypatch.setattr(session, "_send", server)
+    url = "https://example.org/survey/?page=2"
+
+    assert session.get(url) == b"page"
+    assert [headers for _, headers in server.requests] == [{}, {}]
+    assert session.cache_hits == 0
+
+    server = _ScriptedServer((304, {}, b""))
+    monkeypatch.setattr(session, "_send", server)
+    with pytest.raises(error.HTTPError) as excinfo:
+        session.get("https://example.org/survey/?page=3")
+    assert excinfo.value.code == 304
+    assert len(server.requests) == 2
+
+
+@pytest.mark.unit
+def test_no_cache_flag_is_listed_in_help(capsys):
+    with pytest.raises(SystemExit):
+        scrape.main(["--help"])
+    assert "--no-cache" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_http_cache_evicts_least_recently_used(tmp_path):
+    """Past max_bytes the entry loaded longest ago is dropped first."""
+    cache = scrape.HTTPCache(str(tmp_path))
+    body = os.urandom(2000)  # Incompressible, so every entry has a similar size
+    for name in ("a", "b"):
+        cache.store(f"https://example.org/{name}", '"e"', None, body)
+    cache.max_bytes = cache.total_bytes + 100
+    assert cache.load("https://example.org/a") == body  # "b" is now the oldest
+
+    cache.store("https://example.org/c", '"e"', None, body)
+    assert len(cache) == 2
+    assert cache.conditional_headers("https://example.org/b") == {}
+    assert cache.load("https://example.org/b") is None
+    assert cache.load("https://example.org/a") == body
+    cache.store("https://example.org/d", None, None, body)
+    assert len(cache) == 2  # No validators: nothing is cached
+
+
+# ---------------------------------------------------------------------------
+# Crawl metrics
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+def test_histogram_buckets_and_quantiles():
+    """Values land in the first bucket whose bound they do not exceed."""
+    histogram = scrape.Histogram((1, 5, 10))
+    assert histogram.quantile(0.5) is None
+    assert histogram.to_dict()["mean"] is None
+    for value in (0.5, 1, 3, 20):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 0, 1]
+    assert histogram.to_dict() == {
+        "count": 4, "sum": 24.5, "mean": 6.125, "p50": 1, "p95": float("inf"),
+        "buckets": {"1": 2, "5": 1, "10": 0, "+Inf": 1},
+    }
+
+
+@pytest.mark.unit
+def test_metrics_and_summary_after_replayed_crawl(tmp_path):
+    """Counters, histograms and rates match what a replayed crawl did."""
+    pages = tmp_path / "pages"
+    fixture_server.save_pages(str(pages), 3)
+    summary_file = tmp_path / "summary.json"
+
+    entries, pages_scraped, _ = scrape.scrape_data(
+        2, resume=False, checkpoint_file=str(tmp_path / "checkpoint.jsonl"),
+        replay_dir=str(pages))
+    assert (len(entries), pages_scraped) == (3 * fixture_server.ROWS_PER_PAGE, 3)
+
+    metrics = scrape.get_metrics()
+    counters = metrics.snapshot()["counters"]
+    assert counters["pages_fetched"] == 3
+    assert counters["entries"] == len(entries)
+    assert counters["pages_empty"] == 3  # Past the corpus, until the empty-page limit
+    assert counters["pages_failed"] == counters["retries"] == counters["pages_drifted"] == 0
+    histograms = metrics.snapshot()["histograms"]
+    assert histograms["fetch_seconds"]["count"] == 3
+    assert histograms["parse_seconds"]["count"] == 6
+    assert histograms["entries_per_page"]["sum"] == len(entries)
+    assert histograms["entries_per_page"]["buckets"]["20"] == 3
+
+    summary = metrics.publish_summary(str(summary_file))
+    elapsed = summary["elapsed_seconds"]
+    assert summary["pages_per_second"] == round(3 / elapsed, 4)
+    assert summary["entries_per_second"] == round(len(entries) / elapsed, 4)
+    assert summary["dedup_rate"] == 0.0
+    assert summary["bottleneck"] in ("parse", "network", "rate_limit")
+    assert set(summary["time_share"]) == {"fetch_wait", "parse"}
+    assert json.loads(summary_file.read_text()) == json.loads(json.dumps(summary))
+
+
+class _RecordingSink:
+    def __init__(self):
+        self.events = []
+        self.closed = False
+
+    def write(self, event, snapshot):
+        self.events.append((event, snapshot))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.unit
+def test_metrics_emit_progress_then_summary_to_sinks():
+    """Snapshots go out only once the interval passed; the summary closes sinks."""
+    metrics = scrape.ScrapeMetrics()
+    sink = _RecordingSink()
+    metrics.add_sink(sink)
+    metrics.inc("pages_fetched", 4)
+    metrics.maybe_emit()
+    assert sink.events == []  # Emit interval not reached yet
+
+    metrics.maybe_emit(force=True)
+    assert [event for event, _ in sink.events] == ["progress"]
+    assert sink.events[0][1]["counters"]["pages_fetched"] == 4
+    assert sink.events[0][1]["gauges"]["pages_per_second"] > 0
+
+    summary = metrics.publish_summary(None)
+    assert [event for event, _ in sink.events] == ["progress", "progress", "summary"]
+    assert sink.events[-1][1] == summary and sink.closed
+
+
+@pytest.mark.unit
+def test_json_lines_sink_writes_one_record_per_snapshot():
+    """Each write is one JSON line: the snapshot plus event and timestamp."""
+    stream = io.StringIO()
+    sink = scrape.JSONLinesMetricsSink(stream)
+    snapshot = {"elapsed_seconds": 1.5, "counters": {"entries": 5}, "gauges": {},
+                "histograms": {}}
+    sink.write("progress", snapshot)
+    sink.write("summary", snapshot)
+
+    lines = stream.getvalue().split("\n")
+    assert lines[-1] == "" and len(lines) == 3
+    first = json.loads(lines[0])
+    assert list(first) == ["elapsed_seconds", "counters", "gauges", "histograms", "event", "ts"]
+    assert first["event"] == "progress" and json.loads(lines[1])["event"] == "summary"
+    assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d", first["ts"])
+    assert lines[0] == json.dumps(dict(snapshot, event="progress", ts=first["ts"]))
+
+
+@pytest.mark.unit
+def test_prometheus_sink_renders_text_format(tmp_path):
+    """Counters, gauges and cumulative histogram buckets in exposition format."""
+    histogram = scrape.Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 2):
+        histogram.observe(value)
+    snapshot = {"counters": {"entries": 5}, "gauges": {"rate_limit_rps": 0.5},
+                "histograms": {"parse_seconds": histogram.to_dict()}}
+    sink = scrape.PrometheusTextfileSink(str(tmp_path / "scrape.prom"))
+    sink.write("progress", snapshot)
+
+    assert (tmp_path / "scrape.prom").read_text() == (
+        "# HELP scrape_entries_total Entries extracted\n"
+        "# TYPE scrape_entries_total counter\n"
+        "scrape_entries_total 5\n"
+        "# HELP scrape_rate_limit_rps Current per-host request rate allowed by the limiter\n"
+        "# TYPE scrape_rate_limit_rps gauge\n"
+        "scrape_rate_limit_rps 0.5\n"
+        "# HELP scrape_parse_seconds HTML parse and entry extraction time per page\n"
+        "# TYPE scrape_parse_seconds histogram\n"
+        'scrape_parse_seconds_bucket{le="0.1"} 1\n'
+        'scrape_parse_seconds_bucket{le="1.0"} 2\n'
+        'scrape_parse_seconds_bucket{le="+Inf"} 3\n'
+        "scrape_parse_seconds_sum 2.55\n"
+        "scrape_parse_seconds_count 3\n"
+    )
+    assert os.listdir(tmp_path) == ["scrape.prom"]  # Temp file renamed into place
+
+
+# ---------------------------------------------------------------------------
+# Checkpoint journal
+# ---------------------------------------------------------------------------
+
+def _row(school, result_id=None, comment=""):
+    """Render one survey row, linking to its result page when given an id."""
+    link = f'<td><a href="/result/{result_id}">See More</a></td>' if result_id else ""
+    return (f'<tr><td class="institution">{school}</td><td class="program">CS</td>'
+            f'<td class="decision">Accepted</td><td class="date">January 5, 2026</td>'
+            f'<td class="comments">{comment}</td>{link}</tr>')
+
+
+def _page(*rows):
+    return f'<table class="results"><tbody>{"".join(rows)}</tbody></table>'
+
+
+@pytest.mark.unit
+def test_page_journal_drops_torn_final_record(tmp_path):
+    """A half-written last line is truncated away and appends continue cleanly."""
+    journal = scrape.PageJournal(str(tmp_path / "checkpoint.jsonl"))
+    journal.append(1, "ok", [{"institution": "MIT"}])
+    journal.append(2, "empty")
+    journal.close()
+    with open(journal.filename, "a", encoding="utf-8") as f:
+        f.write('{"page": 3, "status": "o')
+
+    assert [record["page"] for record in journal.load()] == [1, 2]
+    journal.append(3, "ok", [{"institution": "CMU"}])
+    journal.close()
+    records = scrape.PageJournal(journal.filename).load()
+    assert [record["page"] for record in records] == [1, 2, 3]
+    assert records[2]["entries"] == [{"institution": "CMU"}]
+
+
+@pytest.mark.unit
+def test_resumed_crawl_continues_after_last_journaled_page(tmp_path):
+    """Journaled pages are restored, not fetched again."""
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "page_00001.html").write_text(_page(_row("MIT", 1), _row("CMU", 2)))
+    (pages / "page_00002.html").write_text(_page(_row("UCLA", 3)))
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    scrape.scrape_data(1, resume=False, checkpoint_file=checkpoint,
+                       replay_dir=str(pages), end_page=1)
+
+    (pages / "page_00001.html").unlink()  # Only the journal still has page 1
+    entries, pages_scraped, _ = scrape.scrape_data(
+        1, resume=True, checkpoint_file=checkpoint, replay_dir=str(pages), end_page=2)
+    assert [entry["institution"] for entry in entries] == ["MIT", "CMU", "UCLA"]
+    assert pages_scraped == 2
+
+
+@pytest.mark.unit
+def test_resumed_ndjson_crawl_cuts_output_back_to_journal(tmp_path):
+    """Entries written after the last journaled page are discarded on resume."""
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "page_00001.html").write_text(_page(_row("MIT", 1)))
+    (pages / "page_00002.html").write_text(_page(_row("CMU", 2)))
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    sink = scrape.NDJSONWriter(str(tmp_path / "out.jsonl"))
+    scrape.scrape_data(1, resume=False, checkpoint_file=checkpoint, sink=sink,
+                       replay_dir=str(pages), end_page=1)
+    sink.close()
+    with open(sink.filename, "a", encoding="utf-8") as f:
+        f.write('{"institution": "unjournaled"}\n{"institution": "to')
+
+    scrape.scrape_data(1, resume=True, checkpoint_file=checkpoint, sink=sink,
+                       replay_dir=str(pages), end_page=2)
+    sink.close()
+    written = list(scrape.iter_ndjson_entries(sink.filename))
+    assert [entry["institution"] for entry in written] == ["MIT", "CMU"]
+    assert sink.count == 2
+
+
+# ---------------------------------------------------------------------------
+# NDJSON output verification
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text, expected", [
+    ("", 0),
+    ("\n", 0),
+    ('{"a": 1}\n{"a": 2}\n', 2),
+    ('{"a": 1}\n{"a": 2}', 2),
+    ('\n{"a": 1}\n\n  \n{"a": 2}\n\n', 2),
+])
+def test_count_ndjson_lines(tmp_path, text, expected):
+    """Entry lines are counted with or without a final newline; blank lines are not."""
+    path = tmp_path / "out.jsonl"
+    path.write_text(text)
+    assert scrape.count_ndjson_lines(str(path)) == expected
+
+
+@pytest.mark.unit
+def test_verify_data_integrity_counts_ndjson_lines_without_decoding(tmp_path):
+    """NDJSON output is checked by line count; JSON arrays by length."""
+    ndjson = tmp_path / "out.jsonl"
+    ndjson.write_text('{"a": 1}\nnot decoded\n\n')
+    assert scrape.verify_data_integrity(2, str(ndjson))
+    assert not scrape.verify_data_integrity(3, str(ndjson))
+
+    array = tmp_path / "out.json"
+    array.write_text('[{"a": 1}, {"a": 2}]')
+    assert scrape.verify_data_integrity(2, str(array))
+    assert not scrape.verify_data_integrity(2, str(tmp_path / "missing.jsonl"))
+
+
+# ---------------------------------------------------------------------------
+# Incremental crawl (watermark)
+# ---------------------------------------------------------------------------
+
+def _dated_row(school, date_added):
+    return (f'<tr><td class="institution">{school}</td><td class="program">CS</td>'
+            f'<td class="decision">Accepted</td><td class="date">{date_added}</td></tr>')
+
+
+@pytest.mark.unit
+def test_parse_watermark_accepts_dates_and_timestamps():
+    """The date part of an ISO watermark is used; anything else means no watermark."""
+    assert scrape.parse_watermark("2026-01-05") == date(2026, 1, 5)
+    assert scrape.parse_watermark(" 2026-01-05T23:59:59+00:00 ") == date(2026, 1, 5)
+    assert scrape.parse_watermark(datetime(2026, 1, 5, 12, 30)) == date(2026, 1, 5)
+    for value in (None, "", "yesterday", "2026-13-01", "05/01/2026"):
+        assert scrape.parse_watermark(value) is None
+
+
+@pytest.mark.unit
+def test_entry_dates_parse_every_format_and_skip_malformed_ones():
+    """Every ENTRY_DATE_FORMATS layout parses; malformed dates are ignored."""
+    for text in ("January 5, 2026", "Jan 5, 2026", "01/05/2026", "1/5/26", " 2026-01-05 "):
+        assert scrape.parse_entry_date(text) == date(2026, 1, 5)
+    for text in (None, "", "Janvier 5, 2026", "February 30, 2026", "5 days ago"):
+        assert scrape.parse_entry_date(text) is None
+
+    entries = [{"date_added": "January 5, 2026"}, {"date_added": "February 30, 2026"},
+               {"date_added": "03/02/2026"}, {"institution": "MIT"}]
+    assert scrape.newest_entry_date(entries) == "2026-03-02"
+    assert scrape.newest_entry_date([{"date_added": "soon"}, {}]) is None
+
+
+@pytest.mark.unit
+def test_crawl_stops_at_the_watermark_page(tmp_path):
+    """Entries older than the watermark day are dropped and the crawl stops there."""
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "page_00001.html").write_text(_page(
+        _dated_row("MIT", "March 2, 2026"), _dated_row("CMU", "sometime in March")))
+    (pages / "page_00002.html").write_text(_page(
+        _dated_row("UCLA", "March 1, 2026"), _dated_row("Yale", "February 28, 2026"),
+        _dated_row("Rice", "February 27, 2026")))
+    (pages / "page_00003.html").write_text(_page(_dated_row("Duke", "February 20, 2026")))
+    checkpoint = tmp_path / "checkpoint.jsonl"
+
+    entries, pages_scraped, _ = scrape.scrape_data(
+        1, resume=False, checkpoint_file=str(checkpoint), since="2026-02-28T08:00:00",
+        replay_dir=str(pages))
+    # Malformed dates are kept; the watermark day itself is kept
+    assert [entry["institution"] for entry in entries] == ["MIT", "CMU", "UCLA", "Yale"]
+    assert pages_scraped == 2
+    assert [json.loads(line)["page"] for line in checkpoint.read_text().splitlines()] == [1, 2]
+    assert scrape.newest_entry_date(entries) == "2026-03-02"
+
+    # A malformed watermark disables incremental mode: every page is crawled
+    entries, pages_scraped, _ = scrape.scrape_data(
+        1, resume=False, checkpoint_file=str(checkpoint), since="not a date",
+        replay_dir=str(pages))
+    assert (len(entries), pages_scraped) == (6, 3)
+
+
+# ---------------------------------------------------------------------------
+# Locating the last page
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+@pytest.mark.parametrize("total_pages", [1, 2, 7, 23, 64])
+@pytest.mark.parametrize("clamped", [False, True])
+def test_find_last_page_probes_then_bisects(monkeypatch, total_pages, clamped):
+    """Past the end the site either lists nothing or repeats the last page."""
+    fetched = []
+
+    def fake_fetch(page_number):
+        fetched.append(page_number)
+        if clamped:
+            page_number = min(page_number, total_pages)
+        return fixture_server.render_page(page_number, total_pages)
+
+    monkeypatch.setattr(scrape, "check_robots_txt", lambda url: True)
+    monkeypatch.setattr(scrape, "fetch_page", fake_fetch)
+    assert scrape.find_last_page() == total_pages
+    assert len(fetched) <= 2 * total_pages.bit_length() + 1
+
+
+@pytest.mark.unit
+def test_find_last_page_fails_loudly(monkeypatch):
+    monkeypatch.setattr(scrape, "check_robots_txt", lambda url: True)
+    monkeypatch.setattr(scrape, "fetch_page",
+                        lambda page: "" if page == 1 else None)
+    assert scrape.find_last_page() == 0
+
+    monkeypatch.setattr(scrape, "fetch_page",
+                        lambda page: fixture_server.render_page(page, 5) if page < 3 else None)
+    with pytest.raises(RuntimeError, match="page 4 could not be fetched"):
+        scrape.find_last_page()
+
+    monkeypatch.setattr(scrape, "check_robots_txt", lambda url: False)
+    with pytest.raises(RuntimeError, match="robots.txt"):
+        scrape.find_last_page()
+
+
+# ---------------------------------------------------------------------------
+# Page archive
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+def test_page_archive_writes_rows_once_and_indexes_them(tmp_path):
+    """Row markup moves into one blob per page; an identical page reuses it."""
+    archive = scrape.PageArchive(str(tmp_path / "archive"))
+    rows = [_row("MIT", 1), _row("Caf\u00e9 U", 2)]
+    entries = [{"institution": "MIT", "raw_html": rows[0]}, {"institution": "none"},
+               {"institution": "Caf\u00e9 U", "raw_html": rows[1]}]
+    page_hash = archive.archive_entries(entries)
+
+    assert [entry.get("page_hash") for entry in entries] == [page_hash, None, page_hash]
+    assert not any("raw_html" in entry for entry in entries)
+    path = archive.path_for(page_hash)
+    assert path == os.path.join(archive.directory, page_hash[:2], f"{page_hash}.html.gz")
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        blob = f.read()
+    assert blob == scrape.ARCHIVE_ROW_SEPARATOR.join(rows)
+    for entry, row in zip((entries[0], entries[2]), rows):
+        assert blob[entry["row_offset"]:entry["row_offset"] + entry["row_length"]] == row
+
+    again = [{"raw_html": rows[0]}, {"raw_html": rows[1]}]
+    assert archive.archive_entries(again) == page_hash
+    assert (archive.pages_written, archive.pages_reused) == (1, 1)
+    assert archive.bytes_written == os.path.getsize(path)
+    assert os.listdir(os.path.dirname(path)) == [f"{page_hash}.html.gz"]  # No temp files
+    assert archive.archive_entries([{"institution": "MIT"}]) is None
+
+
+# ---------------------------------------------------------------------------
+# Deduplication
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+def test_parse_entry_records_result_url():
+    """Rows linking to their result page carry it as result_url."""
+    entries = scrape.extract_entries_from_page(_page(_row("MIT", 101), _row("MIT")))
+    assert entries[0]["result_url"] == f"{scrape.BASE_URL}/result/101"
+    assert "result_url" not in entries[1]
+
+
+@pytest.mark.unit
+def test_identical_posts_with_distinct_result_urls_are_kept():
+    """Two separate posts with the same visible text are not duplicates."""
+    entries = scrape.extract_entries_from_page(_page(_row("MIT", 101), _row("MIT", 102)))
+    assert scrape.entry_fingerprint(entries[0]) != scrape.entry_fingerprint(entries[1])
+
+    dedup = scrape.EntryDeduplicator()
+    assert len(dedup.filter_entries(entries)) == 2
+    # The same post seen again on the next page is dropped
+    repeat = scrape.extract_entries_from_page(_page(_row("MIT", 102, "edited")))
+    assert dedup.filter_entries(repeat) == []
+    assert dedup.dropped == 1
+
+
+@pytest.mark.unit
+def test_text_fingerprint_is_normalized_without_result_url():
+    """Without a result link, case and whitespace do not change the fingerprint."""
+    first = {"institution": "MIT", "program": "Computer  Science"}
+    second = {"institution": "mit", "program": " computer science "}
+    assert scrape.entry_fingerprint(first) == scrape.entry_fingerprint(second)
+    assert scrape.entry_fingerprint(first) != scrape.entry_fingerprint({"institution": "MIT"})
+
+
+@pytest.mark.unit
+def test_bloom_filter_membership_and_round_trip(tmp_path):
+    """Added fingerprints are found after a save/load round trip."""
+    bloom = scrape.BloomFilter(capacity=1000, error_rate=1e-4)
+    added = [scrape.entry_fingerprint({"institution": f"School {i}"}) for i in range(200)]
+    for fingerprint in added:
+        bloom.add(fingerprint)
+    state_file = tmp_path / "seen.bloom"
+    bloom.save(str(state_file))
+
+    loaded = scrape.BloomFilter.load(str(state_file))
+    assert loaded.count == 200
+    assert all(fingerprint in loaded for fingerprint in added)
+    others = [scrape.entry_fingerprint({"institution": f"Other {i}"}) for i in range(1000)]
+    assert sum(fingerprint in loaded for fingerprint in others) <= 2
+
+    state_file.write_bytes(b"garbage")
+    assert scrape.BloomFilter.load(str(state_file)) is None
+
+
+@pytest.mark.unit
+def test_dedup_state_drops_entries_from_earlier_runs(tmp_path):
+    """A saved filter makes the next run drop entries stored before."""
+    state_file = str(tmp_path / "seen.bloom")
+    entries = [{"institution": "MIT", "result_url": "https://x/result/1"}]
+    first = scrape.EntryDeduplicator(state_file)
+    assert first.filter_entries(entries) == entries
+    first.save()
+
+    second = scrape.EntryDeduplicator(state_file)
+    assert second.filter_entries(entries) == []
+    assert second.bloom_hits == 1
+
+
+@pytest.mark.unit
+def test_iter_ndjson_entries_stops_at_offset(tmp_path):
+    """Only entries before the byte offset are read back."""
+    path = tmp_path / "out.jsonl"
+    lines = [json.dumps({"n": i}) + "\n" for i in range(3)]
+    path.write_text("".join(lines))
+    offset = len(lines[0]) + len(lines[1])
+    assert list(scrape.iter_ndjson_entries(str(path), offset)) == [{"n": 0}, {"n": 1}]
+    assert len(list(scrape.iter_ndjson_entries(str(path)))) == 3
+
+
+@pytest.mark.unit
+def test_resumed_ndjson_crawl_rebuilds_dedup_filter(tmp_path):
+    """Resuming a streamed crawl remembers the entries already written."""
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "page_00001.html").write_text(_page(_row("MIT", 1), _row("CMU", 2)))
+    (pages / "page_00002.html").write_text(_page(_row("CMU", 2), _row("UCLA", 3)))
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    sink = scrape.NDJSONWriter(str(tmp_path / "out.jsonl"))
+
+    # First run stops after page 1, as if the crawl had been interrupted
+    scrape.scrape_data(1, resume=False, checkpoint_file=checkpoint, sink=sink,
+                       replay_dir=str(pages), end_page=1, dedup=scrape.EntryDeduplicator())
+    sink.close()
+
+    dedup = scrape.EntryDeduplicator()
+    scrape.scrape_data(1, resume=True, checkpoint_file=checkpoint, sink=sink,
+                       replay_dir=str(pages), end_page=2, dedup=dedup)
+    sink.close()
+
+    written = list(scrape.iter_ndjson_entries(sink.filename))
+    assert [entry["institution"] for entry in written] == ["MIT", "CMU", "UCLA"]
+    assert dedup.dropped == 1
+
+
+# ---------------------------------------------------------------------------
+# HTML parser selection
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+def test_html_parser_defaults_to_html_parser(monkeypatch):
+    """html.parser is used unless another parser is requested, even if lxml is installed."""
+    monkeypatch.setattr(scrape, "_parser_available", lambda name: True)
+    assert scrape.select_html_parser() == "html.parser"
+    assert scrape.select_html_parser("") == "html.parser"
+    assert scrape.select_html_parser("html.parser") == "html.parser"
+
+    monkeypatch.setattr(scrape, "HTML_PARSER", scrape.DEFAULT_HTML_PARSER)
+    assert scrape.parse_page("<p>x</p>").builder.NAME == "html.parser"
+
+
+@pytest.mark.unit
+def test_requested_html_parser_is_used_only_when_installed(monkeypatch, capsys):
+    """A requested parser replaces the default; a missing one falls back to it."""
+    monkeypatch.setattr(scrape, "_parser_available", lambda name: True)
+    assert scrape.select_html_parser("lxml") == "lxml"
+
+    monkeypatch.setattr(scrape, "_parser_available", lambda name: name == "html.parser")
+    assert scrape.select_html_parser("lxml") == "html.parser"
+    assert "'lxml' is not installed" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_lxml_and_html_parser_extract_identical_entries():
+    """Both backends give the same entries and next-page links on the fixture pages."""
+    pytest.importorskip("lxml")
+    total_pages = 5
+    pages = [fixture_server.render_page(page, total_pages) for page in range(1, total_pages + 2)]
+    pages.append(_page(_row("MIT", 1, "Great &amp; funded"), _row("CMU", 2)))
+    for number, html in enumerate(pages, 1):
+        results = []
+        for parser in ("html.parser", "lxml"):
+            document = scrape.parse_page(html, parser)
+            results.append((scrape.extract_entries_from_page(document, scrape.SelectorPlan()),
+                            scrape.get_next_page_url(document, number)))
+        assert results[0] == results[1]
+    assert results[0][0]  # The last page has entries, so the check compared something
+
+
+# ---------------------------------------------------------------------------
+# Selector plan
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+def test_selector_plan_extracts_fields_missing_from_learning_page():
+    """A field absent when the plan was learned is still found later."""
+    plan = scrape.SelectorPlan()
+    first = scrape.extract_entries_from_page(
+        _page('<tr><td class="institution">MIT</td><td class="decision">Accepted</td></tr>'),
+        plan)
+    assert "comments" not in first[0]
+
+    later = scrape.extract_entries_from_page(
+        _page('<tr><td class="institution">CMU</td>'
+              '<td class="notes">Funded offer</td></tr>'), plan)
+    assert later[0]["comments"] == "Funded offer"
+    assert plan.times_learned == 1
+
+
+@pytest.mark.unit
+def test_selector_plan_fallback_tries_only_the_alternatives_left_out(monkeypatch):
+    """A narrowed field's fallback skips the alternatives that already missed."""
+    compiled = []
+    compile_field_selector = scrape.compile_field_selector
+
+    def recording(alternatives):
+        compiled.append(tuple(alternatives))
+        return compile_field_selector(alternatives)
+
+    monkeypatch.setattr(scrape, "compile_field_selector", recording)
+    scrape.extract_entries_from_page(
+        _page('<tr><td class="institution">MIT</td></tr>'), scrape.SelectorPlan())
+
+    assert (".institution", "[class*='institution']") in compiled
+    assert (".school", "[class*='school']") in compiled
+    assert (".institution", ".school", "[class*='school']", "[class*='institution']") \
+        not in compiled
+
+
+@pytest.mark.unit
+def test_selector_plan_fallback_matches_select_one_order():
+    """Fallback fields come out exactly as the unplanned select_one() chain."""
+    plan = scrape.SelectorPlan()
+    scrape.extract_entries_from_page(
+        _page('<tr><td class="institution">MIT</td><td class="decision">Accepted</td></tr>'),
+        plan)
+    # institution, decision and comments miss their learned alternatives on
+    # the first row, where the first match in document order is not the
+    # first alternative in the list; program, date_added and details were
+    # never learned
+    html = _page(
+        '<tr><td class="uni-school">CMU</td><td class="school">Carnegie</td>'
+        '<td class="note">first</td><td class="comments">second</td>'
+        '<td class="result-status">Rejected</td><td class="status">late</td></tr>',
+        '<tr><td class="institution">MIT</td><td class="major">Math</td>'
+        '<td class="notes">n</td><td class="program">CS</td>'
+        '<td><time>2026-01-05</time></td><td class="date">January 5, 2026</td></tr>',
+        '<tr><td class="school-name">UCLA</td><td class="extra">GRE 320</td>'
+        '<td class="details">3.9</td></tr>',
+    )
+    planned = scrape.extract_entries_from_page(html, plan)
+    unplanned = scrape.extract_entries_from_page(html)
+    assert [list(entry.items()) for entry in planned] == \
+        [list(entry.items()) for entry in unplanned]
+    assert (planned[0]["institution"], planned[0]["decision"], planned[0]["comments"]) == \
+        ("CMU", "Rejected", "first")
+    assert plan.times_learned == 1
+
+
+@pytest.mark.unit
+def test_selector_plan_matches_unplanned_extraction():
+    """Planned and cascade extraction agree on every field."""
+    html = _page(_row("MIT", 1, "Great"), '<tr><td class="school">CMU</td>'
+                 '<td class="status">Rejected</td><td class="note">n/a</td></tr>')
+    plan = scrape.SelectorPlan()
+    scrape.extract_entries_from_page(_page(_row("UCLA")), plan)
+    assert scrape.extract_entries_from_page(html, plan) == \
+        scrape.extract_entries_from_page(html)
+
+
+@pytest.mark.unit
+def test_selector_plan_spec_round_trips_through_pickle():
+    """A plan rebuilt from its pickled spec extracts the same entries."""
+    html = _page(_row("MIT", 1, "Great"), _row("CMU", 2))
+    plan = scrape.SelectorPlan()
+    expected = scrape.extract_entries_from_page(html, plan)
+
+    rebuilt = scrape.SelectorPlan.from_spec(pickle.loads(pickle.dumps(plan.spec)))
+    assert rebuilt.learned and rebuilt.spec == plan.spec
+    assert scrape.extract_entries_from_page(html, rebuilt) == expected
+    assert not scrape.SelectorPlan.from_spec(None).learned
+
+
+@pytest.mark.unit
+def test_parse_worker_switches_to_the_crawl_plan(monkeypatch):
+    """A worker drops its own plan once the crawl sends a different one."""
+    monkeypatch.setattr(scrape, "_worker_plan", None)
+    cards = ('<div class="card"><span class="school">MIT</span></div>'
+             '<div class="card"><span class="school">CMU</span></div>')
+    entries, selector = scrape.parse_page_in_worker(_page(_row("MIT")))
+    assert selector == "table.results tbody tr"
+
+    relearned = scrape.SelectorPlan()
+    scrape.extract_entries_from_page(cards, relearned)
+    entries, selector = scrape.parse_page_in_worker(cards, relearned.spec)
+    assert selector == relearned.row_selector
+    assert scrape._worker_plan.spec == relearned.spec
+    assert scrape._worker_plan.times_learned == 0  # Rebuilt, not re-learned
+    assert [entry["institution"] for entry in entries] == ["MIT", "CMU"]
+
+
+# ---------------------------------------------------------------------------
+# Pagination monitoring
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+def test_pagination_monitor_stops_on_consecutive_repeats():
+    """Repeats count only while unbroken; the limit stops the crawl."""
+    monitor = scrape.PaginationMonitor(repeat_limit=2, drift_limit=2)
+    structure = "table.results tbody tr: institution"
+    assert monitor.observe(1, "a", structure) == "ok"
+    assert monitor.observe(1, "a", structure) == "ok"  # Same page seen again
+    assert monitor.observe(2, "a", structure) == "repeat"
+    assert monitor.observe(3, "b", structure) == "ok"
+    assert not monitor.should_stop
+
+    assert monitor.observe(4, "b", structure) == "repeat"
+    assert monitor.observe(5, "a", structure) == "repeat"
+    assert monitor.should_stop
+
+
+@pytest.mark.unit
+def test_pagination_monitor_flags_drift_from_first_structure():
+    """Pages whose layout differs from the first page's count as drift."""
+    monitor = scrape.PaginationMonitor(repeat_limit=2, drift_limit=2)
+    assert monitor.observe(1, "a", "rows: institution,program") == "ok"
+    assert monitor.observe(2, "b", "div fallback: institution") == "drift"
+    assert monitor.observe(3, "c", "rows: institution,program") == "ok"
+    assert monitor.observe(4, "d", "div fallback: institution") == "drift"
+    assert monitor.observe(5, "e", "div fallback: institution") == "drift"
+    assert monitor.should_stop
+    assert monitor.observe(6, "b", "rows: institution,program") == "repeat"  # Drift page kept
+
+
+@pytest.mark.unit
+def test_pagination_monitor_restores_state_from_journal():
+    """Replaying journal records rebuilds fingerprints, structure and streaks."""
+    monitor = scrape.PaginationMonitor(repeat_limit=2)
+    for record in ({"page": 1, "status": "ok", "fingerprint": "a", "structure": "rows: x"},
+                   {"page": 2, "status": "repeat"}, {"page": 3, "status": "empty"}):
+        monitor.restore(record)
+    assert monitor.structure == "rows: x"
+    assert monitor.consecutive_repeats == 1
+    assert monitor.observe(4, "a", "rows: x") == "repeat"
+    assert monitor.should_stop
+
+
+@pytest.mark.unit
+def test_page_fingerprint_depends_on_entries_and_order():
+    """Same entries in the same order give the same fingerprint."""
+    first, second = {"result_url": "https://x/result/1"}, {"result_url": "https://x/result/2"}
+    assert scrape.page_fingerprint([first, second]) == scrape.page_fingerprint([first, second])
+    assert scrape.page_fingerprint([first, second]) != scrape.page_fingerprint([second, first])
+    assert scrape.page_structure(None) == "div fallback"
+    assert scrape.page_structure("table.results tbody tr") == "table.results tbody tr"
+
+
+@pytest.mark.unit
+def test_crawl_stops_when_pages_keep_repeating(tmp_path):
+    """A site serving page 1 for every page number stops after the repeat limit."""
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    for number in range(1, 8):
+        (pages / f"page_{number:05d}.html").write_text(_page(_row("MIT", 1), _row("CMU", 2)))
+    checkpoint = tmp_path / "checkpoint.jsonl"
+
+    entries, pages_scraped, target_reached = scrape.scrape_data(
+        1, resume=False, checkpoint_file=str(checkpoint), replay_dir=str(pages))
+    assert len(entries) == 2
+    assert (pages_scraped, target_reached) == (1, False)
+    statuses = [json.loads(line)["status"] for line in checkpoint.read_text().splitlines()]
+    assert statuses == ["ok"] + ["repeat"] * scrape.PAGE_REPEAT_LIMIT
+
+
+def _card(school, result_id):
+    """Render one survey entry as a div card instead of a table row."""
+    return (f'<div class="card"><span class="school">{school}</span>'
+            f'<a href="/result/{result_id}">See More</a></div>')
+
+
+@pytest.mark.unit
+def test_crawl_keeps_drifted_pages_and_stops_after_the_drift_limit(tmp_path):
+    """Drifted pages are journaled and counted but their entries are kept."""
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "page_00001.html").write_text(_page(_row("MIT", 1), _row("CMU", 2)))
+    for number in range(2, 6):
+        (pages / f"page_{number:05d}.html").write_text(
+            _card(f"School {number}", number * 10) + _card(f"College {number}", number * 10 + 1))
+    checkpoint = tmp_path / "checkpoint.jsonl"
+
+    entries, pages_scraped, _ = scrape.scrape_data(
+        1, resume=False, checkpoint_file=str(checkpoint), replay_dir=str(pages))
+    assert pages_scraped == 1 + scrape.PAGE_DRIFT_LIMIT
+    assert [entry["institution"] for entry in entries] == [
+        "MIT", "CMU", "School 2", "College 2", "School 3", "College 3", "School 4", "College 4"]
+    records = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+    assert [record["status"] for record in records] == ["ok"] + ["drift"] * scrape.PAGE_DRIFT_LIMIT
+    assert all(len(record["entries"]) == 2 and record["fingerprint"] for record in records)
+    assert scrape.get_metrics().counters["pages_drifted"] == scrape.PAGE_DRIFT_LIMIT
+
+    # Resuming restores the drifted pages' entries and the drift streak, so
+    # the next drifted page (5) is kept and stops the crawl before page 6
+    (pages / "page_00006.html").write_text(_page(_row("Yale", 60)))
+    entries, pages_scraped, _ = scrape.scrape_data(
+        1, resume=True, checkpoint_file=str(checkpoint), replay_dir=str(pages))
+    assert (len(entries), pages_scraped) == (10, 5)
+    assert entries[-1]["institution"] == "College 5"
+
+
+@pytest.mark.unit
+def test_missing_optional_fields_are_not_drift(tmp_path):
+    """Rows without comments, dates or links keep the first page's structure."""
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "page_00001.html").write_text(_page(_row("MIT", 1, "Funded"), _row("CMU", 2, "GPA 3.9")))
+    (pages / "page_00002.html").write_text(_page(
+        '<tr><td class="institution">Yale</td><td class="program">CS</td>'
+        '<td class="decision">Rejected</td></tr>'))
+    checkpoint = tmp_path / "checkpoint.jsonl"
+
+    entries, pages_scraped, _ = scrape.scrape_data(
+        1, resume=False, checkpoint_file=str(checkpoint), replay_dir=str(pages))
+    assert (len(entries), pages_scraped) == (3, 2)
+    statuses = [json.loads(line)["status"] for line in checkpoint.read_text().splitlines()]
+    assert statuses[:2] == ["ok", "ok"]
+    assert scrape.get_metrics().counters["pages_drifted"] == 0
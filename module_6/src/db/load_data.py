@@ -8,6 +8,7 @@ Responsibilities:
    - applicants
    - ingestion_watermarks
    - analytics_cache
+   - active_scrapes
 2) Load applicant rows from JSON into applicants.
 
 Default input: module_6/src/data/applicant_data.json
@@ -76,6 +77,15 @@ CREATE TABLE IF NOT EXISTS analytics_cache (
 );
 """
 
+CREATE_ACTIVE_SCRAPES_SQL = """
+CREATE TABLE IF NOT EXISTS active_scrapes (
+    task_id    TEXT PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    heartbeat  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+
 
 # ===============================
 # INSERT STATEMENT
@@ -215,7 +225,9 @@ def _build_row_params(row: dict) -> dict:
     }
 
 
-def load_rows(rows, conn):
+def load_rows(rows, conn, commit=True):
+    # commit=False lets a caller (e.g. the worker) keep the inserts inside its
+    # own transaction together with other writes.
     inserted = 0
     with conn.cursor() as cur:
         for row in rows:
@@ -223,7 +235,8 @@ def load_rows(rows, conn):
             cur.execute(_INSERT_SQL, params)
             if cur.rowcount:
                 inserted += 1
-    conn.commit()
+    if commit:
+        conn.commit()
     return inserted
 
 
@@ -245,6 +258,7 @@ def main(input_json=None, database_url=None):
             cur.execute(CREATE_APPLICANTS_SQL)
             cur.execute(CREATE_INGESTION_WATERMARKS_SQL)
             cur.execute(CREATE_ANALYTICS_CACHE_SQL)
+            cur.execute(CREATE_ACTIVE_SCRAPES_SQL)
         conn.commit()
 
         n = load_rows(data, conn)
@@ -12,6 +12,10 @@ from publisher import publish_task
 APP_TITLE = "GradCafe Admissions Analysis (Module 3)"
 DEFAULT_CACHE_KEY = "latest"
 
+# Full-scrape fan-out: a worker finds the survey's last page, then splits the
+# pages into scrape_pages tasks of SCRAPE_PAGES_PER_TASK pages each.
+SCRAPE_PAGES_PER_TASK = int(os.environ.get("SCRAPE_PAGES_PER_TASK", "50"))
+
 
 def _db_conn() -> psycopg.Connection:
     return psycopg.connect(os.environ["DATABASE_URL"])
@@ -84,6 +88,12 @@ def create_app() -> Flask:
         if action == "scrape_new_data":
             publish_task("scrape_new_data", payload={"source": "web"})
             queued_msg = "Request queued: Scrape New Data."
+        elif action == "scrape_pages":
+            publish_task("plan_scrape_pages", payload={
+                "source": "web", "pages_per_task": SCRAPE_PAGES_PER_TASK,
+            })
+            queued_msg = (f"Request queued: Full Scrape (fanned out in "
+                          f"{SCRAPE_PAGES_PER_TASK}-page ranges).")
         elif action == "recompute_analytics":
             publish_task("recompute_analytics", payload={"source": "web"})
             queued_msg = "Request queued: Recompute Analytics."
@@ -2,7 +2,12 @@ import importlib.util
 import json
 import os
 import re
+import tempfile
+import threading
 import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
 from typing import Any, Callable, Dict, Tuple
@@ -14,6 +19,20 @@ EXCHANGE = "tasks"
 QUEUE = "tasks_q"
 ROUTING_KEY = "tasks"
 
+# Scrape pipeline sources (mounted into the worker container by docker-compose)
+SCRAPER_DIR = Path(os.environ.get("SCRAPER_DIR", "/work/module_5/src/module_2"))
+LOAD_DATA_PY = Path(os.environ.get("LOAD_DATA_PY", "/work/src/db/load_data.py"))
+
+# Scrape tasks running on any replica split the per-host rate budget evenly.
+# Each registers in active_scrapes while it crawls and re-counts the live
+# registrations every SCRAPE_HEARTBEAT_SECONDS; one whose heartbeat is older
+# than SCRAPE_LEASE_SECONDS (a crashed worker) no longer counts.
+SCRAPE_HEARTBEAT_SECONDS = float(os.environ.get("SCRAPE_HEARTBEAT_SECONDS", "10"))
+SCRAPE_LEASE_SECONDS = 3 * SCRAPE_HEARTBEAT_SECONDS
+
+# Full-scrape fan-out: pages per scrape_pages task unless the request says otherwise
+DEFAULT_PAGES_PER_TASK = 50
+
 
 def _log(msg: str) -> None:
     print(f"[worker] {msg}", flush=True)
@@ -90,31 +109,234 @@ def _normalize_results(raw: dict[str, Any]) -> dict[str, list[Any]]:
     return out
 
 
-def handle_scrape_new_data(conn: psycopg.Connection, payload: dict) -> None:
-    source = payload.get("source") or "web"
+def _load_module(path: Path) -> Any:
+    spec = importlib.util.spec_from_file_location(f"pipeline_{path.stem}", str(path))
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
 
-    # Read the current last_seen from the DB first (rubric: reads last_seen at start).
-    with conn.cursor() as cur:
-        cur.execute(
-            "SELECT last_seen FROM ingestion_watermarks WHERE source = %s",
-            (str(source),),
-        )
-        row = cur.fetchone()
-    db_last_seen = row[0] if row else None
 
-    # Use payload["since"] if provided; otherwise fall back to DB value or current time.
-    last_seen = payload.get("since") or db_last_seen or time.strftime("%Y-%m-%d %H:%M:%S")
+def _count_active_scrapes(cur: psycopg.Cursor, task_id: str) -> int:
+    """Refresh this task's heartbeat and count the scrape tasks still alive."""
+    cur.execute("UPDATE active_scrapes SET heartbeat = now() WHERE task_id = %s", (task_id,))
+    cur.execute(
+        "SELECT count(*) FROM active_scrapes "
+        "WHERE heartbeat > now() - make_interval(secs => %s)",
+        (SCRAPE_LEASE_SECONDS,),
+    )
+    row = cur.fetchone()
+    return int(row[0]) if row else 1
+
 
-    upsert_sql = """
-        INSERT INTO ingestion_watermarks (source, last_seen)
-        VALUES (%s, %s)
-        ON CONFLICT (source)
-        DO UPDATE SET last_seen = EXCLUDED.last_seen, updated_at = now();
+def _heartbeat(db: psycopg.Connection, task_id: str, scrape: Any,
+               stop: threading.Event) -> None:
+    """Keep the scraper's rate share equal to the live scrape task count."""
+    while not stop.wait(SCRAPE_HEARTBEAT_SECONDS):
+        try:
+            with db.cursor() as cur:
+                scrape.share_rate_budget(_count_active_scrapes(cur, task_id))
+        except psycopg.Error as exc:
+            _log(f"rate budget heartbeat failed: {exc!r}")
+
+
+@contextmanager
+def _shared_rate_budget(scrape: Any, kind: str):
+    """
+    Register a running scrape task for the length of the block.
+
+    The scraper's rate share starts at the number of scrape tasks active on
+    every replica (scrape_new_data included) and follows it as they start
+    and finish. Uses its own autocommit connection, since the task's
+    connection must stay free of transactions during the crawl.
     """
+    task_id = uuid.uuid4().hex
+    stop = threading.Event()
+    with _db_conn() as db:
+        db.autocommit = True
+        with db.cursor() as cur:
+            cur.execute(
+                "INSERT INTO active_scrapes (task_id, kind) VALUES (%s, %s)",
+                (task_id, kind),
+            )
+            scrape.share_rate_budget(_count_active_scrapes(cur, task_id))
+        heartbeat = threading.Thread(
+            target=_heartbeat, args=(db, task_id, scrape, stop), daemon=True
+        )
+        heartbeat.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            heartbeat.join()
+            with db.cursor() as cur:
+                cur.execute("DELETE FROM active_scrapes WHERE task_id = %s", (task_id,))
+
+
+def _newest_loaded_date(conn: psycopg.Connection) -> str | None:
     with conn.cursor() as cur:
-        cur.execute(upsert_sql, (str(source), str(last_seen)))
+        cur.execute("SELECT max(date_added) FROM applicants")
+        row = cur.fetchone()
+    return row[0].isoformat() if row and row[0] else None
+
+
+def _run_incremental_scrape(source: str, since: str | None) -> tuple[list[dict], str | None]:
+    """Scrape newest-first down to the watermark; return (cleaned rows, newest date)."""
+    scrape = _load_module(SCRAPER_DIR / "scrape.py")
+    clean = _load_module(SCRAPER_DIR / "clean.py")
+    checkpoint = os.path.join(tempfile.gettempdir(), f"scrape_incremental_{source}.jsonl")
+    with _shared_rate_budget(scrape, "scrape_new_data"):
+        entries, _pages, _target_reached = scrape.scrape_data(
+            since=since, resume=False, checkpoint_file=checkpoint,
+            dedup=scrape.EntryDeduplicator(),
+        )
+    rows = clean.clean_data(entries) if entries else []
+    return rows, scrape.newest_entry_date(entries)
+
+
+def handle_scrape_new_data(conn: psycopg.Connection, payload: dict) -> None:
+    """Scrape past the watermark with no transaction open, then load and advance it."""
+    source = str(payload.get("source") or "web")
+
+    # The crawl can take minutes to hours, so only two short transactions
+    # bracket it. First: ensure the watermark row exists and read it.
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO ingestion_watermarks (source, last_seen)
+                VALUES (%s, NULL)
+                ON CONFLICT (source) DO NOTHING
+                """,
+                (source,),
+            )
+            cur.execute(
+                "SELECT last_seen FROM ingestion_watermarks WHERE source = %s",
+                (source,),
+            )
+            row = cur.fetchone()
+        db_last_seen = row[0] if row else None
+
+        # Use payload["since"] if provided; otherwise the DB watermark, and on
+        # the very first run the newest row already loaded by db_init.
+        since = payload.get("since") or db_last_seen or _newest_loaded_date(conn)
+
+    rows, newest = _run_incremental_scrape(source, since)
+    load_data = _load_module(LOAD_DATA_PY)
+
+    # Lock the watermark row only for the load. Another worker may have
+    # advanced it during the crawl; the loader's ON CONFLICT drops rows it
+    # already stored, and the watermark never moves backwards.
+    with conn.transaction():
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT last_seen FROM ingestion_watermarks WHERE source = %s FOR UPDATE",
+                (source,),
+            )
+            row = cur.fetchone()
+        current = row[0] if row else None
+
+        inserted = load_data.load_rows(rows, conn, commit=False)
+
+        if newest and (not since or newest > str(since)[:10]):
+            last_seen = newest
+        else:
+            last_seen = since or time.strftime("%Y-%m-%d %H:%M:%S")
+        if current and str(current)[:10] > str(last_seen)[:10]:
+            last_seen = current
+
+        upsert_sql = """
+            INSERT INTO ingestion_watermarks (source, last_seen)
+            VALUES (%s, %s)
+            ON CONFLICT (source)
+            DO UPDATE SET last_seen = EXCLUDED.last_seen, updated_at = now();
+        """
+        with conn.cursor() as cur:
+            cur.execute(upsert_sql, (source, str(last_seen)))
+
+    _log(f"scraped {len(rows)} new rows, inserted {inserted}; "
+         f"ingestion_watermarks updated (source={source}, last_seen={last_seen})")
+
 
-    _log(f"ingestion_watermarks updated (source={source})")
+def page_ranges(first_page: int, last_page: int, pages_per_task: int) -> list[tuple[int, int]]:
+    """Split [first_page, last_page] into consecutive inclusive slices."""
+    step = max(1, pages_per_task)
+    return [(start, min(start + step - 1, last_page))
+            for start in range(first_page, last_page + 1, step)]
+
+
+def _publish_tasks(kind: str, payloads: list[dict]) -> None:
+    """Publish one persistent task per payload over a single broker connection."""
+    conn = _connect_rabbitmq()
+    try:
+        ch = conn.channel()
+        _declare_amqp(ch)
+        for payload in payloads:
+            body = json.dumps(
+                {"kind": kind, "ts": datetime.now(timezone.utc).isoformat(), "payload": payload},
+                separators=(",", ":"),
+            ).encode("utf-8")
+            ch.basic_publish(
+                exchange=EXCHANGE,
+                routing_key=ROUTING_KEY,
+                body=body,
+                properties=pika.BasicProperties(delivery_mode=2, headers={}),
+            )
+    finally:
+        conn.close()
+
+
+def _find_last_page() -> int:
+    scrape = _load_module(SCRAPER_DIR / "scrape.py")
+    with _shared_rate_budget(scrape, "plan_scrape_pages"):
+        return scrape.find_last_page()
+
+
+def handle_plan_scrape_pages(_conn: psycopg.Connection, payload: dict) -> None:
+    """Find the survey's last page, then fan pages 1..last out as scrape_pages tasks."""
+    source = str(payload.get("source") or "web")
+    pages_per_task = int(payload.get("pages_per_task") or DEFAULT_PAGES_PER_TASK)
+
+    last_page = _find_last_page()
+    ranges = page_ranges(1, last_page, pages_per_task)
+    _publish_tasks("scrape_pages", [
+        {"source": source, "start_page": start, "end_page": end} for start, end in ranges
+    ])
+    _log(f"found last page {last_page}; queued {len(ranges)} scrape_pages tasks")
+
+
+def _run_page_range_scrape(source: str, start_page: int, end_page: int) -> list[dict]:
+    """Scrape one page range with this task's share of the rate budget."""
+    scrape = _load_module(SCRAPER_DIR / "scrape.py")
+    clean = _load_module(SCRAPER_DIR / "clean.py")
+    checkpoint = os.path.join(
+        tempfile.gettempdir(), f"scrape_pages_{source}_{start_page}_{end_page}.jsonl"
+    )
+    with _shared_rate_budget(scrape, "scrape_pages"):
+        entries, _pages, _target_reached = scrape.scrape_data(
+            resume=False, checkpoint_file=checkpoint, start_page=start_page,
+            end_page=end_page, dedup=scrape.EntryDeduplicator(),
+        )
+    return clean.clean_data(entries) if entries else []
+
+
+def handle_scrape_pages(conn: psycopg.Connection, payload: dict) -> None:
+    source = str(payload.get("source") or "web")
+    start_page = int(payload["start_page"])
+    end_page = int(payload.get("end_page") or start_page)
+    if start_page < 1 or end_page < start_page:
+        raise ValueError(f"invalid page range: {start_page}-{end_page}")
+
+    # Ranges are disjoint, so replicas load their slices independently; rows
+    # that shift between pages mid-crawl are dropped by the loader's ON CONFLICT.
+    # Like scrape_new_data, only the load runs in a transaction.
+    rows = _run_page_range_scrape(source, start_page, end_page)
+    load_data = _load_module(LOAD_DATA_PY)
+    with conn.transaction():
+        inserted = load_data.load_rows(rows, conn, commit=False)
+
+    _log(f"scraped pages {start_page}-{end_page} ({len(rows)} rows, inserted {inserted})")
 
 
 def handle_recompute_analytics(conn: psycopg.Connection, _payload: dict) -> None:
@@ -164,9 +386,15 @@ def handle_recompute_analytics(conn: psycopg.Connection, _payload: dict) -> None
 
 TASKS: dict[str, Callable[[psycopg.Connection, dict], None]] = {
     "scrape_new_data": handle_scrape_new_data,
+    "plan_scrape_pages": handle_plan_scrape_pages,
+    "scrape_pages": handle_scrape_pages,
     "recompute_analytics": handle_recompute_analytics,
 }
 
+# Handlers that open their own short transactions instead of running inside
+# one spanning the whole task (their network crawl must not hold it open).
+OWN_TRANSACTION_TASKS = frozenset({"scrape_new_data", "plan_scrape_pages", "scrape_pages"})
+
 
 def _parse_message(body: bytes) -> Tuple[str, dict]:
     msg = json.loads(body.decode("utf-8"))
@@ -191,8 +419,11 @@ def _on_message(channel, method, _properties, body) -> None:  # type: ignore[no-
             raise ValueError(f"unknown kind: {kind}")
 
         with _db_conn() as db:
-            with db.transaction():
+            if kind in OWN_TRANSACTION_TASKS:
                 handler(db, payload)
+            else:
+                with db.transaction():
+                    handler(db, payload)
 
         channel.basic_ack(delivery_tag=delivery_tag)
         _log(f"acked {kind}")
@@ -7,7 +7,10 @@ pika and psycopg are fully mocked — no real connections made.
 
 import json
 import runpy
+import threading
 import types
+from contextlib import nullcontext
+from datetime import date
 from decimal import Decimal
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -17,16 +20,28 @@ import pytest
 import consumer
 from consumer import (
     _collect_q_functions,
+    _count_active_scrapes,
     _db_conn,
     _declare_amqp,
+    _find_last_page,
+    _heartbeat,
     _json_default,
     _load_etl_modules,
+    _load_module,
     _log,
+    _newest_loaded_date,
     _normalize_results,
     _on_message,
     _parse_message,
+    _publish_tasks,
+    _run_incremental_scrape,
+    _run_page_range_scrape,
+    _shared_rate_budget,
+    handle_plan_scrape_pages,
     handle_recompute_analytics,
     handle_scrape_new_data,
+    handle_scrape_pages,
+    page_ranges,
 )
 
 _WORKER_SRC = Path(__file__).resolve().parents[1] / "src" / "worker"
@@ -63,6 +78,11 @@ def _db_conn_mock():
     return mock_db
 
 
+def _no_rate_budget():
+    """Patch _shared_rate_budget so scrape runners need no active_scrapes table."""
+    return patch.object(consumer, "_shared_rate_budget", return_value=nullcontext())
+
+
 # ---------------------------------------------------------------------------
 # _log
 # ---------------------------------------------------------------------------
@@ -215,44 +235,399 @@ def test_normalize_results_wraps_scalar_marks_none_keeps_list():
     assert out["q7"] == [0]
 
 
+# ---------------------------------------------------------------------------
+# _load_module / _newest_loaded_date / _run_incremental_scrape
+# ---------------------------------------------------------------------------
+
+def test_load_module_executes_file(tmp_path):
+    py = tmp_path / "scrape.py"
+    py.write_text("VALUE = 7\n", encoding="utf-8")
+    assert _load_module(py).VALUE == 7
+
+
+def test_load_module_raises_when_spec_is_none(tmp_path):
+    with patch("importlib.util.spec_from_file_location", return_value=None):
+        with pytest.raises(ImportError):
+            _load_module(tmp_path / "missing.py")
+
+
+def test_newest_loaded_date_returns_iso_string():
+    conn, _cur = _cur_conn_mock(fetchone_result=(date(2026, 2, 3),))
+    assert _newest_loaded_date(conn) == "2026-02-03"
+
+
+def test_newest_loaded_date_none_when_table_empty():
+    conn, _cur = _cur_conn_mock(fetchone_result=(None,))
+    assert _newest_loaded_date(conn) is None
+
+
+def test_run_incremental_scrape_cleans_entries_and_reports_newest():
+    scrape = MagicMock()
+    scrape.scrape_data.return_value = ([{"date_added": "March 1, 2026"}], 1, False)
+    scrape.newest_entry_date.return_value = "2026-03-01"
+    clean = MagicMock()
+    clean.clean_data.return_value = [{"school": "MIT"}]
+
+    with patch.object(consumer, "_load_module", side_effect=[scrape, clean]), \
+            _no_rate_budget() as mock_budget:
+        rows, newest = _run_incremental_scrape("web", "2026-02-01")
+
+    mock_budget.assert_called_once_with(scrape, "scrape_new_data")
+    assert rows == [{"school": "MIT"}]
+    assert newest == "2026-03-01"
+    kwargs = scrape.scrape_data.call_args.kwargs
+    assert kwargs["since"] == "2026-02-01"
+    assert kwargs["resume"] is False
+    assert kwargs["dedup"] is scrape.EntryDeduplicator.return_value
+
+
+def test_run_incremental_scrape_skips_clean_when_nothing_new():
+    scrape = MagicMock()
+    scrape.scrape_data.return_value = ([], 0, False)
+    scrape.newest_entry_date.return_value = None
+    clean = MagicMock()
+
+    with patch.object(consumer, "_load_module", side_effect=[scrape, clean]), _no_rate_budget():
+        assert _run_incremental_scrape("web", "2026-02-01") == ([], None)
+    clean.clean_data.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # handle_scrape_new_data
 # ---------------------------------------------------------------------------
 
+def _run_handler(payload, fetchone_results, rows=(), newest=None, current=None):
+    """
+    Run handle_scrape_new_data with the scrape pipeline mocked out.
+
+    fetchone_results feed the reads before the crawl; *current* is the
+    watermark row found when it is locked again for the load.
+    """
+    conn, cur = _cur_conn_mock()
+    cur.fetchone.side_effect = list(fetchone_results) + [current]
+    load_data = MagicMock()
+    load_data.load_rows.return_value = len(rows)
+    with patch.object(consumer, "_run_incremental_scrape",
+                      return_value=(list(rows), newest)) as mock_scrape, \
+            patch.object(consumer, "_load_module", return_value=load_data):
+        handle_scrape_new_data(conn, payload)
+    return cur, mock_scrape, load_data
+
+
 def test_handle_scrape_new_data_uses_payload_since():
     """payload['since'] takes priority over DB value."""
-    conn, cur = _cur_conn_mock(fetchone_result=("2024-01-01",))
-    handle_scrape_new_data(conn, {"source": "web", "since": "2025-06-01"})
+    cur, mock_scrape, _ = _run_handler(
+        {"source": "web", "since": "2025-06-01"}, [("2024-01-01",)]
+    )
+    mock_scrape.assert_called_once_with("web", "2025-06-01")
     last_call_args = str(cur.execute.call_args_list[-1])
     assert "2025-06-01" in last_call_args
 
 
 def test_handle_scrape_new_data_falls_back_to_db_last_seen():
     """When no 'since', the DB row value is used."""
-    conn, cur = _cur_conn_mock(fetchone_result=("2024-12-01",))
-    handle_scrape_new_data(conn, {"source": "web"})
+    cur, mock_scrape, _ = _run_handler({"source": "web"}, [("2024-12-01",)])
+    mock_scrape.assert_called_once_with("web", "2024-12-01")
     last_call_args = str(cur.execute.call_args_list[-1])
     assert "2024-12-01" in last_call_args
 
 
+def test_handle_scrape_new_data_locks_watermark_row_only_for_the_load():
+    cur, _, _ = _run_handler({"source": "web"}, [("2024-12-01",)])
+    selects = [str(c) for c in cur.execute.call_args_list if "SELECT last_seen" in str(c)]
+    assert "FOR UPDATE" not in selects[0]
+    assert "FOR UPDATE" in selects[1]
+
+
+def test_handle_scrape_new_data_crawls_with_no_transaction_open():
+    """The crawl runs between two short transactions, never inside one."""
+    conn, cur = _cur_conn_mock()
+    cur.fetchone.side_effect = [("2026-01-01",), ("2026-01-01",)]
+    events = []
+    tx = MagicMock()
+    tx.__enter__.side_effect = lambda *a: events.append("begin")
+    tx.__exit__.side_effect = lambda *a: events.append("commit")
+    conn.transaction.return_value = tx
+    load_data = MagicMock()
+    load_data.load_rows.side_effect = lambda *a, **k: events.append("load") or 1
+
+    def fake_scrape(*_args):
+        events.append("scrape")
+        return [{"school": "MIT"}], "2026-02-01"
+
+    with patch.object(consumer, "_run_incremental_scrape", side_effect=fake_scrape), \
+            patch.object(consumer, "_load_module", return_value=load_data):
+        handle_scrape_new_data(conn, {"source": "web"})
+
+    assert events == ["begin", "commit", "scrape", "begin", "load", "commit"]
+
+
+def test_handle_scrape_new_data_never_moves_watermark_backwards():
+    """A watermark advanced by another worker during the crawl is kept."""
+    cur, _, load_data = _run_handler(
+        {"source": "web"}, [("2026-01-01",)], rows=[{}], newest="2026-02-01",
+        current=("2026-03-01",),
+    )
+    load_data.load_rows.assert_called_once()
+    last_call_args = str(cur.execute.call_args_list[-1])
+    assert "2026-03-01" in last_call_args
+
+
+def test_handle_scrape_new_data_bootstraps_from_loaded_rows():
+    """No watermark yet: start from the newest row already in applicants."""
+    _, mock_scrape, _ = _run_handler({"source": "web"}, [(None,), (date(2026, 1, 5),)])
+    mock_scrape.assert_called_once_with("web", "2026-01-05")
+
+
+def test_handle_scrape_new_data_advances_watermark_and_loads_rows():
+    rows = [{"school": "MIT"}, {"school": "JHU"}]
+    cur, _, load_data = _run_handler(
+        {"source": "web"}, [("2026-01-01 00:00:00",)], rows=rows, newest="2026-02-10"
+    )
+    load_data.load_rows.assert_called_once()
+    assert load_data.load_rows.call_args.kwargs == {"commit": False}
+    last_call_args = str(cur.execute.call_args_list[-1])
+    assert "2026-02-10" in last_call_args
+
+
+def test_handle_scrape_new_data_keeps_watermark_when_nothing_newer():
+    cur, _, _ = _run_handler(
+        {"source": "web"}, [("2026-03-01",)], rows=[{}], newest="2026-03-01"
+    )
+    last_call_args = str(cur.execute.call_args_list[-1])
+    assert "2026-03-01" in last_call_args
+
+
 def test_handle_scrape_new_data_falls_back_to_current_time_when_no_row():
-    """When no 'since' and no DB row, current time is used."""
-    conn, cur = _cur_conn_mock(fetchone_result=None)
+    """When no 'since', no DB row and no loaded data, current time is used."""
     with patch("time.strftime", return_value="2026-03-01 00:00:00"):
-        handle_scrape_new_data(conn, {"source": "web"})
+        cur, _, _ = _run_handler({"source": "web"}, [None, None])
     last_call_args = str(cur.execute.call_args_list[-1])
     assert "2026-03-01" in last_call_args
 
 
 def test_handle_scrape_new_data_default_source():
     """payload without 'source' defaults to 'web'."""
-    conn, cur = _cur_conn_mock(fetchone_result=None)
     with patch("time.strftime", return_value="2026-01-01 00:00:00"):
-        handle_scrape_new_data(conn, {})
+        cur, _, _ = _run_handler({}, [None, None])
     select_call = str(cur.execute.call_args_list[0])
     assert "web" in select_call
 
 
+# ---------------------------------------------------------------------------
+# scrape_pages (page-range fan-out)
+# ---------------------------------------------------------------------------
+
+def test_run_page_range_scrape_crawls_range_in_shared_budget():
+    scrape = MagicMock()
+    scrape.scrape_data.return_value = ([{"source_page": 5}], 1, False)
+    clean = MagicMock()
+    clean.clean_data.return_value = [{"school": "MIT"}]
+
+    with patch.object(consumer, "_load_module", side_effect=[scrape, clean]), \
+            _no_rate_budget() as mock_budget:
+        rows = _run_page_range_scrape("web", 5, 9)
+
+    assert rows == [{"school": "MIT"}]
+    mock_budget.assert_called_once_with(scrape, "scrape_pages")
+    kwargs = scrape.scrape_data.call_args.kwargs
+    assert (kwargs["start_page"], kwargs["end_page"]) == (5, 9)
+    assert kwargs["resume"] is False
+    assert kwargs["checkpoint_file"].endswith("scrape_pages_web_5_9.jsonl")
+    assert kwargs["dedup"] is scrape.EntryDeduplicator.return_value
+
+
+def test_run_page_range_scrape_skips_clean_when_range_empty():
+    scrape = MagicMock()
+    scrape.scrape_data.return_value = ([], 0, False)
+    clean = MagicMock()
+
+    with patch.object(consumer, "_load_module", side_effect=[scrape, clean]), _no_rate_budget():
+        assert _run_page_range_scrape("web", 900, 950) == []
+    clean.clean_data.assert_not_called()
+
+
+def test_handle_scrape_pages_loads_rows_in_transaction():
+    conn = MagicMock()
+    load_data = MagicMock()
+    load_data.load_rows.return_value = 2
+    rows = [{"school": "MIT"}, {"school": "JHU"}]
+    with patch.object(consumer, "_run_page_range_scrape", return_value=rows) as mock_scrape, \
+            patch.object(consumer, "_load_module", return_value=load_data):
+        handle_scrape_pages(conn, {"start_page": 51, "end_page": 100})
+
+    mock_scrape.assert_called_once_with("web", 51, 100)
+    load_data.load_rows.assert_called_once_with(rows, conn, commit=False)
+    conn.transaction.assert_called_once_with()
+
+
+def test_scrape_pages_manages_its_own_transaction():
+    assert "scrape_pages" in consumer.OWN_TRANSACTION_TASKS
+
+
+def test_handle_scrape_pages_defaults_to_single_page():
+    load_data = MagicMock()
+    with patch.object(consumer, "_run_page_range_scrape", return_value=[]) as mock_scrape, \
+            patch.object(consumer, "_load_module", return_value=load_data):
+        handle_scrape_pages(MagicMock(), {"source": "cli", "start_page": "7"})
+    mock_scrape.assert_called_once_with("cli", 7, 7)
+
+
+@pytest.mark.parametrize("payload", [
+    {"start_page": 0, "end_page": 5},
+    {"start_page": 10, "end_page": 9},
+])
+def test_handle_scrape_pages_rejects_invalid_range(payload):
+    with patch.object(consumer, "_run_page_range_scrape") as mock_scrape:
+        with pytest.raises(ValueError, match="invalid page range"):
+            handle_scrape_pages(MagicMock(), payload)
+    mock_scrape.assert_not_called()
+
+
+def test_scrape_pages_registered_in_tasks():
+    assert consumer.TASKS["scrape_pages"] is handle_scrape_pages
+
+
+# ---------------------------------------------------------------------------
+# plan_scrape_pages (last page discovery and fan-out)
+# ---------------------------------------------------------------------------
+
+def test_page_ranges_splits_into_inclusive_slices():
+    assert page_ranges(1, 120, 50) == [(1, 50), (51, 100), (101, 120)]
+    assert page_ranges(7, 7, 50) == [(7, 7)]
+    assert page_ranges(1, 3, 0) == [(1, 1), (2, 2), (3, 3)]
+    assert page_ranges(1, 0, 50) == []
+
+
+def test_publish_tasks_sends_persistent_messages_on_one_connection():
+    mock_conn = MagicMock()
+    mock_ch = mock_conn.channel.return_value
+    with patch.object(consumer, "_connect_rabbitmq", return_value=mock_conn), \
+            patch("pika.BasicProperties") as mock_props:
+        _publish_tasks("scrape_pages", [{"start_page": 1}, {"start_page": 51}])
+
+    mock_ch.basic_qos.assert_called_once_with(prefetch_count=1)
+    bodies = [json.loads(c.kwargs["body"].decode("utf-8"))
+              for c in mock_ch.basic_publish.call_args_list]
+    assert [(b["kind"], b["payload"]) for b in bodies] == [
+        ("scrape_pages", {"start_page": 1}), ("scrape_pages", {"start_page": 51})
+    ]
+    assert {c.kwargs["routing_key"] for c in mock_ch.basic_publish.call_args_list} == {"tasks"}
+    assert mock_props.call_args.kwargs["delivery_mode"] == 2
+    mock_conn.close.assert_called_once()
+
+
+def test_publish_tasks_closes_connection_when_publish_raises():
+    mock_conn = MagicMock()
+    mock_conn.channel.return_value.basic_publish.side_effect = RuntimeError("broker gone")
+    with patch.object(consumer, "_connect_rabbitmq", return_value=mock_conn), \
+            patch("pika.BasicProperties"):
+        with pytest.raises(RuntimeError):
+            _publish_tasks("scrape_pages", [{}])
+    mock_conn.close.assert_called_once()
+
+
+def test_find_last_page_probes_in_shared_budget():
+    scrape = MagicMock()
+    scrape.find_last_page.return_value = 2251
+    with patch.object(consumer, "_load_module", return_value=scrape), \
+            _no_rate_budget() as mock_budget:
+        assert _find_last_page() == 2251
+    mock_budget.assert_called_once_with(scrape, "plan_scrape_pages")
+
+
+def test_handle_plan_scrape_pages_fans_out_up_to_the_last_page():
+    with patch.object(consumer, "_find_last_page", return_value=120), \
+            patch.object(consumer, "_publish_tasks") as mock_publish:
+        handle_plan_scrape_pages(MagicMock(), {"source": "cli", "pages_per_task": 50})
+
+    mock_publish.assert_called_once_with("scrape_pages", [
+        {"source": "cli", "start_page": 1, "end_page": 50},
+        {"source": "cli", "start_page": 51, "end_page": 100},
+        {"source": "cli", "start_page": 101, "end_page": 120},
+    ])
+
+
+def test_handle_plan_scrape_pages_defaults():
+    with patch.object(consumer, "_find_last_page", return_value=60), \
+            patch.object(consumer, "_publish_tasks") as mock_publish:
+        handle_plan_scrape_pages(MagicMock(), {})
+
+    payloads = mock_publish.call_args.args[1]
+    assert [(p["source"], p["start_page"], p["end_page"]) for p in payloads] == [
+        ("web", 1, 50), ("web", 51, 60)
+    ]
+
+
+def test_plan_scrape_pages_registered_and_manages_its_own_transaction():
+    assert consumer.TASKS["plan_scrape_pages"] is handle_plan_scrape_pages
+    assert "plan_scrape_pages" in consumer.OWN_TRANSACTION_TASKS
+
+
+# ---------------------------------------------------------------------------
+# Shared rate budget (active_scrapes)
+# ---------------------------------------------------------------------------
+
+def test_count_active_scrapes_refreshes_heartbeat_and_counts_live_tasks():
+    conn, cur = _cur_conn_mock((3,))
+    with conn.cursor() as c:
+        assert _count_active_scrapes(c, "abc") == 3
+    update, count = cur.execute.call_args_list
+    assert "UPDATE active_scrapes SET heartbeat" in update.args[0]
+    assert update.args[1] == ("abc",)
+    assert "count(*)" in count.args[0]
+    assert count.args[1] == (consumer.SCRAPE_LEASE_SECONDS,)
+
+    cur.fetchone.return_value = None
+    with conn.cursor() as c:
+        assert _count_active_scrapes(c, "abc") == 1
+
+
+def test_shared_rate_budget_registers_for_the_block_and_shares_by_count():
+    conn, cur = _cur_conn_mock((4,))
+    conn.__enter__.return_value = conn
+    scrape = MagicMock()
+
+    with patch.object(consumer, "_db_conn", return_value=conn):
+        with _shared_rate_budget(scrape, "scrape_pages"):
+            scrape.share_rate_budget.assert_called_once_with(4)
+            statements = [c.args[0] for c in cur.execute.call_args_list]
+            assert "INSERT INTO active_scrapes" in statements[0]
+            task_id = cur.execute.call_args_list[0].args[1][0]
+            assert cur.execute.call_args_list[0].args[1] == (task_id, "scrape_pages")
+
+    assert conn.autocommit is True
+    assert cur.execute.call_args.args == (
+        "DELETE FROM active_scrapes WHERE task_id = %s", (task_id,)
+    )
+
+
+def test_shared_rate_budget_unregisters_when_the_crawl_fails():
+    conn, cur = _cur_conn_mock((1,))
+    conn.__enter__.return_value = conn
+
+    with patch.object(consumer, "_db_conn", return_value=conn):
+        with pytest.raises(RuntimeError):
+            with _shared_rate_budget(MagicMock(), "scrape_new_data"):
+                raise RuntimeError("crawl failed")
+
+    assert "DELETE FROM active_scrapes" in cur.execute.call_args.args[0]
+
+
+def test_heartbeat_follows_task_count_until_stopped(capsys):
+    conn, cur = _cur_conn_mock()
+    cur.fetchone.side_effect = [(2,), consumer.psycopg.OperationalError("db gone"), (1,)]
+    stop = MagicMock(spec=threading.Event)
+    stop.wait.side_effect = [False, False, False, True]
+    scrape = MagicMock()
+
+    _heartbeat(conn, "abc", scrape, stop)
+
+    assert [c.args for c in scrape.share_rate_budget.call_args_list] == [(2,), (1,)]
+    stop.wait.assert_called_with(consumer.SCRAPE_HEARTBEAT_SECONDS)
+    assert "rate budget heartbeat failed" in capsys.readouterr().out
+
+
 # ---------------------------------------------------------------------------
 # handle_recompute_analytics
 # ---------------------------------------------------------------------------
@@ -338,6 +713,37 @@ def test_on_message_success_acks():
     ch.basic_nack.assert_not_called()
 
 
+def test_on_message_own_transaction_task_not_wrapped():
+    """scrape_new_data manages its own transactions around the crawl."""
+    ch = MagicMock()
+    method = MagicMock()
+    method.delivery_tag = 9
+    inner_db = _db_conn_mock()
+    mock_handler = MagicMock()
+
+    with patch("consumer._db_conn", return_value=inner_db), \
+            patch.object(consumer, "TASKS", {"scrape_new_data": mock_handler}):
+        _on_message(ch, method, None, _make_body("scrape_new_data"))
+
+    mock_handler.assert_called_once_with(inner_db, {})
+    inner_db.transaction.assert_not_called()
+    ch.basic_ack.assert_called_once_with(delivery_tag=9)
+
+
+def test_on_message_wraps_other_tasks_in_transaction():
+    ch = MagicMock()
+    method = MagicMock()
+    inner_db = _db_conn_mock()
+    mock_handler = MagicMock()
+
+    with patch("consumer._db_conn", return_value=inner_db), \
+            patch.object(consumer, "TASKS", {"recompute_analytics": mock_handler}):
+        _on_message(ch, method, None, _make_body("recompute_analytics"))
+
+    inner_db.transaction.assert_called_once_with()
+    mock_handler.assert_called_once_with(inner_db, {})
+
+
 def test_on_message_unknown_kind_nacks():
     ch = MagicMock()
     method = MagicMock()
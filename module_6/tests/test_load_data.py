@@ -338,6 +338,14 @@ def test_load_rows_no_increment_when_rowcount_zero():
     conn.commit.assert_called_once()
 
 
+def test_load_rows_without_commit_leaves_transaction_open():
+    conn, cur = _cur_conn_mock(rowcount=1)
+    row = {"notes": "", "gpa": None, "decision": None, "decision_date": None}
+    result = load_rows([row], conn, commit=False)
+    assert result == 1
+    conn.commit.assert_not_called()
+
+
 def test_load_rows_multiple_rows():
     conn, cur = _cur_conn_mock(rowcount=1)
     rows = [
@@ -54,6 +54,16 @@ def test_post_analyze_scrape_returns_202_and_queues(client):
         assert b"Request queued" in resp.data
 
 
+def test_post_analyze_scrape_pages_queues_plan_task(client):
+    with patch("app.publish_task") as mock_publish:
+        resp = client.post("/analyze", data={"action": "scrape_pages"})
+    assert resp.status_code == 202
+    assert b"Full Scrape" in resp.data
+    mock_publish.assert_called_once_with(
+        "plan_scrape_pages", payload={"source": "web", "pages_per_task": 50}
+    )
+
+
 def test_fetch_cached_results_no_row_branch(client):
     # fetchone() -> None triggers early return of defaults
     with patch("app._db_conn", return_value=_mock_conn(None)):